@@ -1,4 +1,56 @@
 # -*- mode: python ; coding: utf-8 -*-
+#
+# Build profiles, picked with `pyinstaller MoltenLauncher.spec -- --profile NAME`
+# or MOLTEN_BUILD_PROFILE=NAME:
+#
+#   onefile  a single MoltenLauncher.exe (default). Every start unpacks the
+#            whole bundle to a fresh temp dir before Python runs.
+#   fast     a dist/MoltenLauncher/ folder started in place: nothing to
+#            unpack, no UPX to decompress, bytecode built with -OO.
+#
+# bench/startup_bench.py builds both and compares cold and warm starts.
+import argparse
+import os
+import sys
+
+parser = argparse.ArgumentParser()
+parser.add_argument("--profile", choices=["onefile", "fast"], default=os.environ.get("MOLTEN_BUILD_PROFILE", "onefile"))
+profile = parser.parse_known_args()[0].profile
+fast = profile == "fast"
+
+# The launcher only uses QtCore, QtGui and QtWidgets
+QT_EXCLUDES = [
+    f"PySide6.{module}" for module in (
+        "Qt3DAnimation", "Qt3DCore", "Qt3DExtras", "Qt3DInput", "Qt3DLogic", "Qt3DRender",
+        "QtBluetooth", "QtCharts", "QtConcurrent", "QtDataVisualization", "QtDBus", "QtDesigner",
+        "QtGraphs", "QtHelp", "QtHttpServer", "QtLocation", "QtMultimedia", "QtMultimediaWidgets",
+        "QtNetwork", "QtNetworkAuth", "QtNfc", "QtOpenGL", "QtOpenGLWidgets", "QtPdf", "QtPdfWidgets",
+        "QtPositioning", "QtPrintSupport", "QtQml", "QtQuick", "QtQuick3D", "QtQuickControls2",
+        "QtQuickWidgets", "QtRemoteObjects", "QtScxml", "QtSensors", "QtSerialBus", "QtSerialPort",
+        "QtSpatialAudio", "QtSql", "QtStateMachine", "QtSvg", "QtSvgWidgets", "QtTest", "QtTextToSpeech",
+        "QtUiTools", "QtWebChannel", "QtWebEngineCore", "QtWebEngineQuick", "QtWebEngineWidgets",
+        "QtWebSockets", "QtWebView", "QtXml",
+    )
+]
+# Pulled in through optional imports, never used at runtime
+PY_EXCLUDES = ["tkinter", "unittest", "pydoc", "doctest", "setuptools", "pip", "distutils", "lib2to3", "test"]
+
+# The interpreter DLL of the Python doing the build, e.g. python311.dll
+PYTHON_DLL = f"python{sys.version_info.major}{sys.version_info.minor}.dll"
+
+# Qt libraries, plugins and data the PySide6 hooks collect whether or not
+# their Python module is imported
+QT_DROP = (
+    "Qt6Qml", "Qt6Quick", "Qt6Pdf", "Qt6VirtualKeyboard", "Qt6WebEngine", "Qt63D", "Qt6Multimedia",
+    "Qt6Charts", "Qt6DataVisualization", "Qt6Designer", "Qt6Sql", "Qt6Test", "Qt6Network",
+    "opengl32sw", "PySide6/translations", "PySide6/qml", "plugins/networkinformation", "plugins/tls",
+    "plugins/platforminputcontexts", "plugins/imageformats/qpdf",
+)
+
+
+def keep(entry):
+    dest, source = (path.replace("\\", "/") for path in entry[:2])
+    return not any(name in dest or name in source for name in QT_DROP)
 
 
 a = Analysis(
@@ -10,30 +62,63 @@ a = Analysis(
     hookspath=[],
     hooksconfig={},
     runtime_hooks=[],
-    excludes=[],
+    excludes=QT_EXCLUDES + PY_EXCLUDES,
     noarchive=False,
-    optimize=0,
+    # -OO for the fast build: no asserts, no docstrings, smaller .pyc to load
+    optimize=2 if fast else 0,
 )
+a.binaries = [entry for entry in a.binaries if keep(entry)]
+a.datas = [entry for entry in a.datas if keep(entry)]
 pyz = PYZ(a.pure)
 
-exe = EXE(
-    pyz,
-    a.scripts,
-    a.binaries,
-    a.datas,
-    [],
-    name='MoltenLauncher',
-    debug=False,
-    bootloader_ignore_signals=False,
-    strip=False,
-    upx=True,
-    upx_exclude=[],
-    runtime_tmpdir=None,
-    console=False,
-    disable_windowed_traceback=False,
-    argv_emulation=False,
-    target_arch=None,
-    codesign_identity=None,
-    entitlements_file=None,
-    icon=['cracked_pattern_texture_background.ico'],
-)
+if fast:
+    exe = EXE(
+        pyz,
+        a.scripts,
+        [],
+        exclude_binaries=True,
+        name='MoltenLauncher',
+        debug=False,
+        bootloader_ignore_signals=False,
+        strip=False,
+        upx=False,
+        console=False,
+        disable_windowed_traceback=False,
+        argv_emulation=False,
+        target_arch=None,
+        codesign_identity=None,
+        entitlements_file=None,
+        icon=['cracked_pattern_texture_background.ico'],
+    )
+    coll = COLLECT(
+        exe,
+        a.binaries,
+        a.datas,
+        strip=False,
+        upx=False,
+        name='MoltenLauncher',
+    )
+else:
+    exe = EXE(
+        pyz,
+        a.scripts,
+        a.binaries,
+        a.datas,
+        [],
+        name='MoltenLauncher',
+        debug=False,
+        bootloader_ignore_signals=False,
+        strip=False,
+        upx=True,
+        # Decompressing Qt and Python on every start costs more than it saves
+        upx_exclude=['Qt6Core.dll', 'Qt6Gui.dll', 'Qt6Widgets.dll', 'python3.dll', PYTHON_DLL,
+                     'vcruntime140.dll', 'vcruntime140_1.dll'],
+        runtime_tmpdir=None,
+        console=False,
+        disable_windowed_traceback=False,
+        argv_emulation=False,
+        target_arch=None,
+        codesign_identity=None,
+        entitlements_file=None,
+        icon=['cracked_pattern_texture_background.ico'],
+    )
@@ -1,20 +1,123 @@
+import atexit
 import json
 import os
 import shutil
+import threading
+import time
+
+
+def atomic_write(path, text):
+    # Write to a temp file in the same dir, fsync it and rename over the
+    # target so a crash mid-write leaves either the old or the new file
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w") as f:
+        f.write(text)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+class DebouncedWriter:
+    """
+    Coalesces writes per file and performs them on a background thread once
+    no new change has arrived for `delay` seconds. Callers serialize on
+    their own thread and pass the text, so only the I/O happens off-thread
+    and a write never sees data mid-change.
+    """
+
+    def __init__(self, delay=0.5):
+        self.delay = delay
+        self._pending = {}
+        self._cond = threading.Condition()
+        self._write_lock = threading.Lock()
+        self._thread = None
+        # Writes taken off _pending by the thread and not finished yet
+        self._in_flight = 0
+        # Per path sequence of the newest text written, so an older text
+        # never overwrites a newer one
+        self._seq = 0
+        self._written = {}
+
+    def schedule(self, path, text):
+        with self._cond:
+            self._seq += 1
+            self._pending[path] = (time.monotonic() + self.delay, self._seq, text)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, daemon=True)
+                self._thread.start()
+            self._cond.notify_all()
+
+    def flush(self):
+        """Write everything pending and wait for writes already in progress."""
+        with self._cond:
+            pending, self._pending = self._pending, {}
+        for path, (_, seq, text) in pending.items():
+            self._write(path, seq, text)
+        with self._cond:
+            while self._in_flight:
+                self._cond.wait()
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while not self._pending:
+                    self._cond.wait()
+                now = time.monotonic()
+                due = {path: item for path, item in self._pending.items() if item[0] <= now}
+                if not due:
+                    self._cond.wait(min(item[0] for item in self._pending.values()) - now)
+                    continue
+                for path in due:
+                    del self._pending[path]
+                self._in_flight += len(due)
+            try:
+                for path, (_, seq, text) in due.items():
+                    self._write(path, seq, text)
+            finally:
+                with self._cond:
+                    self._in_flight -= len(due)
+                    self._cond.notify_all()
+
+    def _write(self, path, seq, text):
+        with self._write_lock:
+            if seq <= self._written.get(path, 0):
+                return
+            try:
+                atomic_write(path, text)
+                self._written[path] = seq
+            except Exception as e:
+                print(f"Error saving {path}: {e}")
+
+
+# Fields kept in launcher_state.json for every instance. Everything else
+# (mods, per-instance settings) lives in instances/<id>/instance.json and
+# is only read when the instance is opened.
+SUMMARY_KEYS = ("id", "name", "version", "loader")
+INSTANCE_FILE = "instance.json"
+
 
 class AppState:
     def __init__(self):
         self.config_file = "launcher_state.json"
         self.username = "Player"
         self.ram = 2048  # Default 2GB
+        self.max_total_ram = 0  # Cap on the heaps of all running instances, 0 = none
         self.minecraft_dir = os.path.join(os.getcwd(), "minecraft_data")
+        self.instances_dir = os.path.join(os.getcwd(), "instances")
+        self.store_dir = os.path.join(os.getcwd(), "object_store")
+        self.logs_dir = os.path.join(os.getcwd(), "logs")
+        self.cache_dir = os.path.join(os.getcwd(), "cache")
         self.modpacks = []
         self.active_modpack = None
         self.java_path = ""
+        self.jvm_profile = "auto"
         self.ms_auth_data = None
         self.skin_path = ""
+        self._instances = {}
+        self._writer = DebouncedWriter()
         
         self.load()
+        atexit.register(self.flush)
 
     def load(self):
         if os.path.exists(self.config_file):
@@ -23,9 +126,13 @@ class AppState:
                     data = json.load(f)
                     self.username = data.get("username", self.username)
                     self.ram = data.get("ram", self.ram)
+                    self.max_total_ram = data.get("max_total_ram", self.max_total_ram)
                     self.minecraft_dir = data.get("minecraft_dir", self.minecraft_dir)
+                    self.instances_dir = data.get("instances_dir", self.instances_dir)
+                    self.store_dir = data.get("store_dir", self.store_dir)
                     self.java_path = data.get("java_path", self.java_path)
-                    self.modpacks = data.get("modpacks", [])
+                    self.jvm_profile = data.get("jvm_profile", self.jvm_profile)
+                    migrated = self._load_modpacks(data.get("modpacks", []))
                     self.ms_auth_data = data.get("ms_auth_data")
                     self.skin_path = data.get("skin_path", "")
                     active_id = data.get("active_modpack")
@@ -34,25 +141,92 @@ class AppState:
                             if mp.get("id") == active_id:
                                 self.active_modpack = mp
                                 break
+                if migrated:
+                    self.save()
+                    self.flush()
             except Exception as e:
                 print(f"Error loading state: {e}")
 
+    def _load_modpacks(self, modpacks):
+        # Older launcher_state.json files stored every full modpack inline;
+        # move those out into per-instance manifests
+        migrated = False
+        self.modpacks = []
+        for mp in modpacks:
+            if "mods" in mp:
+                path = self._instance_file(mp["id"])
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                atomic_write(path, json.dumps(mp, indent=4))
+                migrated = True
+            self.modpacks.append(self._summary(mp))
+        return migrated
+
     def save(self):
+        # Debounced: typing in a field calls this on every keystroke. The
+        # state is small, so serializing each time is cheap; the write is not
+        self._writer.schedule(self.config_file, self._serialize())
+
+    def flush(self):
+        self._writer.flush()
+
+    def _serialize(self):
         data = {
             "username": self.username,
             "ram": self.ram,
+            "max_total_ram": self.max_total_ram,
             "minecraft_dir": self.minecraft_dir,
+            "instances_dir": self.instances_dir,
+            "store_dir": self.store_dir,
             "java_path": self.java_path,
+            "jvm_profile": self.jvm_profile,
             "modpacks": self.modpacks,
             "ms_auth_data": self.ms_auth_data,
             "skin_path": self.skin_path,
             "active_modpack": self.active_modpack.get("id") if self.active_modpack else None
         }
-        try:
-            with open(self.config_file, "w") as f:
-                json.dump(data, f, indent=4)
-        except Exception as e:
-            print(f"Error saving state: {e}")
+        return json.dumps(data, indent=4)
+
+    # -------------------------
+    # Instances
+    # -------------------------
+    def _instance_file(self, modpack_id):
+        return os.path.join(self.instances_dir, modpack_id, INSTANCE_FILE)
+
+    def _summary(self, modpack):
+        summary = {key: modpack.get(key) for key in SUMMARY_KEYS}
+        summary["mod_count"] = len(modpack["mods"]) if "mods" in modpack else modpack.get("mod_count", 0)
+        return summary
+
+    def get_modpack(self, modpack_id):
+        """Return the full instance manifest, reading it from disk on first use."""
+        if modpack_id not in self._instances:
+            try:
+                with open(self._instance_file(modpack_id), "r") as f:
+                    self._instances[modpack_id] = json.load(f)
+            except FileNotFoundError:
+                summary = next(mp for mp in self.modpacks if mp["id"] == modpack_id)
+                modpack = {key: summary[key] for key in SUMMARY_KEYS}
+                modpack["mods"] = []
+                self._instances[modpack_id] = modpack
+        return self._instances[modpack_id]
+
+    def save_modpack(self, modpack):
+        """Persist one instance; launcher_state.json is only rewritten if its summary changed."""
+        self._instances[modpack["id"]] = modpack
+        path = self._instance_file(modpack["id"])
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._writer.schedule(path, json.dumps(modpack, indent=4))
+
+        summary = self._summary(modpack)
+        for mp in self.modpacks:
+            if mp["id"] == modpack["id"]:
+                if mp != summary:
+                    # Update in place, widgets hold on to these dicts
+                    mp.update(summary)
+                    self.save()
+                return
+        self.modpacks.append(summary)
+        self.save()
 
     def add_modpack(self, name, version, loader):
         import uuid
@@ -63,11 +237,62 @@ class AppState:
             "loader": loader,
             "mods": []
         }
-        self.modpacks.append(modpack)
-        self.active_modpack = modpack
+        # Instance dirs only hold links into the shared object store, so
+        # creating one is just a mkdir
+        os.makedirs(self.get_game_dir(modpack), exist_ok=True)
+        self.save_modpack(modpack)
+        self.active_modpack = self.modpacks[-1]
         self.save()
         return modpack
 
+    def clone_modpack(self, modpack_id, name, include_saves=True):
+        """
+        Copy an instance under a new id. Jars and assets are hardlinked and
+        configs reflinked or copied, see launcher.snapshots.clone_tree.
+        Returns (modpack, clone stats).
+        """
+        import uuid
+        from launcher.snapshots import clone_tree
+
+        source = self.get_modpack(modpack_id)
+        # Pending debounced writes must be on disk before the tree is cloned
+        self.flush()
+        modpack = json.loads(json.dumps(source))
+        modpack.update(id=str(uuid.uuid4()), name=name)
+        skip_dirs = () if include_saves else ("saves",)
+        stats = clone_tree(self.get_game_dir(source), self.get_game_dir(modpack), skip_dirs=skip_dirs)
+        self.save_modpack(modpack)
+        self.active_modpack = self.modpacks[-1]
+        self.save()
+        return modpack, stats
+
+    def snapshots(self):
+        from launcher.snapshots import SnapshotStore
+        return SnapshotStore(os.path.join(self.instances_dir, ".snapshots"))
+
+    def snapshot_modpack(self, modpack_id, label=""):
+        self.flush()
+        modpack = self.get_modpack(modpack_id)
+        return self.snapshots().create(modpack_id, self.get_game_dir(modpack), label)
+
+    def restore_snapshot(self, modpack_id, snapshot_id):
+        """Put an instance back the way a snapshot recorded it, manifest included."""
+        self.flush()
+        modpack = self.get_modpack(modpack_id)
+        stats = self.snapshots().restore(modpack_id, snapshot_id, self.get_game_dir(modpack))
+        self._instances.pop(modpack_id, None)
+        # Refresh the summary from the restored instance.json
+        self.save_modpack(self.get_modpack(modpack_id))
+        return stats
+
+    def get_game_dir(self, modpack=None):
+        if not modpack:
+            return self.minecraft_dir
+        return os.path.join(self.instances_dir, modpack["id"])
+
+    def get_all_game_dirs(self):
+        return [self.minecraft_dir] + [self.get_game_dir(mp) for mp in self.modpacks]
+
     def set_skin(self, source_path):
         if not os.path.exists(source_path):
             return
@@ -88,4 +313,28 @@ class AppState:
             print(f"Error saving skin: {e}")
             return False
 
-state = AppState()
+class _LazyState:
+    """
+    Stands in for the AppState until it is first used, so importing this
+    module does not read launcher_state.json.
+    """
+
+    def __init__(self):
+        object.__setattr__(self, "_state", None)
+        object.__setattr__(self, "_lock", threading.Lock())
+
+    def _get(self):
+        if self._state is None:
+            with self._lock:
+                if self._state is None:
+                    object.__setattr__(self, "_state", AppState())
+        return self._state
+
+    def __getattr__(self, name):
+        return getattr(self._get(), name)
+
+    def __setattr__(self, name, value):
+        setattr(self._get(), name, value)
+
+
+state = _LazyState()
@@ -0,0 +1,148 @@
+"""
+Benchmark the parallel downloader against a serial requests loop.
+
+Serves a synthetic object set (or the real assets under
+minecraft_data/assets/objects with --real) from a local HTTP server that
+supports Range requests and adds per-request latency to mimic a CDN.
+
+    python bench/download_bench.py --files 2000 --latency 20
+"""
+import argparse
+import hashlib
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import time
+from http.server import ThreadingHTTPServer, SimpleHTTPRequestHandler
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import requests
+
+from launcher.downloader import Downloader, DownloadTask
+
+
+class RangeHandler(SimpleHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    latency = 0.0
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        time.sleep(self.latency)
+        path = self.translate_path(self.path)
+        if not os.path.isfile(path):
+            self.send_error(404)
+            return
+        size = os.path.getsize(path)
+        start = 0
+        rng = self.headers.get("Range")
+        if rng and rng.startswith("bytes="):
+            start = int(rng[6:].split("-")[0])
+            if start >= size:
+                self.send_response(416)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return
+            self.send_response(206)
+            self.send_header("Content-Range", f"bytes {start}-{size - 1}/{size}")
+        else:
+            self.send_response(200)
+        self.send_header("Content-Length", str(size - start))
+        self.end_headers()
+        with open(path, "rb") as f:
+            f.seek(start)
+            shutil.copyfileobj(f, self.wfile)
+
+
+def make_objects(root, count, size):
+    objects = []
+    for i in range(count):
+        data = os.urandom(size)
+        h = hashlib.sha1(data).hexdigest()
+        path = os.path.join(root, h[:2], h)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "wb") as f:
+            f.write(data)
+        objects.append((h, size))
+    return objects
+
+
+def real_objects(root):
+    objects = []
+    for sub in os.listdir(root):
+        for h in os.listdir(os.path.join(root, sub)):
+            objects.append((h, os.path.getsize(os.path.join(root, sub, h))))
+    return objects
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--files", type=int, default=1000)
+    parser.add_argument("--size", type=int, default=16 * 1024)
+    parser.add_argument("--latency", type=float, default=10, help="per-request latency in ms")
+    parser.add_argument("--workers", type=int, default=16)
+    parser.add_argument("--real", action="store_true", help="serve minecraft_data/assets/objects")
+    args = parser.parse_args()
+
+    work = tempfile.mkdtemp(prefix="molten-bench-")
+    try:
+        if args.real:
+            serve_root = os.path.join("minecraft_data", "assets", "objects")
+            objects = real_objects(serve_root)
+        else:
+            serve_root = os.path.join(work, "server")
+            objects = make_objects(serve_root, args.files, args.size)
+
+        RangeHandler.latency = args.latency / 1000.0
+        handler = lambda *a, **kw: RangeHandler(*a, directory=serve_root, **kw)
+        server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        base = f"http://127.0.0.1:{server.server_port}"
+        total_bytes = sum(size for _, size in objects)
+        print(f"{len(objects)} objects, {total_bytes / 1024 / 1024:.1f} MB, {args.latency:.0f} ms latency")
+
+        # Serial baseline: one request after another on a fresh connection
+        serial_dir = os.path.join(work, "serial")
+        start = time.perf_counter()
+        for h, _ in objects:
+            resp = requests.get(f"{base}/{h[:2]}/{h}")
+            path = os.path.join(serial_dir, h[:2], h)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, "wb") as f:
+                f.write(resp.content)
+        serial = time.perf_counter() - start
+        print(f"serial:   {serial:7.2f}s")
+
+        parallel_dir = os.path.join(work, "parallel")
+        tasks = [
+            DownloadTask(f"{base}/{h[:2]}/{h}", os.path.join(parallel_dir, h[:2], h), h, size)
+            for h, size in objects
+        ]
+        start = time.perf_counter()
+        with Downloader(max_workers=args.workers) as downloader:
+            downloader.download_all(tasks)
+        parallel = time.perf_counter() - start
+        print(f"parallel: {parallel:7.2f}s  ({serial / parallel:.1f}x, {args.workers} workers)")
+
+        # Resume: truncate every object to half and leave it as a part file
+        for task in tasks:
+            os.replace(task.path, task.path + ".part")
+            with open(task.path + ".part", "r+b") as f:
+                f.truncate(task.size // 2)
+        start = time.perf_counter()
+        with Downloader(max_workers=args.workers) as downloader:
+            downloader.download_all(tasks)
+            resumed = downloader.bytes_downloaded
+        print(f"resume:   {time.perf_counter() - start:7.2f}s  ({resumed / 1024 / 1024:.1f} MB fetched)")
+
+        server.shutdown()
+    finally:
+        shutil.rmtree(work, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,305 @@
+"""
+Local stand-in for the Modrinth API, used to exercise ModrinthClient (and
+the launcher itself, via MOLTEN_MODRINTH_URL) without touching the network.
+
+Serves a synthetic catalogue of mods (with versions, dependencies, jars and
+icons) with ETags and optional latency, plus the bulk hash lookup
+POST /version_files/update used by launcher.mod_update. Run
+directly to benchmark cold, revalidated and cached searches:
+
+    python bench/fake_modrinth.py --mods 500 --latency 150
+    python bench/fake_modrinth.py --serve 8765     # then MOLTEN_MODRINTH_URL=http://127.0.0.1:8765
+"""
+import argparse
+import hashlib
+import json
+import os
+import shutil
+import struct
+import sys
+import tempfile
+import threading
+import time
+import zlib
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlparse, parse_qs
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from launcher.modrinth import ModrinthClient, CancelToken, RequestCancelled
+
+
+def make_catalogue(count):
+    mods = []
+    for i in range(count):
+        mods.append({
+            "project_id": f"mod{i:05d}",
+            "slug": f"mod-{i}",
+            "title": f"Mod {i}",
+            "author": f"author{i % 37}",
+            "description": f"Synthetic test mod number {i}",
+            "categories": ["fabric" if i % 2 else "forge", "utility"],
+            "versions": ["1.20.1", "1.21.1"],
+            "downloads": 1000000 - i,
+            "date_modified": f"2024-01-01T00:00:00.{i:06d}Z",
+            "icon_url": None,
+            "project_type": "mod",
+            "_versions": make_versions(i, count),
+        })
+    return mods
+
+
+def jar_bytes(version_id):
+    return f"fake jar {version_id}\n".encode() * 256
+
+
+def make_versions(i, count):
+    """Three versions per mod (Forge 1.20.1, Fabric 1.20.1, Fabric 1.20.1 + 1.21.1) and a few dependencies."""
+    project_id = f"mod{i:05d}"
+    deps = []
+    if i % 5 == 0 and i + 1 < count:
+        deps.append({"project_id": f"mod{i + 1:05d}", "version_id": None, "dependency_type": "required"})
+    if i % 7 == 0 and i + 2 < count:
+        deps.append({"project_id": f"mod{i + 2:05d}", "version_id": None, "dependency_type": "optional"})
+    versions = []
+    for n, (loader, games) in enumerate([("forge", ["1.20.1"]), ("fabric", ["1.20.1"]), ("fabric", ["1.20.1", "1.21.1"])]):
+        version_id = f"{project_id}v{n}"
+        data = jar_bytes(version_id)
+        versions.append({
+            "id": version_id,
+            "project_id": project_id,
+            "version_number": f"1.{n}.0",
+            "version_type": "release",
+            "date_published": f"2024-0{n + 1}-01T00:00:00Z",
+            "loaders": [loader],
+            "game_versions": games,
+            "dependencies": deps,
+            "files": [{
+                "url": None,
+                "filename": f"mod-{i}-1.{n}.0.jar",
+                "primary": True,
+                "hashes": {"sha1": hashlib.sha1(data).hexdigest()},
+                "size": len(data),
+            }],
+        })
+    return versions
+
+
+def make_png(seed, size=256):
+    """A solid-colour RGB PNG, large enough that the launcher has to downscale it."""
+    color = bytes([(seed * 53) % 256, (seed * 97) % 256, (seed * 151) % 256])
+    raw = b"".join(b"\x00" + color * size for _ in range(size))
+
+    def chunk(kind, data):
+        return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", zlib.crc32(kind + data))
+
+    header = struct.pack(">IIBBBBB", size, size, 8, 2, 0, 0, 0)
+    return b"\x89PNG\r\n\x1a\n" + chunk(b"IHDR", header) + chunk(b"IDAT", zlib.compress(raw)) + chunk(b"IEND", b"")
+
+
+class FakeModrinth:
+    """A threaded HTTP server speaking a subset of the Modrinth v2 API."""
+
+    def __init__(self, mods, latency=0.0, port=0):
+        self.mods = mods
+        self.by_id = {m["project_id"]: m for m in mods}
+        self.versions = {v["id"]: v for m in mods for v in m["_versions"]}
+        self.by_sha1 = {v["files"][0]["hashes"]["sha1"]: v for v in self.versions.values()}
+        self.latency = latency
+        self.requests = 0
+        self.icon_requests = 0
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                fake.requests += 1
+                time.sleep(fake.latency)
+                url = urlparse(self.path)
+                if url.path.startswith("/files/"):
+                    data = jar_bytes(url.path[len("/files/"):-len(".jar")])
+                    self.send_response(200)
+                    self.send_header("Content-Type", "application/java-archive")
+                    self.send_header("Content-Length", str(len(data)))
+                    self.end_headers()
+                    self.wfile.write(data)
+                    return
+                if url.path.startswith("/icons/"):
+                    fake.icon_requests += 1
+                    data = make_png(int(url.path[len("/icons/mod"):-len(".png")]))
+                    self.send_response(200)
+                    self.send_header("Content-Type", "image/png")
+                    self.send_header("Content-Length", str(len(data)))
+                    self.end_headers()
+                    self.wfile.write(data)
+                    return
+                self.reply(*fake.route(url.path, parse_qs(url.query)))
+
+            def do_POST(self):
+                fake.requests += 1
+                time.sleep(fake.latency)
+                length = int(self.headers.get("Content-Length", 0))
+                payload = json.loads(self.rfile.read(length) or b"{}")
+                self.reply(*fake.route_post(urlparse(self.path).path, payload))
+
+            def reply(self, status, body):
+                data = json.dumps(body).encode()
+                etag = '"' + hashlib.sha1(data).hexdigest() + '"'
+                if status == 200 and self.headers.get("If-None-Match") == etag:
+                    self.send_response(304)
+                    self.send_header("ETag", etag)
+                    self.send_header("Content-Length", "0")
+                    self.end_headers()
+                    return
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("ETag", etag)
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", port), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_port}/v2"
+        host = f"http://127.0.0.1:{self.server.server_port}"
+        for mod in mods:
+            if mod["icon_url"] is None:
+                mod["icon_url"] = f"{host}/icons/{mod['project_id']}.png"
+        for version in self.versions.values():
+            version["files"][0]["url"] = f"{host}/files/{version['id']}.jar"
+
+    def hit(self, mod):
+        return {k: v for k, v in mod.items() if not k.startswith("_")}
+
+    def project(self, mod):
+        versions = mod["_versions"]
+        return {
+            **self.hit(mod),
+            "id": mod["project_id"],
+            "versions": [v["id"] for v in versions],
+            "loaders": sorted({l for v in versions for l in v["loaders"]}),
+            "game_versions": sorted({g for v in versions for g in v["game_versions"]}),
+        }
+
+    def route(self, path, query):
+        if path == "/v2/search":
+            needle = query.get("query", [""])[0].lower()
+            offset = int(query.get("offset", ["0"])[0])
+            limit = int(query.get("limit", ["10"])[0])
+            hits = [m for m in self.mods if needle in m["title"].lower() or needle in m["description"].lower()]
+            if query.get("index", [""])[0] == "updated":
+                hits.sort(key=lambda m: m["date_modified"], reverse=True)
+            page = [self.hit(m) for m in hits[offset:offset + limit]]
+            return 200, {"hits": page, "offset": offset, "limit": limit, "total_hits": len(hits)}
+        if path.startswith("/v2/project/") and path.endswith("/version"):
+            mod = self.by_id.get(path.split("/")[3])
+            if not mod:
+                return 404, {"error": "not_found"}
+            loaders = json.loads(query.get("loaders", ["null"])[0])
+            games = json.loads(query.get("game_versions", ["null"])[0])
+            return 200, [
+                v for v in mod["_versions"]
+                if (not loaders or set(loaders) & set(v["loaders"])) and (not games or set(games) & set(v["game_versions"]))
+            ]
+        if path.startswith("/v2/project/"):
+            mod = self.by_id.get(path.rsplit("/", 1)[1])
+            return (200, self.project(mod)) if mod else (404, {"error": "not_found"})
+        if path == "/v2/projects":
+            ids = json.loads(query.get("ids", ["[]"])[0])
+            return 200, [self.project(self.by_id[i]) for i in ids if i in self.by_id]
+        if path == "/v2/versions":
+            ids = json.loads(query.get("ids", ["[]"])[0])
+            return 200, [self.versions[i] for i in ids if i in self.versions]
+        return 404, {"error": "not_found"}
+
+    def route_post(self, path, payload):
+        if path == "/v2/version_files/update":
+            loaders = set(payload.get("loaders") or [])
+            games = set(payload.get("game_versions") or [])
+            result = {}
+            for sha1 in payload.get("hashes", []):
+                installed = self.by_sha1.get(sha1)
+                if installed is None:
+                    continue
+                candidates = [
+                    v for v in self.by_id[installed["project_id"]]["_versions"]
+                    if (not loaders or loaders & set(v["loaders"])) and (not games or games & set(v["game_versions"]))
+                ]
+                if candidates:
+                    result[sha1] = max(candidates, key=lambda v: v["date_published"])
+            return 200, result
+        return 404, {"error": "not_found"}
+
+    def start(self):
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+def timed(fn):
+    start = time.perf_counter()
+    fn()
+    return (time.perf_counter() - start) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--mods", type=int, default=500)
+    parser.add_argument("--latency", type=float, default=150, help="per-request latency in ms")
+    parser.add_argument("--serve", type=int, help="only run the fake server on this port")
+    args = parser.parse_args()
+
+    fake = FakeModrinth(make_catalogue(args.mods), latency=args.latency / 1000.0, port=args.serve or 0)
+    if args.serve:
+        print(f"Fake Modrinth API on {fake.url}")
+        fake.server.serve_forever()
+        return
+
+    fake.start()
+    cache_dir = tempfile.mkdtemp(prefix="molten-modrinth-")
+    try:
+        client = ModrinthClient(base_url=fake.url, cache_dir=cache_dir, ttl=600)
+        print(f"cold search:        {timed(lambda: client.search('mod 1', limit=20)):7.1f} ms")
+        print(f"cached search:      {timed(lambda: client.search('mod 1', limit=20)):7.1f} ms")
+
+        client.ttl = 0
+        print(f"revalidated (304):  {timed(lambda: client.search('mod 1', limit=20)):7.1f} ms")
+
+        # A new client reads the same cache dir, as after a launcher restart
+        restarted = ModrinthClient(base_url=fake.url, cache_dir=cache_dir, ttl=600)
+        print(f"cached after reopen:{timed(lambda: restarted.search('mod 1', limit=20)):7.1f} ms")
+
+        # Typing "m", "mo", "mod" ... cancels each previous search
+        token = None
+        cancelled = []
+        threads = []
+        for i in range(1, 6):
+            if token:
+                token.cancel()
+            token = CancelToken()
+
+            def run(query=f"mod 2{'0' * i}", tok=token):
+                try:
+                    restarted.search(query, cancel=tok)
+                except RequestCancelled:
+                    cancelled.append(query)
+            t = threading.Thread(target=run)
+            t.start()
+            threads.append(t)
+            time.sleep(args.latency / 4000.0)
+        for t in threads:
+            t.join()
+        print(f"stale searches cancelled: {len(cancelled)}/4, requests served: {fake.requests}")
+    finally:
+        fake.stop()
+        shutil.rmtree(cache_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
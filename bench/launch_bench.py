@@ -0,0 +1,68 @@
+"""
+Measure launch preparation: the install index check plus building the
+launch command, with and without the command cache.
+
+    python bench/launch_bench.py --version 1.21.11 --dir minecraft_data
+"""
+import argparse
+import os
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import minecraft_launcher_lib
+
+from launcher.command_cache import CommandCache
+from launcher.install_index import InstallIndex
+
+
+def timed(fn, runs):
+    samples = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--version", default="1.21.11")
+    parser.add_argument("--dir", default="minecraft_data")
+    parser.add_argument("--runs", type=int, default=20)
+    args = parser.parse_args()
+
+    options = {
+        "username": "Player", "uuid": "", "token": "",
+        "jvmArguments": ["-Xmx2048M", "-Xms2048M"],
+    }
+
+    # Work on a scratch copy of the version JSON so the cache file does not
+    # land in the real game dir
+    work = tempfile.mkdtemp(prefix="molten-launch-bench-")
+    try:
+        src = os.path.join(args.dir, "versions", args.version)
+        dst = os.path.join(work, "versions", args.version)
+        os.makedirs(dst)
+        shutil.copy2(os.path.join(src, f"{args.version}.json"), dst)
+
+        index_ms = timed(lambda: InstallIndex(args.dir).is_version_ready(args.version), args.runs)
+        ready = InstallIndex(args.dir).is_version_ready(args.version)
+        print(f"install index check:   {index_ms:8.2f} ms  ({'ready' if ready else 'not indexed yet'})")
+
+        uncached = timed(lambda: minecraft_launcher_lib.command.get_minecraft_command(args.version, work, options), args.runs)
+        print(f"get_minecraft_command: {uncached:8.2f} ms")
+
+        CommandCache(work).get_command(args.version, options)
+        cached = timed(lambda: CommandCache(work).get_command(args.version, options), args.runs)
+        print(f"command cache hit:     {cached:8.2f} ms  ({uncached / cached:.1f}x)")
+    finally:
+        shutil.rmtree(work, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""
+Replay a captured game log into the Logs page viewer and report frame
+times and memory.
+
+    QT_QPA_PLATFORM=offscreen python bench/log_view_bench.py --rate 10000 --seconds 10
+    QT_QPA_PLATFORM=offscreen python bench/log_view_bench.py --baseline   # old QTextEdit path
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from PySide6.QtWidgets import QApplication, QTextEdit
+
+from ui.log_view import LogView
+
+
+def rss_mb():
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    import resource
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--log", default=os.path.join("logs", "latest.log"))
+    parser.add_argument("--rate", type=int, default=10000, help="lines per second")
+    parser.add_argument("--seconds", type=float, default=10)
+    parser.add_argument("--interval", type=float, default=0.05, help="batch interval in seconds")
+    parser.add_argument("--baseline", action="store_true", help="append line by line to a QTextEdit")
+    args = parser.parse_args()
+
+    with open(args.log, "r", encoding="utf-8", errors="replace") as f:
+        captured = [line.rstrip("\n") for line in f]
+
+    app = QApplication(sys.argv)
+    if args.baseline:
+        view = QTextEdit()
+        view.setReadOnly(True)
+    else:
+        view = LogView()
+    view.resize(1000, 700)
+    view.show()
+    app.processEvents()
+
+    per_batch = max(1, int(args.rate * args.interval))
+    batches = int(args.seconds / args.interval)
+    frame_ms = []
+    pos = 0
+    start_rss = rss_mb()
+    start = time.perf_counter()
+    for _ in range(batches):
+        batch = []
+        for _ in range(per_batch):
+            batch.append(("stdout", captured[pos % len(captured)]))
+            pos += 1
+
+        t0 = time.perf_counter()
+        if args.baseline:
+            for _, line in batch:
+                view.append(line)
+                sb = view.verticalScrollBar()
+                sb.setValue(sb.maximum())
+        else:
+            view.append_lines(batch)
+        app.processEvents()
+        frame_ms.append((time.perf_counter() - t0) * 1000)
+
+    elapsed = time.perf_counter() - start
+    frame_ms.sort()
+    print(f"{'QTextEdit' if args.baseline else 'LogView'}: {pos} lines in {elapsed:.2f}s "
+          f"({pos / elapsed:.0f} lines/s, target {args.rate})")
+    print(f"frame time p50 {statistics.median(frame_ms):.2f} ms, "
+          f"p99 {frame_ms[int(len(frame_ms) * 0.99) - 1]:.2f} ms, max {frame_ms[-1]:.2f} ms")
+    print(f"RSS {start_rss:.0f} MB -> {rss_mb():.0f} MB")
+
+
+if __name__ == "__main__":
+    main()
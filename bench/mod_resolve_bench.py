@@ -0,0 +1,60 @@
+"""
+Resolve and install a large mod pack against the fake Modrinth API,
+comparing the bulk resolver with one lookup per mod.
+
+    python bench/mod_resolve_bench.py --mods 200 --latency 100
+"""
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fake_modrinth import FakeModrinth, make_catalogue
+from launcher.mod_install import ModResolver, install_mods
+from launcher.modrinth import ModrinthClient
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--mods", type=int, default=200)
+    parser.add_argument("--latency", type=float, default=100, help="per-request latency in ms")
+    args = parser.parse_args()
+
+    fake = FakeModrinth(make_catalogue(args.mods), latency=args.latency / 1000.0).start()
+    work = tempfile.mkdtemp(prefix="molten-mods-")
+    try:
+        project_ids = [m["project_id"] for m in fake.mods]
+
+        # Baseline: one filtered version query per mod, one after another
+        client = ModrinthClient(base_url=fake.url)
+        start = time.perf_counter()
+        for project_id in project_ids:
+            client.project_versions(project_id, ["fabric"], ["1.20.1"])
+        serial = time.perf_counter() - start
+        print(f"per-mod lookups: {serial:7.2f}s  ({len(project_ids)} requests)")
+
+        fake.requests = 0
+        start = time.perf_counter()
+        resolved = ModResolver(client, "1.20.1", "fabric").resolve(project_ids)
+        bulk = time.perf_counter() - start
+        print(f"bulk resolver:   {bulk:7.2f}s  ({fake.requests} requests, {len(resolved)} mods, {serial / bulk:.0f}x)")
+
+        modpack = {"id": "bench", "name": "Bench", "version": "1.20.1", "loader": "Fabric", "mods": []}
+        game_dir = os.path.join(work, "instance")
+        start = time.perf_counter()
+        install_mods(client, modpack, game_dir, project_ids[:args.mods // 2])
+        print(f"install half:    {time.perf_counter() - start:7.2f}s  ({len(modpack['mods'])} mods incl. dependencies)")
+        start = time.perf_counter()
+        install_mods(client, modpack, game_dir, project_ids)
+        print(f"install all:     {time.perf_counter() - start:7.2f}s  ({len(modpack['mods'])} mods)")
+    finally:
+        fake.stop()
+        shutil.rmtree(work, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+"""
+Check a large instance for mod updates against the fake Modrinth API and
+apply them: first check (hashing every jar), repeat check (stat calls
+only), the replacement itself, and failed updates (a bad download, a
+rename failing mid-swap) that must roll back.
+
+    python bench/mod_update_bench.py --mods 300 --latency 100
+"""
+import argparse
+import copy
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fake_modrinth import FakeModrinth, jar_bytes, make_catalogue
+from launcher.install_index import InstallIndex
+from launcher.mod_update import apply_updates, check_updates
+from launcher.modrinth import ModrinthClient
+
+
+def make_instance(game_dir, fake, outdated_every):
+    """Fabric 1.20.1 instance with every mod installed; every n-th one an older version."""
+    mods_dir = os.path.join(game_dir, "mods")
+    os.makedirs(mods_dir)
+    mods = []
+    for i, mod in enumerate(fake.mods):
+        # v1 is Fabric 1.20.1, v2 the newer Fabric 1.20.1 + 1.21.1 build
+        version = mod["_versions"][1 if i % outdated_every == 0 else 2]
+        file = version["files"][0]
+        with open(os.path.join(mods_dir, file["filename"]), "wb") as f:
+            f.write(jar_bytes(version["id"]))
+        mods.append({
+            "project_id": mod["project_id"], "version_id": version["id"], "title": mod["title"],
+            "version_number": version["version_number"], "filename": file["filename"],
+            "sha1": file["hashes"]["sha1"], "dependency": False,
+        })
+    return {"name": "Bench", "version": "1.20.1", "loader": "Fabric", "mods": mods}
+
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--mods", type=int, default=300)
+    parser.add_argument("--latency", type=float, default=100, help="per-request latency in ms")
+    parser.add_argument("--outdated-every", type=int, default=3, help="every n-th mod is out of date")
+    args = parser.parse_args()
+
+    fake = FakeModrinth(make_catalogue(args.mods), latency=args.latency / 1000.0).start()
+    work = tempfile.mkdtemp(prefix="molten-update-")
+    try:
+        client = ModrinthClient(base_url=fake.url)
+        game_dir = os.path.join(work, "instance")
+        modpack = make_instance(game_dir, fake, args.outdated_every)
+        listing = sorted(os.listdir(os.path.join(game_dir, "mods")))
+
+        fake.requests = 0
+        updates, elapsed = timed(lambda: check_updates(client, modpack, game_dir))
+        print(f"first check:   {elapsed * 1000:8.1f} ms  {len(updates)} updates, {fake.requests} requests")
+
+        fake.requests = 0
+        index = InstallIndex(game_dir)
+        hashed = []
+        original = index.record
+        index.record = lambda path, sha1=None: (hashed.append(path), original(path, sha1))
+        updates, elapsed = timed(lambda: check_updates(client, modpack, game_dir, index=index))
+        print(f"repeat check:  {elapsed * 1000:8.1f} ms  {len(hashed)} jars hashed, {fake.requests} requests")
+
+        # A bad hash on the last update makes its download fail after the
+        # others have succeeded; mods/ must come out untouched
+        broken = copy.deepcopy(updates)
+        broken[-1].file["hashes"]["sha1"] = "0" * 40
+        try:
+            apply_updates(broken, copy.deepcopy(modpack), game_dir)
+            print("rollback:      the broken update was applied?!")
+        except Exception as e:
+            unchanged = sorted(os.listdir(os.path.join(game_dir, "mods"))) == listing
+            print(f"rollback:      {'mods/ unchanged' if unchanged else 'mods/ CHANGED'} ({type(e).__name__})")
+
+        # A rename failing halfway through moving the new jars in must be
+        # undone as well
+        mods_dir = os.path.join(game_dir, "mods")
+        real_replace = os.replace
+        moved_in = []
+
+        def flaky_replace(src, dst):
+            if os.path.dirname(dst) == mods_dir:
+                moved_in.append(dst)
+                # Fails once; the rollback's renames go through
+                if len(moved_in) == len(updates) // 2:
+                    raise OSError("simulated rename failure")
+            real_replace(src, dst)
+
+        os.replace = flaky_replace
+        try:
+            apply_updates(copy.deepcopy(updates), copy.deepcopy(modpack), game_dir)
+            print("rename fail:   the failed swap was applied?!")
+        except Exception as e:
+            unchanged = sorted(os.listdir(mods_dir)) == listing
+            print(f"rename fail:   {'mods/ unchanged' if unchanged else 'mods/ CHANGED'} ({type(e).__name__})")
+        finally:
+            os.replace = real_replace
+
+        fake.requests = 0
+        _, elapsed = timed(lambda: apply_updates(updates, modpack, game_dir))
+        print(f"apply:         {elapsed * 1000:8.1f} ms  {len(updates)} jars replaced, {fake.requests} requests")
+
+        remaining, elapsed = timed(lambda: check_updates(client, modpack, game_dir))
+        print(f"after update:  {elapsed * 1000:8.1f} ms  {len(remaining)} updates left")
+    finally:
+        fake.stop()
+        shutil.rmtree(work, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,144 @@
+"""
+Compare cold and warm start times of the launcher across build profiles.
+
+A run counts as started once the main window has been shown: the launcher
+writes MOLTEN_STARTUP_READY and quits. Cold runs start from a fresh copy of
+the build (and of the source tree, so nothing is precompiled); with
+--drop-caches, run as root on Linux, the page cache is dropped first as well.
+Warm runs start the last copy again.
+
+    python bench/startup_bench.py --build
+    python bench/startup_bench.py --profiles source,fast --runs 20 --offscreen
+"""
+import argparse
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BENCH_DIR = os.path.join(ROOT, "build", "startup_bench")
+PROFILES = ("source", "onefile", "fast")
+SOURCES = ("main.py", "app_state.py", "launcher", "ui")
+EXE = "MoltenLauncher.exe" if os.name == "nt" else "MoltenLauncher"
+
+
+def build(profile):
+    dist = os.path.join(BENCH_DIR, profile, "dist")
+    subprocess.run(
+        [sys.executable, "-m", "PyInstaller", "MoltenLauncher.spec", "--noconfirm",
+         "--distpath", dist, "--workpath", os.path.join(BENCH_DIR, profile, "work"), "--", "--profile", profile],
+        cwd=ROOT, check=True,
+    )
+
+
+def fresh_copy(profile, work):
+    """Copy the build (or the sources) to `work` and return the command that starts it."""
+    if profile == "source":
+        for name in SOURCES:
+            src = os.path.join(ROOT, name)
+            if os.path.isdir(src):
+                shutil.copytree(src, os.path.join(work, name), ignore=shutil.ignore_patterns("__pycache__"))
+            else:
+                shutil.copy2(src, work)
+        return [sys.executable, os.path.join(work, "main.py")]
+
+    dist = os.path.join(BENCH_DIR, profile, "dist")
+    if profile == "onefile":
+        shutil.copy2(os.path.join(dist, EXE), work)
+        return [os.path.join(work, EXE)]
+    shutil.copytree(os.path.join(dist, "MoltenLauncher"), os.path.join(work, "MoltenLauncher"))
+    return [os.path.join(work, "MoltenLauncher", EXE)]
+
+
+def drop_caches():
+    subprocess.run(["sync"], check=True)
+    with open("/proc/sys/vm/drop_caches", "w") as f:
+        f.write("3\n")
+
+
+def start(command, offscreen, timeout=60):
+    """(ms until the window was shown, ms until the process exited)."""
+    run_dir = tempfile.mkdtemp(prefix="molten-startup-run-")
+    ready = os.path.join(run_dir, "ready")
+    env = dict(os.environ, MOLTEN_STARTUP_READY=ready)
+    env.pop("MOLTEN_STARTUP_TRACE", None)
+    if offscreen:
+        env["QT_QPA_PLATFORM"] = "offscreen"
+    try:
+        began = time.perf_counter()
+        proc = subprocess.Popen(command, cwd=run_dir, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        shown = None
+        while shown is None and time.perf_counter() - began < timeout:
+            if os.path.exists(ready):
+                shown = (time.perf_counter() - began) * 1000
+            elif proc.poll() is not None:
+                raise RuntimeError(f"{command[0]} exited with {proc.returncode} before showing the window")
+            else:
+                time.sleep(0.002)
+        if shown is None:
+            proc.kill()
+            raise RuntimeError(f"{command[0]} did not show the window within {timeout} s")
+        proc.wait(timeout)
+        return shown, (time.perf_counter() - began) * 1000
+    finally:
+        shutil.rmtree(run_dir, ignore_errors=True)
+
+
+def bench(profile, args):
+    cold, warm = [], []
+    work = None
+    try:
+        for _ in range(args.cold_runs):
+            if work:
+                shutil.rmtree(work, ignore_errors=True)
+            work = tempfile.mkdtemp(prefix=f"molten-startup-{profile}-")
+            command = fresh_copy(profile, work)
+            if args.drop_caches:
+                drop_caches()
+            cold.append(start(command, args.offscreen))
+        for _ in range(args.runs):
+            warm.append(start(command, args.offscreen))
+    finally:
+        if work:
+            shutil.rmtree(work, ignore_errors=True)
+    return cold, warm
+
+
+def summary(samples):
+    shown = [s for s, _ in samples]
+    exited = [e for _, e in samples]
+    return f"{statistics.median(shown):8.1f} ms  (min {min(shown):7.1f}, exit {statistics.median(exited):7.1f})"
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--profiles", default=",".join(PROFILES), help="comma separated: " + ", ".join(PROFILES))
+    parser.add_argument("--build", action="store_true", help="build the frozen profiles with PyInstaller first")
+    parser.add_argument("--runs", type=int, default=10, help="warm starts per profile")
+    parser.add_argument("--cold-runs", type=int, default=3, help="cold starts per profile, each from a fresh copy")
+    parser.add_argument("--drop-caches", action="store_true", help="drop the Linux page cache before cold starts (root)")
+    parser.add_argument("--offscreen", action="store_true", help="use Qt's offscreen platform (headless machines)")
+    args = parser.parse_args()
+
+    profiles = [p.strip() for p in args.profiles.split(",") if p.strip()]
+    for profile in profiles:
+        if profile not in PROFILES:
+            parser.error(f"unknown profile {profile!r}")
+        if args.build and profile != "source":
+            build(profile)
+
+    print(f"{'profile':<10} {'cold (window shown)':<44} warm (window shown)")
+    for profile in profiles:
+        if profile != "source" and not os.path.exists(os.path.join(BENCH_DIR, profile, "dist")):
+            print(f"{profile:<10} not built, run with --build")
+            continue
+        cold, warm = bench(profile, args)
+        print(f"{profile:<10} {summary(cold):<44} {summary(warm)}")
+
+
+if __name__ == "__main__":
+    main()
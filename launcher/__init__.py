@@ -0,0 +1,7 @@
+import threading
+
+# The modules that pull in minecraft_launcher_lib are imported lazily, some
+# of them on worker threads. Its submodules import each other, so two
+# threads importing it for the first time at once can deadlock; hold this
+# lock around those imports.
+heavy_import_lock = threading.Lock()
@@ -0,0 +1,320 @@
+"""
+Command line front end for the launcher core; never imports PySide6.
+
+    python -m launcher list
+    python -m launcher launch [INSTANCE] [--username NAME] [--ram MB] [--java PATH] [--profile NAME]
+    python -m launcher install [INSTANCE ...] [--all]
+    python -m launcher verify [INSTANCE ...] [--all] [--deep] [--repair]
+    python -m launcher clone INSTANCE NAME [--no-saves]
+    python -m launcher import PACK [--name NAME]
+    python -m launcher update INSTANCE [--check]
+    python -m launcher export INSTANCE FILE [--saves]
+    python -m launcher snapshot INSTANCE [--label TEXT | --list | --restore ID | --delete ID]
+
+INSTANCE is an instance name or id; "vanilla" (the default) is the latest
+release in the main game dir. Settings not given on the command line come
+from launcher_state.json, like in the GUI.
+"""
+import argparse
+import os
+import sys
+import uuid
+
+from .install import install_version
+from .install_index import InstallIndex
+from .java_runtime import JavaRegistry
+from .jvm_profiles import PROFILES
+from .launch import GameLaunch
+from .object_store import ObjectStore
+from .snapshots import describe
+from .version_manifest import VersionManifest
+
+VANILLA = "vanilla"
+
+
+class ProgressPrinter:
+    """Prints progress lines, skipping updates that only move by a few percent."""
+
+    def __init__(self, name, step=10):
+        self.name = name
+        self.step = step
+        self._last = (None, -100)
+
+    def __call__(self, status, percent):
+        kind = status.split(" (")[0]
+        last_kind, last_percent = self._last
+        if kind != last_kind or percent - last_percent >= self.step or (percent == 100 and last_percent != 100):
+            self._last = (kind, percent)
+            print(f"[{self.name}] {status} ({percent}%)", flush=True)
+
+
+def _find_instances(state, names, include_all=False):
+    """[(name, modpack summary or None)] for the instances named on the command line."""
+    if include_all:
+        return [(VANILLA, None)] + [(mp["name"], mp) for mp in state.modpacks]
+    found = []
+    for name in names or [VANILLA]:
+        if name.lower() == VANILLA:
+            found.append((VANILLA, None))
+            continue
+        matches = [mp for mp in state.modpacks if name in (mp["id"], mp["name"])]
+        if not matches:
+            raise SystemExit(f"No instance named {name!r} (see `list`)")
+        if len(matches) > 1:
+            raise SystemExit(f"Several instances are named {name!r}, use its id")
+        found.append((matches[0]["name"], matches[0]))
+    return found
+
+
+def _version(manifest, modpack):
+    if modpack:
+        return modpack["version"]
+    try:
+        return manifest.resolve("latest-release")
+    except Exception as e:
+        raise ValueError(f"Cannot find the latest release: {e}")
+
+
+# -------------------------
+# Commands
+# -------------------------
+def cmd_list(state, manifest, args):
+    print(f"{VANILLA:<24} {manifest.latest_release() or 'latest-release':<12} -  {state.minecraft_dir}")
+    for mp in state.modpacks:
+        print(f"{mp['name']:<24} {mp['version']:<12} {mp['loader']}, {mp.get('mod_count', 0)} mods  "
+              f"{state.get_game_dir(mp)}  ({mp['id']})")
+    return 0
+
+
+def cmd_install(state, manifest, args):
+    failed = 0
+    for name, modpack in _find_instances(state, args.instances, args.all):
+        directory = state.get_game_dir(modpack)
+        index = InstallIndex(directory)
+        try:
+            version = _version(manifest, modpack)
+            if index.is_version_ready(version) and not args.force:
+                print(f"[{name}] {version} is already installed")
+                continue
+            install_version(
+                version, directory, progress=ProgressPrinter(name), index=index,
+                store=ObjectStore(state.store_dir), shared_dir=state.minecraft_dir, manifest=manifest
+            )
+        except Exception as e:
+            print(f"[{name}] Install failed: {e}", file=sys.stderr)
+            failed += 1
+    return 1 if failed else 0
+
+
+def cmd_verify(state, manifest, args):
+    broken = 0
+    for name, modpack in _find_instances(state, args.instances, args.all):
+        try:
+            version = _version(manifest, modpack)
+        except ValueError as e:
+            print(f"[{name}] {e}", file=sys.stderr)
+            broken += 1
+            continue
+        directory = state.get_game_dir(modpack)
+        index = InstallIndex(directory)
+        if version not in index.versions:
+            print(f"[{name}] {version} is not installed")
+            broken += 1
+            continue
+        bad = index.verify(version, deep=args.deep)
+        if not bad:
+            print(f"[{name}] {version}: OK")
+            continue
+        broken += 1
+        print(f"[{name}] {version}: {len(bad)} file(s) missing or changed")
+        for rel in bad[:20]:
+            print(f"    {rel}")
+        if len(bad) > 20:
+            print(f"    ... and {len(bad) - 20} more")
+        if args.repair:
+            index.forget_version(version)
+            try:
+                install_version(
+                    version, directory, progress=ProgressPrinter(name), index=index,
+                    store=ObjectStore(state.store_dir), shared_dir=state.minecraft_dir, manifest=manifest
+                )
+            except Exception as e:
+                print(f"[{name}] Repair failed: {e}", file=sys.stderr)
+                continue
+            broken -= 1
+    return 1 if broken else 0
+
+
+def _modpack(state, name):
+    (_, modpack), = _find_instances(state, [name])
+    if modpack is None:
+        raise SystemExit("The vanilla game dir is not an instance, pick one (see `list`)")
+    return modpack
+
+
+def cmd_clone(state, manifest, args):
+    modpack = _modpack(state, args.instance)
+    clone, stats = state.clone_modpack(modpack["id"], args.name, include_saves=not args.no_saves)
+    print(f"Created {clone['name']} ({clone['id']}): {describe(stats)}")
+    return 0
+
+
+def cmd_import(state, manifest, args):
+    from .modpack_archive import import_pack
+
+    modpack_id = str(uuid.uuid4())
+    modpack, stats = import_pack(
+        args.pack, state.get_game_dir({"id": modpack_id}), progress=ProgressPrinter(os.path.basename(args.pack)),
+        store=ObjectStore(state.store_dir)
+    )
+    modpack.update(id=modpack_id, name=args.name or modpack["name"])
+    state.save_modpack(modpack)
+    print(f"Imported {modpack['name']} ({modpack_id}): {stats['extracted']} files extracted, "
+          f"{stats['downloaded']} downloaded, {stats['deduplicated']} already in the object store")
+    return 0
+
+
+def cmd_export(state, manifest, args):
+    from .modpack_archive import export_mrpack, export_zip
+
+    modpack = state.get_modpack(_modpack(state, args.instance)["id"])
+    export = export_mrpack if args.file.lower().endswith(".mrpack") else export_zip
+    export(modpack, state.get_game_dir(modpack), args.file, include_saves=args.saves,
+           progress=ProgressPrinter(modpack["name"]))
+    print(f"[{modpack['name']}] Exported to {args.file}")
+    return 0
+
+
+def cmd_update(state, manifest, args):
+    from .mod_update import apply_updates, check_updates
+    from .modrinth import ModrinthClient
+
+    modpack = state.get_modpack(_modpack(state, args.instance)["id"])
+    game_dir = state.get_game_dir(modpack)
+    client = ModrinthClient(cache_dir=os.path.join(state.cache_dir, "modrinth"))
+    updates = check_updates(client, modpack, game_dir)
+    if not updates:
+        print(f"[{modpack['name']}] All mods are up to date")
+        return 0
+    for update in updates:
+        print(f"    {update.filename} -> {update.new_filename}")
+    if args.check:
+        print(f"[{modpack['name']}] {len(updates)} update(s) available")
+        return 0
+    apply_updates(updates, modpack, game_dir, progress=ProgressPrinter(modpack["name"]), store=ObjectStore(state.store_dir))
+    state.save_modpack(modpack)
+    print(f"[{modpack['name']}] Updated {len(updates)} mod(s)")
+    return 0
+
+
+def cmd_snapshot(state, manifest, args):
+    modpack = _modpack(state, args.instance)
+    snapshots = state.snapshots()
+    if args.list:
+        for meta in snapshots.list(modpack["id"]):
+            print(f"{meta['id']}  {meta['label']}")
+    elif args.restore:
+        state.restore_snapshot(modpack["id"], args.restore)
+        print(f"[{modpack['name']}] Restored {args.restore}")
+    elif args.delete:
+        snapshots.delete(modpack["id"], args.delete)
+    else:
+        meta = state.snapshot_modpack(modpack["id"], args.label)
+        print(f"[{modpack['name']}] Snapshot {meta['id']}: {describe(meta['stats'])}")
+    return 0
+
+
+def cmd_launch(state, manifest, args):
+    (name, modpack), = _find_instances(state, [args.instance] if args.instance else None)
+    profile = args.profile or state.jvm_profile
+    if modpack and not args.profile:
+        profile = state.get_modpack(modpack["id"]).get("jvm_profile") or profile
+    try:
+        launch = GameLaunch(
+            args.username or state.username, modpack["version"] if modpack else "latest-release",
+            state.get_game_dir(modpack), args.ram or state.ram,
+            java_path=args.java if args.java is not None else state.java_path,
+            ms_auth=None if args.username else state.ms_auth_data, deep_verify=args.deep_verify,
+            store_dir=state.store_dir, shared_dir=state.minecraft_dir, logs_dir=state.logs_dir,
+            manifest=manifest, java_registry=JavaRegistry(os.path.join(state.cache_dir, "java_probes.json")),
+            jvm_profile=profile, mod_count=modpack.get("mod_count", 0) if modpack else 0, name=name,
+            progress=ProgressPrinter(name),
+        )
+        return launch.run()
+    except Exception as e:
+        print(f"[{name}] Launch failed: {e}", file=sys.stderr)
+        return 1
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="python -m launcher", description="MoltenLauncher without the GUI")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    commands.add_parser("list", help="list instances")
+
+    launch = commands.add_parser("launch", help="install if needed and run an instance")
+    launch.add_argument("instance", nargs="?", help=f"instance name or id (default: {VANILLA})")
+    launch.add_argument("--username", help="offline username (default: the saved account)")
+    launch.add_argument("--ram", type=int, help="heap size in MB")
+    launch.add_argument("--java", help="path to the java binary (default: automatic)")
+    launch.add_argument("--profile", choices=list(PROFILES), help="JVM tuning profile")
+    launch.add_argument("--deep-verify", action="store_true", help="hash every game file before launching")
+
+    for command, description in (("install", "install instances"), ("verify", "check installed files")):
+        sub = commands.add_parser(command, help=description)
+        sub.add_argument("instances", nargs="*", help=f"instance names or ids (default: {VANILLA})")
+        sub.add_argument("--all", action="store_true", help="every instance, including vanilla")
+    commands.choices["install"].add_argument("--force", action="store_true", help="check and repair files anyway")
+    commands.choices["verify"].add_argument("--deep", action="store_true", help="compare SHA-1 hashes, not just size and mtime")
+    commands.choices["verify"].add_argument("--repair", action="store_true", help="reinstall whatever is broken")
+
+    clone = commands.add_parser("clone", help="copy an instance, sharing unchanged files")
+    clone.add_argument("instance", help="instance name or id")
+    clone.add_argument("name", help="name of the copy")
+    clone.add_argument("--no-saves", action="store_true", help="leave the worlds out")
+
+    pack_import = commands.add_parser("import", help="create an instance from an .mrpack or instance zip")
+    pack_import.add_argument("pack", help="path to the .mrpack or .zip")
+    pack_import.add_argument("--name", help="instance name (default: the pack's)")
+
+    export = commands.add_parser("export", help="write an instance as .mrpack or, for other names, a zip")
+    export.add_argument("instance", help="instance name or id")
+    export.add_argument("file", help="destination, e.g. pack.mrpack or backup.zip")
+    export.add_argument("--saves", action="store_true", help="include the worlds")
+
+    update = commands.add_parser("update", help="update an instance's mods to their newest compatible versions")
+    update.add_argument("instance", help="instance name or id")
+    update.add_argument("--check", action="store_true", help="only list the available updates")
+
+    snapshot = commands.add_parser("snapshot", help="take, list, restore or delete instance snapshots")
+    snapshot.add_argument("instance", help="instance name or id")
+    actions = snapshot.add_mutually_exclusive_group()
+    actions.add_argument("--label", default="", help="label for the new snapshot")
+    actions.add_argument("--list", action="store_true", help="list snapshots, newest first")
+    actions.add_argument("--restore", metavar="ID", help="put the instance back to this snapshot")
+    actions.add_argument("--delete", metavar="ID", help="delete this snapshot")
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    from app_state import state
+
+    manifest = VersionManifest(os.path.join(state.cache_dir, "version_manifest_v2.json"))
+    if manifest.is_stale():
+        try:
+            manifest.refresh()
+        except Exception as e:
+            print(f"Could not refresh the version manifest: {e}", file=sys.stderr)
+
+    handlers = {
+        "list": cmd_list, "install": cmd_install, "verify": cmd_verify, "launch": cmd_launch,
+        "clone": cmd_clone, "snapshot": cmd_snapshot, "import": cmd_import, "export": cmd_export,
+        "update": cmd_update,
+    }
+    try:
+        return handlers[args.command](state, manifest, args)
+    except KeyboardInterrupt:
+        return 130
+    finally:
+        state.flush()
@@ -0,0 +1,103 @@
+import hashlib
+import json
+import os
+import platform
+
+CACHE_FILE = ".molten_command_cache.json"
+
+# Secret or per-account options are never written to disk. The cached
+# command carries these placeholders and they are filled in just before
+# the process is spawned.
+SECRET_OPTIONS = {
+    "username": "${molten:username}",
+    "uuid": "${molten:uuid}",
+    "token": "${molten:token}",
+}
+
+
+class CommandCache:
+    """
+    On-disk cache of resolved launch commands, one entry per version.
+
+    Building the command means reading the version JSON (and its parents),
+    evaluating every library rule and assembling the classpath. The result
+    only depends on the version JSON, the host OS, the installed runtimes
+    and the non-secret launch options, so that is what the key hashes.
+    """
+
+    def __init__(self, directory):
+        self.directory = directory
+        self.path = os.path.join(directory, CACHE_FILE)
+        self.entries = {}
+        self.last_hit = False
+        self.load()
+
+    def load(self):
+        if not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, "r") as f:
+                self.entries = json.load(f)
+        except Exception as e:
+            print(f"Error loading command cache: {e}")
+
+    def save(self):
+        tmp_path = self.path + ".tmp"
+        try:
+            with open(tmp_path, "w") as f:
+                json.dump(self.entries, f)
+            os.replace(tmp_path, self.path)
+        except Exception as e:
+            print(f"Error saving command cache: {e}")
+
+    def cache_key(self, version, options):
+        import minecraft_launcher_lib
+
+        h = hashlib.sha1()
+        current = version
+        while current:
+            path = os.path.join(self.directory, "versions", current, f"{current}.json")
+            with open(path, "rb") as f:
+                raw = f.read()
+            h.update(raw)
+            current = json.loads(raw).get("inheritsFrom")
+
+        runtime_dir = os.path.join(self.directory, "runtime")
+        runtimes = sorted(os.listdir(runtime_dir)) if os.path.isdir(runtime_dir) else []
+        public_options = {k: v for k, v in options.items() if k not in SECRET_OPTIONS}
+        h.update(json.dumps({
+            "version": version,
+            "os": [platform.system(), platform.machine(), platform.architecture()[0]],
+            "runtimes": runtimes,
+            "options": public_options,
+            "lib": minecraft_launcher_lib.utils.get_library_version(),
+        }, sort_keys=True).encode())
+        return h.hexdigest()
+
+    def get_command(self, version, options):
+        key = self.cache_key(version, options)
+        entry = self.entries.get(version)
+        self.last_hit = entry is not None and entry.get("key") == key
+
+        if not self.last_hit:
+            import minecraft_launcher_lib
+
+            template_options = dict(options)
+            template_options.update(SECRET_OPTIONS)
+            template = minecraft_launcher_lib.command.get_minecraft_command(version, self.directory, template_options)
+            entry = {"key": key, "command": template}
+            self.entries[version] = entry
+            self.save()
+
+        return substitute(entry["command"], options)
+
+
+def substitute(template, options):
+    values = {placeholder: str(options.get(name, "")) for name, placeholder in SECRET_OPTIONS.items()}
+    command = []
+    for arg in template:
+        if "${molten:" in arg:
+            for placeholder, value in values.items():
+                arg = arg.replace(placeholder, value)
+        command.append(arg)
+    return command
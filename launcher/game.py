@@ -1,76 +1,49 @@
-import requests
-import subprocess
-import os
 from PySide6.QtCore import QThread, Signal
 
-import minecraft_launcher_lib
+from . import heavy_import_lock
+from .jvm_profiles import DEFAULT_PROFILE
 
 
 class LaunchWorker(QThread):
+    """Runs a GameLaunch on a thread, reporting through Qt signals."""
+
     progress_update = Signal(str, int)
     log_output = Signal(str)
-    finished = Signal()
+    log_batch = Signal(list)
+    # Not `finished`: QThread.finished also fires after a failed launch
+    exited = Signal()
     error = Signal(str)
 
-    def __init__(self, username, version, directory, ram, java_path=None, ms_auth=None):
+    def __init__(self, username, version, directory, ram, java_path=None, ms_auth=None, deep_verify=False,
+                 store_dir=None, shared_dir=None, logs_dir=None, manifest=None, install_job=None, java_registry=None,
+                 jvm_profile=DEFAULT_PROFILE, mod_count=0, supervisor=None, name=None):
         super().__init__()
-        self.username = username
-        self.version = version
-        self.directory = directory
-        self.ram = ram
-        self.java_path = java_path
-        self.ms_auth = ms_auth
+        with heavy_import_lock:
+            from .launch import GameLaunch
+
+        self.launch = GameLaunch(
+            username, version, directory, ram, java_path, ms_auth, deep_verify,
+            store_dir=store_dir, shared_dir=shared_dir, logs_dir=logs_dir, manifest=manifest,
+            install_job=install_job, java_registry=java_registry, jvm_profile=jvm_profile,
+            mod_count=mod_count, supervisor=supervisor, name=name,
+            progress=self.progress_update.emit, log=self.log_output.emit, on_batch=self.log_batch.emit,
+        )
+        self.name = self.launch.name
 
     def run(self):
         try:
-            if not os.path.exists(self.directory):
-                os.makedirs(self.directory)
-
-            installed_versions = [v['id'] for v in minecraft_launcher_lib.utils.get_installed_versions(self.directory)]
-            if self.version not in installed_versions:
-                self.progress_update.emit(f"Installing {self.version}...", 0)
-                minecraft_launcher_lib.install.install_minecraft_version(
-                    self.version, self.directory,
-                    callback={
-                        "setStatus": lambda t: self.progress_update.emit(t, 0),
-                        "setProgress": lambda p: self.progress_update.emit("Downloading...", int(p)),
-                        "setMax": lambda m: None
-                    }
-                )
-
-            options = {
-                "username": self.username,
-                "uuid": "",
-                "token": "",
-                "jvmArguments": [f"-Xmx{self.ram}M", f"-Xms{self.ram}M"]
-            }
-
-            if self.ms_auth:
-                options["username"] = self.ms_auth["name"]
-                options["uuid"] = self.ms_auth.get("uuid", "")
-                options["token"] = self.ms_auth.get("minecraft_access_token", "")
-
-            if self.java_path:
-                options["executablePath"] = self.java_path
-
-            self.progress_update.emit("Launching...", 100)
-            cmd = minecraft_launcher_lib.command.get_minecraft_command(self.version, self.directory, options)
-            process = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
-            while True:
-                output = process.stdout.readline()
-                if output == '' and process.poll() is not None:
-                    break
-                if output:
-                    self.log_output.emit(output.strip())
-            stderr = process.communicate()[1]
-            if stderr:
-                self.log_output.emit(f"STDERR: {stderr}")
-
-            self.finished.emit()
-
+            self.launch.run()
+            self.exited.emit()
         except Exception as e:
             self.error.emit(str(e))
 
+    def ack_log_batch(self):
+        # Called from the GUI thread once a log_batch has been displayed
+        self.launch.ack()
+
+    def kill(self):
+        return self.launch.kill()
+
 
 # -------------------------
 # Microsoft → Xbox → Minecraft flow
@@ -102,6 +75,8 @@ class MSLoginFinisher(QThread):
         self.redirect_url = redirect_url
 
     def run(self):
+        import requests
+
         try:
             code = self.redirect_url.split("code=")[1].split("&")[0]
 
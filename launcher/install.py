@@ -0,0 +1,270 @@
+import json
+import os
+import platform
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from minecraft_launcher_lib.natives import get_natives, extract_natives_file
+
+from .downloader import Downloader, DownloadTask
+from .install_index import InstallIndex
+from .java_runtime import install_runtime, runtime_java
+from .version_manifest import VERSION_MANIFEST_URL
+
+RESOURCES_URL = "https://resources.download.minecraft.net"
+LIBRARIES_URL = "https://libraries.minecraft.net"
+
+# Two installs into one directory would write the same .part files and
+# overwrite each other's InstallIndex, so they take turns
+_install_locks = {}
+_install_locks_guard = threading.Lock()
+
+
+def install_lock(directory):
+    """
+    The lock that serializes installs into `directory` in this process.
+
+    It is reentrant: callers that check the InstallIndex before installing
+    hold it around both. A game dir's `runtime` dir has a lock of its own,
+    taken by install_java on the runtime thread.
+    """
+    key = os.path.normcase(os.path.abspath(directory))
+    with _install_locks_guard:
+        return _install_locks.setdefault(key, threading.RLock())
+
+
+# -------------------------
+# Version JSON helpers
+# -------------------------
+def rule_allows(rules):
+    system = {"Windows": "windows", "Darwin": "osx"}.get(platform.system(), "linux")
+    allowed = False
+    for rule in rules:
+        os_rule = rule.get("os", {})
+        if "name" in os_rule and os_rule["name"] != system:
+            continue
+        if os_rule.get("arch") == "x86" and platform.architecture()[0] != "32bit":
+            continue
+        if "features" in rule:
+            continue
+        allowed = rule["action"] == "allow"
+    return allowed
+
+
+def library_path(name):
+    # group:artifact:version[:classifier][@ext] -> maven layout
+    ext = "jar"
+    if "@" in name:
+        name, ext = name.split("@", 1)
+    parts = name.split(":")
+    group, artifact, version = parts[0], parts[1], parts[2]
+    classifier = f"-{parts[3]}" if len(parts) > 3 else ""
+    return "/".join(group.split(".") + [artifact, version, f"{artifact}-{version}{classifier}.{ext}"])
+
+
+def load_version_json(version, directory, downloader, manifest=None):
+    path = os.path.join(directory, "versions", version, f"{version}.json")
+    if not os.path.isfile(path):
+        if manifest is not None:
+            entry = manifest.get(version)
+            if entry is None:
+                manifest.refresh(force=True)
+                entry = manifest.get(version)
+        else:
+            data = downloader.session.get(VERSION_MANIFEST_URL, timeout=downloader.timeout).json()
+            entry = next((v for v in data["versions"] if v["id"] == version), None)
+        if entry is None:
+            raise ValueError(f"Unknown Minecraft version: {version}")
+        downloader.download(DownloadTask(entry["url"], path, entry.get("sha1")))
+
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+
+    if "inheritsFrom" in data:
+        parent = load_version_json(data["inheritsFrom"], directory, downloader, manifest)
+        child_libs = {":".join(lib["name"].split(":")[:2]) for lib in data.get("libraries", [])}
+        libraries = data.get("libraries", []) + [
+            lib for lib in parent.get("libraries", [])
+            if ":".join(lib["name"].split(":")[:2]) not in child_libs
+        ]
+        merged = dict(parent)
+        merged.update(data)
+        merged["libraries"] = libraries
+        data = merged
+
+    return data
+
+
+# -------------------------
+# Install planning
+# -------------------------
+def plan_libraries(data, directory):
+    tasks = []
+    natives = []
+    for lib in data.get("libraries", []):
+        if "rules" in lib and not rule_allows(lib["rules"]):
+            continue
+
+        downloads = lib.get("downloads")
+        if downloads is None:
+            # Loader-style entry: only a maven name and a repository url
+            rel = library_path(lib["name"])
+            base = lib.get("url", LIBRARIES_URL).rstrip("/")
+            tasks.append(DownloadTask(f"{base}/{rel}", os.path.join(directory, "libraries", rel)))
+            continue
+
+        artifact = downloads.get("artifact")
+        if artifact and artifact.get("url") and artifact.get("path"):
+            tasks.append(DownloadTask(
+                artifact["url"], os.path.join(directory, "libraries", artifact["path"]),
+                artifact.get("sha1"), artifact.get("size")
+            ))
+
+        native = get_natives(lib)
+        classifier = downloads.get("classifiers", {}).get(native) if native else None
+        if classifier:
+            path = os.path.join(directory, "libraries", classifier["path"])
+            tasks.append(DownloadTask(classifier["url"], path, classifier.get("sha1"), classifier.get("size")))
+            natives.append((path, lib.get("extract", {"exclude": []})))
+
+    return tasks, natives
+
+
+def plan_assets(data, directory, downloader):
+    index_info = data.get("assetIndex")
+    if not index_info:
+        return []
+
+    index_path = os.path.join(directory, "assets", "indexes", f"{data['assets']}.json")
+    downloader.download(DownloadTask(index_info["url"], index_path, index_info.get("sha1"), index_info.get("size")))
+    with open(index_path, "r", encoding="utf-8") as f:
+        objects = json.load(f)["objects"]
+
+    tasks = []
+    for obj in objects.values():
+        h = obj["hash"]
+        tasks.append(DownloadTask(
+            f"{RESOURCES_URL}/{h[:2]}/{h}",
+            os.path.join(directory, "assets", "objects", h[:2], h),
+            h, obj.get("size")
+        ))
+    return tasks
+
+
+def plan_version_files(data, directory):
+    tasks = []
+    client = data.get("downloads", {}).get("client")
+    if client:
+        tasks.append(DownloadTask(
+            client["url"], os.path.join(directory, "versions", data["id"], f"{data['id']}.jar"),
+            client.get("sha1"), client.get("size")
+        ))
+
+    logging_file = data.get("logging", {}).get("client", {}).get("file")
+    if logging_file:
+        tasks.append(DownloadTask(
+            logging_file["url"], os.path.join(directory, "assets", "log_configs", logging_file["id"]),
+            logging_file.get("sha1"), logging_file.get("size")
+        ))
+    return tasks
+
+
+def install_java(component, directory, store=None, shared_dir=None, throttle=None, cancelled=None):
+    """
+    Make sure the `component` runtime for this platform exists in
+    `directory`. With an ObjectStore and a separate `shared_dir`, it is
+    installed there once and the runtime dir is linked into `directory`.
+    """
+    with install_lock(os.path.join(directory, "runtime")):
+        if runtime_java(directory, component):
+            return
+        if store is not None and shared_dir and os.path.abspath(shared_dir) != os.path.abspath(directory):
+            # Every instance installs into the same shared runtime
+            with install_lock(os.path.join(shared_dir, "runtime")):
+                if not runtime_java(shared_dir, component):
+                    install_runtime(component, shared_dir, store=store, throttle=throttle, cancelled=cancelled)
+            if store.link_dir(os.path.join(shared_dir, "runtime"), os.path.join(directory, "runtime")):
+                if runtime_java(directory, component):
+                    return
+        install_runtime(component, directory, store=store, throttle=throttle, cancelled=cancelled)
+
+
+# -------------------------
+# Entry point
+# -------------------------
+def install_version(version, directory, progress=None, max_workers=16, index=None, store=None, shared_dir=None,
+                    manifest=None, throttle=None, cancelled=None):
+    """
+    Installs `version` into `directory`, replacing
+    minecraft_launcher_lib.install.install_minecraft_version.
+
+    `progress` is called as progress(status, percent), which matches the
+    LaunchWorker.progress_update signal. Every installed file is recorded
+    in the game dir's InstallIndex so later launches can skip the check.
+
+    With an ObjectStore, files are linked from the shared store, and the
+    Java runtime is installed once into `shared_dir` and linked into
+    `directory`.
+
+    A VersionManifest, when given, is used instead of downloading the
+    manifest again to find the version JSON. `throttle` is handed to the
+    Downloader to cap the download rate, and setting the `cancelled` Event
+    stops the install with a DownloadError.
+
+    Installs into the same directory run one at a time, see install_lock.
+
+    The Java runtime download starts as soon as the version JSON is known
+    and runs alongside the library and asset downloads.
+    """
+    with install_lock(directory):
+        if index is None:
+            index = InstallIndex(directory)
+        report = progress or (lambda status, percent: None)
+        last_percent = [-1]
+
+        def on_file(done, total):
+            # Only report when the percentage moves, ~5000 assets would
+            # otherwise flood the GUI thread with queued signals
+            percent = int(done * 100 / max(total, 1))
+            if percent != last_percent[0] or done == total:
+                last_percent[0] = percent
+                report(f"Downloading files ({done}/{total})", percent)
+
+        with ThreadPoolExecutor(max_workers=1, thread_name_prefix="java-runtime") as runtime_executor:
+            runtime = None
+            with Downloader(max_workers=max_workers, callback=on_file, index=index, store=store,
+                            throttle=throttle, cancelled=cancelled) as downloader:
+                report("Fetching version metadata...", 0)
+                data = load_version_json(version, directory, downloader, manifest)
+                component = data.get("javaVersion", {}).get("component")
+                if component:
+                    runtime = runtime_executor.submit(
+                        install_java, component, directory, store, shared_dir, throttle, cancelled
+                    )
+
+                lib_tasks, natives = plan_libraries(data, directory)
+                tasks = lib_tasks + plan_assets(data, directory, downloader) + plan_version_files(data, directory)
+                downloader.download_all(tasks)
+
+            report("Extracting natives...", 100)
+            natives_dir = os.path.join(directory, "versions", data["id"], "natives")
+            os.makedirs(natives_dir, exist_ok=True)
+            for path, extract in natives:
+                extract_natives_file(path, natives_dir, extract)
+
+            if runtime is not None:
+                if not runtime.done():
+                    report("Installing Java runtime...", 100)
+                runtime.result()
+
+        version_json = os.path.join(directory, "versions", version, f"{version}.json")
+        if index.lookup(version_json) is None:
+            index.record(version_json)
+        paths = [version_json] + [task.path for task in tasks]
+        if data.get("assetIndex"):
+            paths.append(os.path.join(directory, "assets", "indexes", f"{data['assets']}.json"))
+        index.record_version(version, paths, data.get("javaVersion", {}).get("component"))
+        index.save()
+
+        report("Installation complete", 100)
+        return data
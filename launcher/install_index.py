@@ -0,0 +1,142 @@
+import json
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from .downloader import sha1_file
+from .java_runtime import runtime_java
+
+INDEX_FILE = ".molten_index.json"
+
+
+class InstallIndex:
+    """
+    Persistent manifest of installed artifacts, stored in the game dir.
+
+    Every file written by an install is recorded with its size, mtime and
+    SHA-1. A warm launch only has to stat the files of a version and compare
+    them with the manifest; hashing is left to `verify(deep=True)`.
+    """
+
+    def __init__(self, directory):
+        self.directory = directory
+        self.path = os.path.join(directory, INDEX_FILE)
+        self.files = {}
+        self.versions = {}
+        self._lock = threading.Lock()
+        self.load()
+
+    def load(self):
+        if not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, "r") as f:
+                data = json.load(f)
+            self.files = data.get("files", {})
+            self.versions = data.get("versions", {})
+        except Exception as e:
+            print(f"Error loading install index: {e}")
+
+    def save(self):
+        tmp_path = self.path + ".tmp"
+        try:
+            with self._lock:
+                data = {"files": self.files, "versions": self.versions}
+            with open(tmp_path, "w") as f:
+                json.dump(data, f, separators=(",", ":"))
+            os.replace(tmp_path, self.path)
+        except Exception as e:
+            print(f"Error saving install index: {e}")
+
+    # -------------------------
+    # Recording
+    # -------------------------
+    def _rel(self, path):
+        return os.path.relpath(path, self.directory).replace(os.sep, "/")
+
+    def record(self, path, sha1=None):
+        st = os.stat(path)
+        if sha1 is None:
+            sha1 = sha1_file(path)
+        with self._lock:
+            self.files[self._rel(path)] = {"size": st.st_size, "mtime": st.st_mtime_ns, "sha1": sha1}
+
+    def record_version(self, version, paths, runtime=None):
+        with self._lock:
+            self.versions[version] = {
+                "files": sorted({self._rel(p) for p in paths}),
+                "runtime": runtime,
+            }
+
+    def forget_version(self, version):
+        with self._lock:
+            self.versions.pop(version, None)
+
+    # -------------------------
+    # Checks
+    # -------------------------
+    def lookup(self, path):
+        """Return the recorded SHA-1 if `path` is unchanged since it was recorded."""
+        entry = self.files.get(self._rel(path))
+        if entry is None:
+            return None
+        try:
+            st = os.stat(path)
+        except OSError:
+            return None
+        if st.st_size != entry["size"] or st.st_mtime_ns != entry["mtime"]:
+            return None
+        return entry["sha1"]
+
+    def _stat_ok(self, rel):
+        entry = self.files.get(rel)
+        if entry is None:
+            return False
+        try:
+            st = os.stat(os.path.join(self.directory, rel))
+        except OSError:
+            return False
+        return st.st_size == entry["size"] and st.st_mtime_ns == entry["mtime"]
+
+    def is_version_ready(self, version):
+        info = self.versions.get(version)
+        if info is None:
+            return False
+        # The runtime dir may hold other platforms' builds; only ours counts
+        if info.get("runtime") and not runtime_java(self.directory, info["runtime"]):
+            return False
+        return all(self._stat_ok(rel) for rel in info["files"])
+
+    def verify(self, version, deep=False, max_workers=None):
+        """
+        Return the relative paths of `version` that are missing or changed.
+        With `deep=True` every file is rehashed in parallel instead of
+        trusting size and mtime.
+        """
+        info = self.versions.get(version)
+        if info is None:
+            return None
+
+        if not deep:
+            return [rel for rel in info["files"] if not self._stat_ok(rel)]
+
+        def check(rel):
+            entry = self.files.get(rel)
+            path = os.path.join(self.directory, rel)
+            try:
+                ok = entry is not None and sha1_file(path) == entry["sha1"]
+            except OSError:
+                ok = False
+            if ok:
+                # Rehashed and correct, refresh the stat fingerprint
+                self.record(path, entry["sha1"])
+            return None if ok else rel
+
+        with ThreadPoolExecutor(max_workers=max_workers or min(32, (os.cpu_count() or 4) * 2)) as executor:
+            bad = [rel for rel in executor.map(check, info["files"]) if rel]
+        with self._lock:
+            # Drop the stale fingerprints so a reinstall rehashes these files
+            for rel in bad:
+                self.files.pop(rel, None)
+        self.save()
+        return bad
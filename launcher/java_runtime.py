@@ -0,0 +1,320 @@
+import glob
+import json
+import os
+import platform
+import re
+import shutil
+import subprocess
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from .downloader import Downloader, DownloadTask
+
+JAVA_RUNTIME_MANIFEST_URL = (
+    "https://launchermeta.mojang.com/v1/products/java-runtime/2ec0cc96c44e5a76b9c8b7c39df7210883d12871/all.json"
+)
+# Versions without a javaVersion entry predate Mojang's runtimes and run on Java 8
+DEFAULT_JAVA_MAJOR = 8
+PROBE_TIMEOUT = 15
+
+PROPERTY_RE = re.compile(r"^\s*([\w.]+) = (.*)$")
+
+
+# -------------------------
+# Platform & layout
+# -------------------------
+def runtime_platform():
+    """Mojang's name for this platform in the runtime manifest."""
+    system = platform.system()
+    is_32bit = platform.architecture()[0] == "32bit"
+    if system == "Windows":
+        if platform.machine().lower() in ("arm64", "aarch64"):
+            return "windows-arm64"
+        return "windows-x86" if is_32bit else "windows-x64"
+    if system == "Darwin":
+        return "mac-os-arm64" if platform.machine() == "arm64" else "mac-os"
+    if system == "Linux":
+        return "linux-i386" if is_32bit else "linux"
+    return "gamecore"
+
+
+def runtime_home(directory, component):
+    # Same layout as the official launcher and minecraft_launcher_lib
+    return os.path.join(directory, "runtime", component, runtime_platform(), component)
+
+
+def runtime_java(directory, component):
+    """Path of the java binary of an installed runtime for this platform, or None."""
+    home = runtime_home(directory, component)
+    for rel in (("bin", "java"), ("bin", "java.exe"), ("jre.bundle", "Contents", "Home", "bin", "java")):
+        path = os.path.join(home, *rel)
+        if os.path.isfile(path):
+            return path
+    return None
+
+
+def java_requirement(data):
+    """(major version, runtime component or None) required by a version JSON."""
+    java = data.get("javaVersion") or {}
+    return java.get("majorVersion", DEFAULT_JAVA_MAJOR), java.get("component")
+
+
+def read_java_requirement(directory, version):
+    """Like java_requirement, reading the installed version JSON and its parents."""
+    current = version
+    while current:
+        with open(os.path.join(directory, "versions", current, f"{current}.json"), "r", encoding="utf-8") as f:
+            data = json.load(f)
+        if "javaVersion" in data:
+            return java_requirement(data)
+        current = data.get("inheritsFrom")
+    return DEFAULT_JAVA_MAJOR, None
+
+
+def parse_major(version):
+    # "1.8.0_392" -> 8, "17.0.9" -> 17, "21-ea" -> 21
+    match = re.match(r"(\d+)(?:\.(\d+))?", version or "")
+    if not match:
+        return None
+    major = int(match.group(1))
+    if major == 1 and match.group(2):
+        return int(match.group(2))
+    return major
+
+
+# -------------------------
+# Discovery
+# -------------------------
+class JavaRegistry:
+    """
+    Finds installed JVMs and remembers what they are.
+
+    Probing a JVM means spawning `java -XshowSettings:properties -version`,
+    which takes a few hundred milliseconds. Results are cached on disk,
+    keyed by the binary's real path, size and mtime, so a JVM is only probed
+    again after it has been updated.
+    """
+
+    def __init__(self, cache_path):
+        self.cache_path = cache_path
+        self.probes = {}
+        self._lock = threading.Lock()
+        self._dirty = False
+        try:
+            with open(cache_path, "r", encoding="utf-8") as f:
+                self.probes = json.load(f)
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError) as e:
+            print(f"Error loading Java probe cache: {e}")
+
+    def save(self):
+        with self._lock:
+            if not self._dirty:
+                return
+            data = json.dumps(self.probes)
+            self._dirty = False
+        os.makedirs(os.path.dirname(self.cache_path) or ".", exist_ok=True)
+        tmp_path = self.cache_path + ".tmp"
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                f.write(data)
+            os.replace(tmp_path, self.cache_path)
+        except OSError as e:
+            print(f"Error saving Java probe cache: {e}")
+
+    def probe(self, java_path):
+        """Return {"path", "version", "major", "arch", "vendor"} for a java binary, or None."""
+        try:
+            real = os.path.realpath(java_path)
+            st = os.stat(real)
+        except OSError:
+            return None
+        with self._lock:
+            cached = self.probes.get(real)
+        if cached and cached["size"] == st.st_size and cached["mtime"] == st.st_mtime_ns:
+            return cached["info"]
+
+        info = None
+        try:
+            result = subprocess.run(
+                [real, "-XshowSettings:properties", "-version"],
+                capture_output=True, text=True, errors="replace", timeout=PROBE_TIMEOUT
+            )
+            props = {}
+            for line in result.stderr.splitlines():
+                match = PROPERTY_RE.match(line)
+                if match:
+                    props.setdefault(match.group(1), match.group(2).strip())
+            if "java.version" in props:
+                info = {
+                    "path": java_path,
+                    "version": props["java.version"],
+                    "major": parse_major(props["java.version"]),
+                    "arch": props.get("os.arch", ""),
+                    "bits": int(props.get("sun.arch.data.model", "64") or 64),
+                    "vendor": props.get("java.vendor", ""),
+                }
+        except (OSError, subprocess.SubprocessError, ValueError):
+            pass
+
+        with self._lock:
+            self.probes[real] = {"size": st.st_size, "mtime": st.st_mtime_ns, "info": info, "probed": time.time()}
+            self._dirty = True
+        return info
+
+    def supports(self, java_path, option):
+        """
+        Whether a java binary accepts a -XX option (e.g. a GC only some
+        builds include), or None if that cannot be told. Probed once per
+        binary and cached with the rest of its probe.
+        """
+        if self.probe(java_path) is None:
+            return None
+        real = os.path.realpath(java_path)
+        with self._lock:
+            known = self.probes[real].setdefault("options", {})
+            if option in known:
+                return known[option]
+        try:
+            result = subprocess.run(
+                [real, option, "-version"], capture_output=True, timeout=PROBE_TIMEOUT
+            )
+        except (OSError, subprocess.SubprocessError):
+            return None
+        with self._lock:
+            self.probes[real]["options"][option] = result.returncode == 0
+            self._dirty = True
+        return result.returncode == 0
+
+    def candidates(self, runtime_dirs=()):
+        exe = "java.exe" if platform.system() == "Windows" else "java"
+        paths = []
+        if os.environ.get("JAVA_HOME"):
+            paths.append(os.path.join(os.environ["JAVA_HOME"], "bin", exe))
+        on_path = shutil.which("java")
+        if on_path:
+            paths.append(on_path)
+
+        home = os.path.expanduser("~")
+        patterns = [
+            os.path.join(home, ".sdkman", "candidates", "java", "*", "bin", exe),
+            os.path.join(home, ".jdks", "*", "bin", exe),
+        ]
+        system = platform.system()
+        if system == "Windows":
+            for root in filter(None, {os.environ.get("ProgramFiles"), os.environ.get("ProgramFiles(x86)")}):
+                for vendor in ("Java", "Eclipse Adoptium", "Zulu", "Microsoft", "BellSoft", "Amazon Corretto"):
+                    patterns.append(os.path.join(root, vendor, "*", "bin", exe))
+        elif system == "Darwin":
+            patterns.append("/Library/Java/JavaVirtualMachines/*/Contents/Home/bin/java")
+        else:
+            patterns += ["/usr/lib/jvm/*/bin/java", "/usr/java/*/bin/java", "/opt/*/bin/java", "/opt/java/*/bin/java"]
+        for directory in runtime_dirs:
+            patterns.append(os.path.join(directory, "runtime", "*", runtime_platform(), "*", "bin", exe))
+
+        for pattern in patterns:
+            paths.extend(sorted(glob.glob(pattern)))
+
+        unique = {}
+        for path in paths:
+            if os.path.isfile(path):
+                unique.setdefault(os.path.realpath(path), path)
+        return list(unique.values())
+
+    def discover(self, runtime_dirs=()):
+        """Probe every JVM that can be found (in parallel) and return the usable ones."""
+        paths = self.candidates(runtime_dirs)
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            found = [info for info in executor.map(self.probe, paths) if info]
+        self.save()
+        return found
+
+    def find(self, major, runtime_dirs=()):
+        """The best discovered JVM for a Java major version, preferring 64-bit builds."""
+        matches = [info for info in self.discover(runtime_dirs) if info["major"] == major]
+        matches.sort(key=lambda info: info["bits"] != 64)
+        return matches[0] if matches else None
+
+
+def select_java(directory, version, registry=None, java_path=None, runtime_dirs=()):
+    """
+    Pick the java binary for an installed `version`: the user's `java_path`,
+    else the Mojang runtime for it, else a discovered JVM of the required
+    major version. Returns (path or None, required major version).
+    """
+    major, component = read_java_requirement(directory, version)
+    if java_path:
+        return java_path, major
+    if component:
+        path = runtime_java(directory, component)
+        if path:
+            return path, major
+    if registry is not None:
+        info = registry.find(major, runtime_dirs)
+        if info:
+            return info["path"], major
+    return None, major
+
+
+# -------------------------
+# Mojang runtimes
+# -------------------------
+def install_runtime(component, directory, max_workers=16, store=None, throttle=None, timeout=30, cancelled=None):
+    """
+    Download Mojang's `component` runtime for this platform into
+    `<directory>/runtime` with the parallel Downloader (SHA-1 verified,
+    deduplicated through the object store) and return its java binary.
+    Files are hardlinked or copied from the store, never symlinked: the JVM
+    finds its home from the real path of bin/java.
+    """
+    platform_name = runtime_platform()
+    home = runtime_home(directory, component)
+    with Downloader(max_workers=max_workers, store=store, throttle=throttle, timeout=timeout,
+                    allow_symlink=False, cancelled=cancelled) as downloader:
+        listing = downloader.session.get(JAVA_RUNTIME_MANIFEST_URL, timeout=timeout).json()
+        entries = listing.get(platform_name, {}).get(component)
+        if not entries:
+            raise ValueError(f"Mojang has no {component} runtime for {platform_name}")
+        manifest = downloader.session.get(entries[0]["manifest"]["url"], timeout=timeout).json()
+
+        tasks = []
+        executables = []
+        links = []
+        root = os.path.abspath(home)
+        for rel, entry in manifest["files"].items():
+            path = os.path.abspath(os.path.join(home, rel))
+            if not path.startswith(root + os.sep):
+                raise ValueError(f"Runtime file outside of {home}: {rel}")
+            if entry["type"] == "directory":
+                os.makedirs(path, exist_ok=True)
+            elif entry["type"] == "file":
+                raw = entry["downloads"]["raw"]
+                tasks.append(DownloadTask(raw["url"], path, raw["sha1"], raw.get("size")))
+                if entry.get("executable"):
+                    executables.append(path)
+            elif entry["type"] == "link":
+                links.append((path, entry["target"]))
+        downloader.download_all(tasks)
+
+    for path in executables:
+        os.chmod(path, os.stat(path).st_mode | 0o755)
+    for path, target in links:
+        if not os.path.lexists(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            try:
+                os.symlink(target, path)
+            except OSError:
+                pass
+
+    # Same marker files as the official launcher, so other tools agree the
+    # runtime is installed
+    platform_dir = os.path.dirname(home)
+    with open(os.path.join(platform_dir, ".version"), "w", encoding="utf-8") as f:
+        f.write(entries[0]["version"]["name"])
+    with open(os.path.join(platform_dir, f"{component}.sha1"), "w", encoding="utf-8") as f:
+        for task in tasks:
+            rel = os.path.relpath(task.path, home).replace(os.sep, "/")
+            f.write(f"{rel} /#// {task.sha1} {os.stat(task.path).st_ctime_ns}\n")
+    return runtime_java(directory, component)
@@ -0,0 +1,152 @@
+import os
+import platform
+
+DEFAULT_PROFILE = "auto"
+# Left to the OS, the launcher and the JVM's own off-heap memory
+HOST_RESERVE_MB = 2048
+MIN_HEAP_MB = 1024
+# Above this heap size a concurrent collector keeps pauses flat
+LARGE_HEAP_MB = 8192
+
+# name -> (label, minimum Java major version)
+PROFILES = {
+    "auto": ("Automatic", 8),
+    "g1": ("G1 low-pause", 8),
+    "zgc": ("ZGC (large heaps)", 17),
+    "shenandoah": ("Shenandoah (large heaps)", 17),
+    "memory-saver": ("Memory saver", 8),
+    "legacy": ("Fixed heap (old behaviour)", 8),
+}
+# Collectors that some builds leave out (Oracle JDK has no Shenandoah)
+GC_OPTIONS = {
+    "zgc": "-XX:+UseZGC",
+    "shenandoah": "-XX:+UseShenandoahGC",
+}
+
+
+def host_memory_mb():
+    """Physical memory of this machine in MB, or None if it cannot be read."""
+    try:
+        return os.sysconf("SC_PAGE_SIZE") * os.sysconf("SC_PHYS_PAGES") // (1024 * 1024)
+    except (AttributeError, ValueError, OSError):
+        pass
+    if platform.system() == "Windows":
+        import ctypes
+
+        class MemoryStatus(ctypes.Structure):
+            _fields_ = [
+                ("dwLength", ctypes.c_ulong), ("dwMemoryLoad", ctypes.c_ulong),
+                ("ullTotalPhys", ctypes.c_ulonglong), ("ullAvailPhys", ctypes.c_ulonglong),
+                ("ullTotalPageFile", ctypes.c_ulonglong), ("ullAvailPageFile", ctypes.c_ulonglong),
+                ("ullTotalVirtual", ctypes.c_ulonglong), ("ullAvailVirtual", ctypes.c_ulonglong),
+                ("ullAvailExtendedVirtual", ctypes.c_ulonglong),
+            ]
+        status = MemoryStatus()
+        status.dwLength = ctypes.sizeof(MemoryStatus)
+        if ctypes.windll.kernel32.GlobalMemoryStatusEx(ctypes.byref(status)):
+            return status.ullTotalPhys // (1024 * 1024)
+    return None
+
+
+def recommended_heap(mod_count):
+    """A heap size in MB that is comfortable for an instance with `mod_count` mods."""
+    if not mod_count:
+        return 2048
+    heap = min(3072 + 24 * mod_count, 10240)
+    return (heap + 511) // 512 * 512
+
+
+def check_heap(ram, mod_count=0, host_mb=None):
+    """Return (heap MB to use, warnings) for a requested heap of `ram` MB."""
+    warnings = []
+    heap = ram
+    if heap < MIN_HEAP_MB:
+        warnings.append(f"{ram} MB is below the {MIN_HEAP_MB} MB minimum, using {MIN_HEAP_MB} MB")
+        heap = MIN_HEAP_MB
+    if host_mb:
+        limit = max(MIN_HEAP_MB, host_mb - HOST_RESERVE_MB)
+        if heap > limit:
+            warnings.append(f"{ram} MB does not fit in {host_mb} MB of system memory, using {limit} MB")
+            heap = limit
+    wanted = recommended_heap(mod_count)
+    if heap < wanted:
+        needs = f"{mod_count} mods usually need" if mod_count else "Minecraft without mods usually needs"
+        warnings.append(f"{needs} about {wanted} MB, the game may stutter or run out of memory")
+    return heap, warnings
+
+
+def _initial_heap(heap, fraction):
+    # Commit only part of the heap up front; the JVM grows it on demand
+    return f"-Xms{min(heap, max(int(heap * fraction), MIN_HEAP_MB))}M"
+
+
+def _gc_args(profile, heap, java_major):
+    if profile == "g1":
+        # Young generation sized for the client's allocation rate; pauses
+        # capped well below a frame budget at 20 fps
+        return [
+            _initial_heap(heap, 0.5),
+            "-XX:+UseG1GC", "-XX:MaxGCPauseMillis=50", "-XX:+ParallelRefProcEnabled",
+            "-XX:+UnlockExperimentalVMOptions", "-XX:G1NewSizePercent=30", "-XX:G1MaxNewSizePercent=40",
+            "-XX:G1HeapRegionSize=8M", "-XX:G1ReservePercent=20", "-XX:InitiatingHeapOccupancyPercent=15",
+            "-XX:+DisableExplicitGC",
+        ]
+    if profile == "zgc":
+        args = [_initial_heap(heap, 0.25), "-XX:+UseZGC", "-XX:+DisableExplicitGC"]
+        # Generational ZGC is opt-in on 21 and 22, the only mode from 23 on
+        if 21 <= java_major < 23:
+            args.append("-XX:+ZGenerational")
+        return args
+    if profile == "shenandoah":
+        return [_initial_heap(heap, 0.25), "-XX:+UseShenandoahGC", "-XX:+DisableExplicitGC"]
+    if profile == "memory-saver":
+        # Start small and hand unused heap back to the OS between collections
+        args = [
+            f"-Xms{min(256, heap)}M", "-XX:+UseG1GC", "-XX:MaxGCPauseMillis=100",
+            "-XX:MinHeapFreeRatio=10", "-XX:MaxHeapFreeRatio=30", "-XX:+UseStringDeduplication",
+        ]
+        if java_major >= 12:
+            args.append("-XX:G1PeriodicGCInterval=15000")
+        return args
+    return [f"-Xms{heap}M"]
+
+
+def build_jvm_args(profile, ram, java_major=8, mod_count=0, host_mb=None, supports=None):
+    """
+    Turn a tuning profile into JVM arguments.
+
+    Returns a dict with the profile that was asked for ("requested") and the
+    one actually used ("profile"), the heap size, the arguments and any
+    warnings. "auto" picks ZGC for large heaps on Java 17+ and G1 otherwise;
+    a profile the Java version cannot run falls back to G1. `supports`, if
+    given, is called with a GC option (see JavaRegistry.supports) and
+    returns False when this Java build lacks that collector.
+    """
+    requested = profile if profile in PROFILES else DEFAULT_PROFILE
+    heap, warnings = check_heap(ram, mod_count, host_mb)
+    if profile not in PROFILES:
+        warnings.append(f"Unknown JVM profile {profile!r}, using {DEFAULT_PROFILE}")
+
+    chosen = requested
+    if chosen == "auto":
+        chosen = "zgc" if heap >= LARGE_HEAP_MB and java_major >= PROFILES["zgc"][1] else "g1"
+    elif java_major < PROFILES[chosen][1]:
+        warnings.append(f"{PROFILES[chosen][0]} needs Java {PROFILES[chosen][1]}+, using G1 on Java {java_major}")
+        chosen = "g1"
+    if chosen in GC_OPTIONS and supports is not None and supports(GC_OPTIONS[chosen]) is False:
+        if requested != "auto":
+            warnings.append(f"{PROFILES[chosen][0]} is not available in this Java build, using G1")
+        chosen = "g1"
+    if chosen == "memory-saver":
+        capped = min(heap, recommended_heap(mod_count))
+        if capped < heap:
+            warnings.append(f"Memory saver caps the heap at {capped} MB instead of the configured {heap} MB")
+        heap = capped
+
+    return {
+        "requested": requested,
+        "profile": chosen,
+        "heap_mb": heap,
+        "args": [f"-Xmx{heap}M"] + _gc_args(chosen, heap, java_major),
+        "warnings": warnings,
+    }
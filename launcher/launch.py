@@ -0,0 +1,203 @@
+import os
+import subprocess
+import sys
+import time
+
+from .command_cache import CommandCache
+from .install import install_lock, install_version
+from .install_index import InstallIndex
+from .java_runtime import select_java
+from .jvm_profiles import DEFAULT_PROFILE, build_jvm_args, host_memory_mb
+from .log_pipeline import LogPipeline
+from .session_log import SessionLog
+from .object_store import ObjectStore
+
+
+class GameLaunch:
+    """
+    Installs (if needed) and runs one game session, without any Qt.
+
+    `progress(status, percent)` and `log(text)` report what is happening.
+    Game output is handed to `on_batch(batch)` in (stream, line) batches,
+    each of which must be acknowledged with `ack`; without `on_batch` the
+    lines are written to stdout. LaunchWorker wraps this for the GUI and
+    launcher.cli uses it directly.
+    """
+
+    def __init__(self, username, version, directory, ram, java_path=None, ms_auth=None, deep_verify=False,
+                 store_dir=None, shared_dir=None, logs_dir=None, manifest=None, install_job=None, java_registry=None,
+                 jvm_profile=DEFAULT_PROFILE, mod_count=0, supervisor=None, name=None,
+                 progress=None, log=None, on_batch=None):
+        self.username = username
+        self.version = version
+        self.directory = directory
+        self.ram = ram
+        self.java_path = java_path
+        self.ms_auth = ms_auth
+        self.deep_verify = deep_verify
+        self.store_dir = store_dir
+        self.shared_dir = shared_dir
+        self.logs_dir = logs_dir
+        self.manifest = manifest
+        self.install_job = install_job
+        self.java_registry = java_registry
+        self.jvm_profile = jvm_profile
+        self.mod_count = mod_count
+        self.supervisor = supervisor
+        self.name = name or version
+        self.progress = progress or (lambda status, percent: None)
+        self.log = log or print
+        self.on_batch = on_batch or self._print_batch
+        self.pipeline = None
+        self.returncode = None
+
+    def _print_batch(self, batch):
+        for stream, line in batch:
+            print(line, file=sys.stderr if stream == "stderr" else sys.stdout)
+        self.ack()
+
+    def prepare(self):
+        """Make sure the version is installed (and, with deep_verify, intact)."""
+        if not os.path.exists(self.directory):
+            os.makedirs(self.directory)
+
+        if self.manifest is not None and self.version in ("latest-release", "latest-snapshot"):
+            self.version = self.manifest.resolve(self.version)
+
+        job = self.install_job
+        if job is not None and job.running:
+            # A background install of this version is under way: take
+            # it over at full speed rather than starting again
+            job.boost()
+            job.add_listener(self.progress)
+            try:
+                job.wait()
+            except Exception as e:
+                self.log(f"[Launcher] Background install failed ({e}), retrying")
+            finally:
+                job.remove_listener(self.progress)
+
+        # Another install of this game dir (a prefetch of another version)
+        # finishes first rather than racing this one
+        with install_lock(self.directory):
+            index = InstallIndex(self.directory)
+            if self.deep_verify:
+                self.progress("Verifying game files...", 0)
+                bad = index.verify(self.version, deep=True)
+                if bad:
+                    self.log(f"Deep verify: {len(bad)} file(s) missing or corrupt, repairing")
+                    index.forget_version(self.version)
+
+            if not index.is_version_ready(self.version):
+                self.progress(f"Installing {self.version}...", 0)
+                store = ObjectStore(self.store_dir) if self.store_dir else None
+                install_version(
+                    self.version, self.directory, progress=self.progress,
+                    index=index, store=store, shared_dir=self.shared_dir, manifest=self.manifest
+                )
+
+    def run(self):
+        """Prepare, start the game and block until it exits. Returns the exit code."""
+        start = time.perf_counter()
+        self.prepare()
+
+        options = {
+            "username": self.username,
+            "uuid": "",
+            "token": "",
+        }
+
+        if self.ms_auth:
+            options["username"] = self.ms_auth["name"]
+            options["uuid"] = self.ms_auth.get("uuid", "")
+            options["token"] = self.ms_auth.get("minecraft_access_token", "")
+
+        runtime_dirs = [d for d in (self.directory, self.shared_dir) if d]
+        java, major = select_java(
+            self.directory, self.version, self.java_registry, self.java_path, runtime_dirs
+        )
+        info = None
+        if java:
+            options["executablePath"] = java
+            info = self.java_registry.probe(java) if self.java_registry else None
+            if info:
+                self.java_registry.save()
+                self.log(f"[Launcher] Using Java {info['version']} ({java})")
+                if self.java_path and info["major"] is not None and info["major"] < major:
+                    self.log(
+                        f"[Launcher] Warning: {self.version} needs Java {major}, the configured Java is older"
+                    )
+
+        java_major = info["major"] if info and info["major"] else major
+        supports = None
+        if info:
+            supports = lambda option: self.java_registry.supports(java, option)
+        jvm = build_jvm_args(self.jvm_profile, self.ram, java_major, self.mod_count, host_memory_mb(), supports)
+        if info:
+            self.java_registry.save()
+        options["jvmArguments"] = jvm["args"]
+        for warning in jvm["warnings"]:
+            self.log(f"[Launcher] Warning: {warning}")
+        self.log(f"[Launcher] JVM profile {jvm['profile']}: {' '.join(jvm['args'])}")
+
+        self.progress("Launching...", 100)
+        command_cache = CommandCache(self.directory)
+        cmd = command_cache.get_command(self.version, options)
+        if self.supervisor is not None:
+            # Refuses a second copy of this instance, or one that would
+            # go over the total RAM cap
+            self.supervisor.reserve(self.directory, self.name, jvm["heap_mb"])
+        try:
+            process = subprocess.Popen(
+                cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+                text=True, encoding="utf-8", errors="replace"
+            )
+        except Exception:
+            if self.supervisor is not None:
+                self.supervisor.release(self.directory)
+            raise
+        if self.supervisor is not None:
+            self.supervisor.attach(self.directory, process)
+        spawn_ms = (time.perf_counter() - start) * 1000
+        spawned = (
+            f"[Launcher] Process spawned after {spawn_ms:.0f} ms "
+            f"(command cache {'hit' if command_cache.last_hit else 'miss'})"
+        )
+        self.log(spawned)
+
+        session_log = None
+        try:
+            if self.logs_dir:
+                # Recorded so sessions can be compared across profiles
+                session_log = SessionLog(self.logs_dir, meta={
+                    "version": self.version, "directory": self.directory, "spawn_ms": round(spawn_ms),
+                    "java": {"path": options.get("executablePath"), "version": info["version"] if info else None},
+                    "jvm": jvm,
+                })
+                session_log.write("stdout", spawned)
+            self.pipeline = LogPipeline(
+                process, self.on_batch,
+                on_line=session_log.write if session_log else None
+            )
+            self.pipeline.run()
+        finally:
+            if self.supervisor is not None:
+                self.supervisor.release(self.directory)
+            if session_log:
+                session_log.write("stdout", f"[Launcher] Process exited with code {process.returncode}")
+                session_log.close()
+
+        self.returncode = process.returncode
+        return process.returncode
+
+    def ack(self):
+        if self.pipeline:
+            self.pipeline.ack()
+
+    def kill(self):
+        if self.supervisor is not None:
+            return self.supervisor.kill(self.directory)
+        if self.pipeline:
+            self.pipeline.process.terminate()
+            return True
+        return False
@@ -0,0 +1,93 @@
+import collections
+import threading
+
+STDOUT = "stdout"
+STDERR = "stderr"
+
+
+class LogPipeline:
+    """
+    Drains a game process' stdout and stderr on two reader threads so
+    neither pipe can fill up and block the game, then hands the lines to
+    `on_batch` in time/size bounded batches of (stream, line) tuples.
+
+    At most `max_in_flight` batches may be waiting for the consumer
+    (the GUI acknowledges each one with `ack()`). While the consumer is
+    behind, lines accumulate in a buffer capped at `max_pending`; the oldest
+    lines beyond that are dropped and reported as a single summary line.
+    `on_line`, if given, sees every line on the reader thread before any
+    dropping happens (used for the on-disk session log).
+    """
+
+    def __init__(self, process, on_batch, interval=0.05, max_batch=1000,
+                 max_pending=20000, max_in_flight=4, on_line=None):
+        self.process = process
+        self.on_batch = on_batch
+        self.on_line = on_line
+        self.interval = interval
+        self.max_batch = max_batch
+        self.max_in_flight = max_in_flight
+        self._buffer = collections.deque()
+        self._max_pending = max_pending
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._dropped = 0
+        self._in_flight = 0
+        self._readers = []
+
+    def ack(self):
+        with self._lock:
+            self._in_flight = max(0, self._in_flight - 1)
+        self._wakeup.set()
+
+    def run(self):
+        """Pump lines until the process exits and both pipes are drained."""
+        for name, stream in ((STDOUT, self.process.stdout), (STDERR, self.process.stderr)):
+            reader = threading.Thread(target=self._read, args=(name, stream), daemon=True)
+            reader.start()
+            self._readers.append(reader)
+
+        while True:
+            self._wakeup.wait(self.interval)
+            self._wakeup.clear()
+            done = not any(r.is_alive() for r in self._readers)
+            self._flush(force=done)
+            if done:
+                with self._lock:
+                    if not self._buffer:
+                        break
+
+        self.process.wait()
+
+    # -------------------------
+    # Internals
+    # -------------------------
+    def _read(self, name, stream):
+        for line in iter(stream.readline, ""):
+            line = line.rstrip("\r\n")
+            if self.on_line:
+                self.on_line(name, line)
+            with self._lock:
+                self._buffer.append((name, line))
+                if len(self._buffer) > self._max_pending:
+                    self._buffer.popleft()
+                    self._dropped += 1
+                full = len(self._buffer) >= self.max_batch
+            if full:
+                self._wakeup.set()
+        stream.close()
+
+    def _flush(self, force=False):
+        while True:
+            with self._lock:
+                if not self._buffer:
+                    return
+                if self._in_flight >= self.max_in_flight and not force:
+                    return
+                count = min(len(self._buffer), self.max_batch)
+                batch = [self._buffer.popleft() for _ in range(count)]
+                if self._dropped:
+                    batch.insert(0, (STDERR, f"[Launcher] Skipped {self._dropped} log lines, the log viewer fell behind"))
+                    self._dropped = 0
+                self._in_flight += 1
+            self.on_batch(batch)
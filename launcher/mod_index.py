@@ -0,0 +1,210 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+
+# Modrinth lists loaders among a hit's categories
+LOADERS = {"fabric", "forge", "neoforge", "quilt", "liteloader", "rift", "modloader"}
+# "key:value" tokens accepted in a query, mapped to their padded column
+FILTERS = {"category": "categories", "version": "game_versions", "loader": "loaders"}
+SYNC_INTERVAL = 6 * 3600
+# Above this many matches, bm25 scoring costs more than it tells apart and
+# results are ordered by downloads instead
+RANKED_LIMIT = 2000
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS mods (
+    project_id TEXT PRIMARY KEY,
+    slug TEXT,
+    title TEXT,
+    author TEXT,
+    description TEXT,
+    categories TEXT,
+    game_versions TEXT,
+    loaders TEXT,
+    downloads INTEGER,
+    date_modified TEXT,
+    hit TEXT
+);
+CREATE INDEX IF NOT EXISTS mods_downloads ON mods(downloads DESC);
+CREATE VIRTUAL TABLE IF NOT EXISTS mods_fts USING fts5(
+    title, author, description, categories,
+    content='mods', content_rowid='rowid', prefix='2 3'
+);
+CREATE TRIGGER IF NOT EXISTS mods_ai AFTER INSERT ON mods BEGIN
+    INSERT INTO mods_fts(rowid, title, author, description, categories)
+    VALUES (new.rowid, new.title, new.author, new.description, new.categories);
+END;
+CREATE TRIGGER IF NOT EXISTS mods_ad AFTER DELETE ON mods BEGIN
+    INSERT INTO mods_fts(mods_fts, rowid, title, author, description, categories)
+    VALUES ('delete', old.rowid, old.title, old.author, old.description, old.categories);
+END;
+CREATE TRIGGER IF NOT EXISTS mods_au AFTER UPDATE ON mods BEGIN
+    INSERT INTO mods_fts(mods_fts, rowid, title, author, description, categories)
+    VALUES ('delete', old.rowid, old.title, old.author, old.description, old.categories);
+    INSERT INTO mods_fts(rowid, title, author, description, categories)
+    VALUES (new.rowid, new.title, new.author, new.description, new.categories);
+END;
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+"""
+
+
+def _padded(values):
+    # " a b c " lets a single instr() match whole words only
+    return " " + " ".join(values) + " "
+
+
+def _quote(term):
+    return '"' + term.replace('"', "") + '"*'
+
+
+class ModIndex:
+    """
+    Local SQLite full-text index of Modrinth mods.
+
+    Filled from search responses the launcher has already seen and from
+    `sync`, which pulls recently updated mods in bulk. `search` answers in
+    the same shape as the Modrinth search endpoint, so callers can use
+    either one. Besides free text, a query may contain author:, category:,
+    version: and loader: filters.
+    """
+
+    def __init__(self, path):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.path = path
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.executescript(SCHEMA)
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+    def __len__(self):
+        with self._lock:
+            return self._db.execute("SELECT count(*) FROM mods").fetchone()[0]
+
+    def get_meta(self, key, default=None):
+        with self._lock:
+            row = self._db.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else default
+
+    def set_meta(self, key, value):
+        with self._lock, self._db:
+            self._db.execute("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, str(value)))
+
+    # -------------------------
+    # Writing
+    # -------------------------
+    def add_hits(self, hits):
+        rows = []
+        for hit in hits:
+            categories = hit.get("categories", []) + hit.get("display_categories", [])
+            rows.append((
+                hit["project_id"], hit.get("slug"), hit.get("title", ""), hit.get("author", ""),
+                hit.get("description", ""), _padded(sorted(set(categories) - LOADERS)),
+                _padded(hit.get("versions", [])), _padded(sorted(set(categories) & LOADERS)),
+                hit.get("downloads", 0), hit.get("date_modified", ""), json.dumps(hit),
+            ))
+        if not rows:
+            return
+        with self._lock, self._db:
+            self._db.executemany("""
+                INSERT INTO mods (project_id, slug, title, author, description, categories,
+                                  game_versions, loaders, downloads, date_modified, hit)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(project_id) DO UPDATE SET
+                    slug = excluded.slug, title = excluded.title, author = excluded.author,
+                    description = excluded.description, categories = excluded.categories,
+                    game_versions = excluded.game_versions, loaders = excluded.loaders,
+                    downloads = excluded.downloads, date_modified = excluded.date_modified,
+                    hit = excluded.hit
+            """, rows)
+
+    # -------------------------
+    # Searching
+    # -------------------------
+    def search(self, query, offset=0, limit=20, game_version=None, loader=None):
+        terms = []
+        where = []
+        params = []
+        filters = {"version": game_version, "loader": loader}
+        for token in query.split():
+            key, sep, value = token.partition(":")
+            if sep and value and key == "author":
+                terms.append("author:" + _quote(value))
+            elif sep and value and key in FILTERS:
+                filters[key] = value
+            elif any(c.isalnum() for c in token):
+                terms.append(_quote(token))
+        for key, value in filters.items():
+            if value:
+                where.append(f"instr(mods.{FILTERS[key]}, ?) > 0")
+                params.append(f" {value.lower()} ")
+
+        with self._lock:
+            try:
+                source = "mods"
+                order = "mods.downloads DESC"
+                if terms:
+                    match = " ".join(terms)
+                    matches = self._db.execute(
+                        "SELECT count(*) FROM mods_fts WHERE mods_fts MATCH ?", (match,)
+                    ).fetchone()[0]
+                    if matches <= RANKED_LIMIT:
+                        source = "mods_fts JOIN mods ON mods.rowid = mods_fts.rowid"
+                        where.insert(0, "mods_fts MATCH ?")
+                        # Title matches weigh most, then author, categories, description
+                        order = "bm25(mods_fts, 10.0, 5.0, 1.0, 2.0), mods.downloads DESC"
+                    else:
+                        where.insert(0, "mods.rowid IN (SELECT rowid FROM mods_fts WHERE mods_fts MATCH ?)")
+                    params.insert(0, match)
+                clause = f" WHERE {' AND '.join(where)}" if where else ""
+                if terms and len(where) == 1:
+                    total = matches
+                else:
+                    total = self._db.execute(f"SELECT count(*) FROM {source}{clause}", params).fetchone()[0]
+                rows = self._db.execute(
+                    f"SELECT mods.hit FROM {source}{clause} ORDER BY {order} LIMIT ? OFFSET ?",
+                    params + [limit, offset],
+                ).fetchall()
+            except sqlite3.OperationalError:
+                # Unbalanced FTS syntax the quoting did not catch
+                total, rows = 0, []
+        return {"hits": [json.loads(r[0]) for r in rows], "offset": offset, "limit": limit, "total_hits": total}
+
+    # -------------------------
+    # Refreshing
+    # -------------------------
+    def needs_sync(self):
+        return time.time() - float(self.get_meta("synced_at", 0)) > SYNC_INTERVAL
+
+    def sync(self, client, max_pages=20, page_size=100, cancel=None):
+        """
+        Pull mods from Modrinth into the index and return how many were added
+        or updated. The first sync takes the most downloaded mods; later ones
+        page through the most recently updated and stop at the first mod
+        that has not changed since the previous sync.
+        """
+        since = self.get_meta("synced_until")
+        newest = since or ""
+        added = 0
+        for page in range(max_pages):
+            data = client.search(
+                "", offset=page * page_size, limit=page_size, facets=[["project_type:mod"]],
+                index="updated" if since else "downloads", cancel=cancel, cache=False,
+            )
+            hits = data.get("hits", [])
+            fresh = [h for h in hits if not since or h.get("date_modified", "") > since]
+            self.add_hits(fresh)
+            added += len(fresh)
+            newest = max([newest] + [h.get("date_modified", "") for h in hits])
+            if len(fresh) < len(hits) or len(hits) < page_size:
+                break
+        if newest:
+            self.set_meta("synced_until", newest)
+        self.set_meta("synced_at", time.time())
+        return added
@@ -0,0 +1,235 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+from .downloader import Downloader, DownloadTask
+from .install_index import InstallIndex
+
+# Ids per bulk request, keeps the query string well below URL length limits
+BULK_CHUNK = 100
+# Newest versions per project looked up in bulk before falling back to a
+# filtered per-project query
+RECENT_VERSIONS = 20
+
+
+class ModInstallError(Exception):
+    pass
+
+
+def _chunks(items, size=BULK_CHUNK):
+    items = sorted(items)
+    return [items[i:i + size] for i in range(0, len(items), size)]
+
+
+def primary_file(version):
+    files = version.get("files", [])
+    return next((f for f in files if f.get("primary")), files[0] if files else None)
+
+
+class ModResolver:
+    """
+    Resolves Modrinth projects to their newest version for one Minecraft
+    version and loader, following required dependencies.
+
+    Resolution runs in rounds, one per dependency depth. Each round fetches
+    all of its projects with bulk GET /projects and the recent versions of
+    all of them with bulk GET /versions, chunks in parallel. Only projects
+    whose recent versions are all incompatible fall back to the filtered
+    per-project endpoint, so a 200-mod pack takes a handful of requests
+    instead of hundreds.
+    """
+
+    def __init__(self, client, game_version, loader, max_workers=8):
+        self.client = client
+        self.game_version = game_version
+        self.loader = loader.lower()
+        self.max_workers = max_workers
+
+    def _bulk(self, fetch, ids):
+        results = []
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            for chunk in pool.map(fetch, _chunks(ids)):
+                results.extend(chunk)
+        return results
+
+    def compatible(self, version):
+        return self.loader in version.get("loaders", []) and self.game_version in version.get("game_versions", [])
+
+    def pick(self, versions, pinned=None):
+        candidates = [v for v in versions if self.compatible(v) and primary_file(v)]
+        for version in candidates:
+            if version["id"] == pinned:
+                return version
+        if not candidates:
+            return None
+        # Releases first, then the newest
+        return max(candidates, key=lambda v: (v.get("version_type") == "release", v.get("date_published", "")))
+
+    def resolve(self, project_ids, installed=()):
+        """
+        Return {project_id: {"project": ..., "version": ..., "dependency": bool}}
+        for `project_ids` and every required dependency that is not already
+        in `installed`.
+        """
+        requested = set(project_ids)
+        installed = set(installed)
+        resolved = {}
+        pinned = {}
+        incompatible = {}
+        missing = []
+        queue = set(requested)
+
+        while queue:
+            projects = {p["id"]: p for p in self._bulk(self.client.projects, queue)}
+            missing.extend(pid for pid in queue if pid not in projects)
+
+            # Projects that never supported this loader/version can be
+            # rejected without looking at their versions
+            candidates = []
+            for project in projects.values():
+                if self.loader in project.get("loaders", []) and self.game_version in project.get("game_versions", []):
+                    candidates.append(project)
+                else:
+                    missing.append(project.get("title", project["id"]))
+
+            version_ids = set()
+            for project in candidates:
+                version_ids.update(project.get("versions", [])[-RECENT_VERSIONS:])
+                if project["id"] in pinned:
+                    version_ids.add(pinned[project["id"]])
+            by_project = {}
+            for version in self._bulk(self.client.versions, version_ids):
+                by_project.setdefault(version["project_id"], []).append(version)
+
+            chosen = {}
+            fallback = []
+            for project in candidates:
+                version = self.pick(by_project.get(project["id"], []), pinned.get(project["id"]))
+                if version:
+                    chosen[project["id"]] = version
+                else:
+                    fallback.append(project)
+            if fallback:
+                with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+                    lists = pool.map(
+                        lambda p: self.client.project_versions(p["id"], [self.loader], [self.game_version]),
+                        fallback,
+                    )
+                    for project, versions in zip(fallback, lists):
+                        version = self.pick(versions, pinned.get(project["id"]))
+                        if version:
+                            chosen[project["id"]] = version
+                        else:
+                            missing.append(project.get("title", project["id"]))
+
+            queue = set()
+            version_only = set()
+            for project_id, version in chosen.items():
+                resolved[project_id] = {
+                    "project": projects[project_id],
+                    "version": version,
+                    "dependency": project_id not in requested,
+                }
+                for dep in version.get("dependencies", []):
+                    dep_type = dep.get("dependency_type")
+                    if dep_type == "incompatible" and dep.get("project_id"):
+                        incompatible[dep["project_id"]] = projects[project_id].get("title", project_id)
+                    if dep_type != "required":
+                        continue
+                    dep_project = dep.get("project_id")
+                    if dep_project is None:
+                        if dep.get("version_id"):
+                            version_only.add(dep["version_id"])
+                        continue
+                    if dep_project in resolved or dep_project in installed:
+                        continue
+                    if dep.get("version_id"):
+                        pinned[dep_project] = dep["version_id"]
+                    queue.add(dep_project)
+
+            # Dependencies that only name a version: look the versions up
+            # to learn which project they belong to
+            if version_only:
+                for version in self._bulk(self.client.versions, version_only):
+                    project_id = version["project_id"]
+                    if project_id not in resolved and project_id not in installed:
+                        pinned[project_id] = version["id"]
+                        queue.add(project_id)
+
+        if missing:
+            raise ModInstallError(
+                f"No {self.loader} version for Minecraft {self.game_version}: {', '.join(sorted(missing))}"
+            )
+        conflicts = [
+            f"{resolved[p]['project'].get('title', p) if p in resolved else p} (incompatible with {by})"
+            for p, by in incompatible.items()
+            if p in resolved or p in installed
+        ]
+        if conflicts:
+            raise ModInstallError(f"Conflicting mods: {', '.join(conflicts)}")
+        return resolved
+
+
+def install_mods(client, modpack, game_dir, project_ids, progress=None, store=None, max_workers=8):
+    """
+    Install Modrinth projects and their required dependencies into
+    `<game_dir>/mods` and record them in `modpack["mods"]`.
+
+    Jars are downloaded concurrently and verified against the SHA-1 that
+    Modrinth publishes. An existing entry for the same project is replaced
+    and its old jar removed. The caller persists the modpack. Returns the
+    list of new mod entries.
+    """
+    report = progress or (lambda status, percent: None)
+    loader = (modpack.get("loader") or "").lower()
+    if loader in ("", "vanilla"):
+        raise ModInstallError("Vanilla modpacks cannot load mods, create a Fabric or Forge modpack instead")
+
+    report("Resolving mods...", 0)
+    mods = modpack.setdefault("mods", [])
+    installed = {m["project_id"] for m in mods}
+    resolver = ModResolver(client, modpack["version"], loader, max_workers)
+    resolved = resolver.resolve(project_ids, installed)
+
+    mods_dir = os.path.join(game_dir, "mods")
+    os.makedirs(mods_dir, exist_ok=True)
+    tasks = []
+    entries = []
+    for project_id, item in resolved.items():
+        version = item["version"]
+        file = primary_file(version)
+        filename = os.path.basename(file["filename"])
+        sha1 = file.get("hashes", {}).get("sha1")
+        tasks.append(DownloadTask(file["url"], os.path.join(mods_dir, filename), sha1, file.get("size")))
+        entries.append({
+            "project_id": project_id,
+            "version_id": version["id"],
+            "title": item["project"].get("title", project_id),
+            "version_number": version.get("version_number"),
+            "filename": filename,
+            "sha1": sha1,
+            "dependency": item["dependency"],
+        })
+
+    def on_file(done, total):
+        report(f"Downloading mods ({done}/{total})", int(done * 100 / total))
+
+    index = InstallIndex(game_dir)
+    with Downloader(max_workers=max_workers, callback=on_file, index=index, store=store) as downloader:
+        downloader.download_all(tasks)
+    index.save()
+
+    by_project = {m["project_id"]: m for m in mods}
+    for entry in entries:
+        old = by_project.get(entry["project_id"])
+        if old:
+            # Explicitly installed mods stay explicit when pulled in again
+            entry["dependency"] = entry["dependency"] and old.get("dependency", False)
+            if old["filename"] != entry["filename"]:
+                try:
+                    os.remove(os.path.join(mods_dir, old["filename"]))
+                except FileNotFoundError:
+                    pass
+        by_project[entry["project_id"]] = entry
+    modpack["mods"] = sorted(by_project.values(), key=lambda m: m["title"].lower())
+    report("Mods installed", 100)
+    return entries
@@ -0,0 +1,219 @@
+import os
+import shutil
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+from .downloader import Downloader, DownloadTask, sha1_file
+from .install_index import InstallIndex
+from .mod_install import primary_file
+
+# Hashes per POST /version_files/update request
+UPDATE_CHUNK = 200
+# Scratch space for an update in progress, next to mods/ so renames stay
+# on one filesystem
+STAGING_DIR = ".molten_update"
+
+
+class ModUpdateError(Exception):
+    pass
+
+
+class ModUpdate:
+    """One jar to replace: the installed file and the Modrinth version that supersedes it."""
+
+    def __init__(self, filename, sha1, version, file):
+        self.filename = filename
+        self.sha1 = sha1
+        self.version = version
+        self.file = file
+
+    @property
+    def new_filename(self):
+        return os.path.basename(self.file["filename"])
+
+    def __repr__(self):
+        return f"ModUpdate({self.filename} -> {self.new_filename})"
+
+
+def hash_mods(game_dir, index, max_workers=8):
+    """
+    {filename: sha1} for the jars in `<game_dir>/mods`. Hashes come from the
+    instance's InstallIndex while a jar's size and mtime are unchanged, so a
+    repeat check only stats the files; the rest are hashed in parallel and
+    recorded.
+    """
+    mods_dir = os.path.join(game_dir, "mods")
+    if not os.path.isdir(mods_dir):
+        return {}
+    hashes = {}
+    unknown = []
+    with os.scandir(mods_dir) as entries:
+        for entry in entries:
+            if not entry.is_file() or not entry.name.endswith(".jar"):
+                continue
+            known = index.lookup(entry.path)
+            if known:
+                hashes[entry.name] = known
+            else:
+                unknown.append(entry.path)
+    if unknown:
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            for path, sha1 in zip(unknown, pool.map(sha1_file, unknown)):
+                index.record(path, sha1)
+                hashes[os.path.basename(path)] = sha1
+        index.save()
+    return hashes
+
+
+def check_updates(client, modpack, game_dir, index=None, max_workers=8):
+    """
+    Ask Modrinth which installed jars have a newer version for the
+    modpack's loader and Minecraft version. All hashes go out in a few
+    bulk POSTs, chunks in parallel. Returns the minimal list of
+    ModUpdates: jars Modrinth does not know, jars already at the newest
+    version and updates whose file is already installed are left out, as
+    are updates that would install the same filename as another one.
+    """
+    loader = (modpack.get("loader") or "").lower()
+    if loader in ("", "vanilla"):
+        return []
+    index = index or InstallIndex(game_dir)
+    hashes = hash_mods(game_dir, index, max_workers)
+    if not hashes:
+        return []
+
+    unique = sorted(set(hashes.values()))
+    chunks = [unique[i:i + UPDATE_CHUNK] for i in range(0, len(unique), UPDATE_CHUNK)]
+    latest = {}
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        for result in pool.map(lambda chunk: client.latest_versions(chunk, [loader], [modpack["version"]]), chunks):
+            latest.update(result)
+
+    installed = set(unique)
+    updates = []
+    seen_versions = set()
+    for filename, sha1 in sorted(hashes.items()):
+        version = latest.get(sha1)
+        file = primary_file(version) if version else None
+        if not file:
+            continue
+        new_sha1 = file.get("hashes", {}).get("sha1")
+        if new_sha1 in installed or version["id"] in seen_versions:
+            # Up to date, or the newer jar is already there (or queued)
+            continue
+        seen_versions.add(version["id"])
+        updates.append(ModUpdate(filename, sha1, version, file))
+
+    # Two different projects shipping the same filename would overwrite
+    # each other; there is no telling which one is wanted
+    targets = Counter(u.new_filename for u in updates)
+    return [u for u in updates if targets[u.new_filename] == 1]
+
+
+def apply_updates(updates, modpack, game_dir, progress=None, store=None, max_workers=8):
+    """
+    Replace the jars of `updates` and update `modpack["mods"]` to match
+    (the caller persists the modpack).
+
+    New jars are downloaded in parallel into a staging dir and checked
+    against their SHA-1 first; nothing in mods/ is touched until all of
+    them are there. The old jars are then moved aside and the new ones
+    moved in. If any step fails every rename is undone, so the instance
+    is left exactly as it was. Should undoing fail too, the staging dir
+    is kept (the error names it) and holds the original jars.
+    """
+    report = progress or (lambda status, percent: None)
+    if not updates:
+        return []
+    mods_dir = os.path.join(game_dir, "mods")
+    staging = os.path.join(game_dir, STAGING_DIR)
+    new_dir = os.path.join(staging, "new")
+    old_dir = os.path.join(staging, "old")
+    if os.path.isdir(old_dir) and os.listdir(old_dir):
+        raise ModUpdateError(f"An earlier update left original jars in {old_dir}, move them back to mods/ first")
+
+    targets = [u.new_filename for u in updates]
+    if len(set(targets)) != len(targets):
+        raise ModUpdateError("Several updates would install the same file")
+    replaced = {u.filename for u in updates}
+
+    def check_collisions():
+        taken = [name for name in targets if name not in replaced and os.path.lexists(os.path.join(mods_dir, name))]
+        if taken:
+            raise ModUpdateError(f"Updating would overwrite other installed jars: {', '.join(taken)}")
+
+    check_collisions()
+    shutil.rmtree(staging, ignore_errors=True)
+    os.makedirs(old_dir)
+    keep_staging = False
+
+    def on_file(done, total):
+        report(f"Downloading updates ({done}/{total})", int(done * 90 / total))
+
+    try:
+        tasks = [
+            DownloadTask(u.file["url"], os.path.join(new_dir, u.new_filename), u.file.get("hashes", {}).get("sha1"),
+                         u.file.get("size"))
+            for u in updates
+        ]
+        with Downloader(max_workers=max_workers, callback=on_file, store=store) as downloader:
+            downloader.download_all(tasks)
+
+        report("Replacing jars...", 95)
+        # A jar may have been added while the downloads ran
+        check_collisions()
+        moved_out = []
+        moved_in = []
+        try:
+            for u in updates:
+                os.replace(os.path.join(mods_dir, u.filename), os.path.join(old_dir, u.filename))
+                moved_out.append(u.filename)
+            for u in updates:
+                os.replace(os.path.join(new_dir, u.new_filename), os.path.join(mods_dir, u.new_filename))
+                moved_in.append(u.new_filename)
+        except OSError as e:
+            stuck = []
+            for name in reversed(moved_in):
+                try:
+                    os.replace(os.path.join(mods_dir, name), os.path.join(new_dir, name))
+                except OSError:
+                    stuck.append(name)
+            for name in reversed(moved_out):
+                try:
+                    os.replace(os.path.join(old_dir, name), os.path.join(mods_dir, name))
+                except OSError:
+                    stuck.append(name)
+            if stuck:
+                keep_staging = True
+                raise ModUpdateError(
+                    f"Could not replace the jars ({e}) nor undo it for {', '.join(stuck)}; "
+                    f"the original jars are in {old_dir}"
+                )
+            raise ModUpdateError(f"Could not replace the jars, nothing was changed: {e}")
+    finally:
+        if not keep_staging:
+            shutil.rmtree(staging, ignore_errors=True)
+
+    index = InstallIndex(game_dir)
+    for u in updates:
+        index.files.pop(f"mods/{u.filename}", None)
+        index.record(os.path.join(mods_dir, u.new_filename), u.file.get("hashes", {}).get("sha1"))
+    index.save()
+
+    entries = {m["filename"]: m for m in modpack.get("mods", [])}
+    for u in updates:
+        entry = entries.pop(u.filename, None) or {
+            "title": os.path.splitext(u.new_filename)[0],
+            "dependency": False,
+        }
+        entry.update({
+            "project_id": u.version["project_id"],
+            "version_id": u.version["id"],
+            "version_number": u.version.get("version_number"),
+            "filename": u.new_filename,
+            "sha1": u.file.get("hashes", {}).get("sha1"),
+        })
+        entries[u.new_filename] = entry
+    modpack["mods"] = sorted(entries.values(), key=lambda m: m["title"].lower())
+    report("Mods updated", 100)
+    return updates
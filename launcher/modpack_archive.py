@@ -0,0 +1,362 @@
+"""
+Import and export of instances as Modrinth .mrpack files or plain zips.
+
+Archives are never loaded into memory: entries are streamed to disk in
+CHUNK_SIZE pieces, files referenced by an .mrpack are fetched by the
+Downloader while the overrides are extracted, and export writes the
+archive in a single pass. Memory use does not grow with the pack size.
+"""
+import hashlib
+import json
+import os
+import re
+import shutil
+import threading
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import quote, urlparse
+
+from .downloader import Downloader, DownloadTask
+from .install_index import INDEX_FILE, InstallIndex
+from .snapshots import SKIP_FILES, shared_file
+
+CHUNK_SIZE = 1024 * 1024
+MRPACK_INDEX = "modrinth.index.json"
+# Applied in this order, client-overrides win
+OVERRIDE_DIRS = ("overrides/", "client-overrides/")
+# Hosts the .mrpack format allows downloads from
+MRPACK_HOSTS = ("cdn.modrinth.com", "github.com", "raw.githubusercontent.com", "gitlab.com")
+MODRINTH_CDN = "https://cdn.modrinth.com/data/{project_id}/versions/{version_id}/{filename}"
+MODRINTH_FILE_RE = re.compile(r"/data/([A-Za-z0-9]+)/versions/([A-Za-z0-9]+)/")
+# .mrpack dependency keys and the loader names the launcher uses
+LOADERS = {"fabric-loader": "Fabric", "forge": "Forge", "neoforge": "NeoForge", "quilt-loader": "Quilt"}
+INSTANCE_FILE = "instance.json"
+# Left out of exports: the install puts these back
+REINSTALLED_DIRS = ("assets", "libraries", "versions", "runtime", "natives", "logs", "crash-reports")
+# Already compressed, deflating them again only costs time
+STORED_SUFFIXES = (".jar", ".zip", ".png", ".jpg", ".ogg", ".mrpack")
+
+
+class PackError(Exception):
+    pass
+
+
+def _target(game_dir, rel):
+    """Absolute path for archive member `rel`, refusing anything outside `game_dir`."""
+    rel = rel.replace("\\", "/")
+    norm = os.path.normpath(rel)
+    if not rel or os.path.isabs(rel) or os.path.splitdrive(norm)[0] or norm == ".." or norm.startswith(".." + os.sep):
+        raise PackError(f"Unsafe path in archive: {rel}")
+    return os.path.join(game_dir, norm)
+
+
+def _mod_entry(path, sha1, url=None):
+    filename = os.path.basename(path)
+    match = MODRINTH_FILE_RE.search(urlparse(url).path) if url else None
+    return {
+        # Not a Modrinth download: key it by content so entries stay unique
+        "project_id": match.group(1) if match else f"sha1:{sha1}",
+        "version_id": match.group(2) if match else None,
+        "title": os.path.splitext(filename)[0],
+        "version_number": None,
+        "filename": filename,
+        "sha1": sha1,
+        "dependency": False,
+    }
+
+
+# -------------------------
+# Import
+# -------------------------
+class _Extractor:
+    """Streams zip members to disk, linking files the object store already has."""
+
+    def __init__(self, archive, game_dir, store=None):
+        self.archive = archive
+        self.game_dir = game_dir
+        self.store = store
+        self.files = 0
+        self.deduplicated = 0
+        self.deduplicated_bytes = 0
+
+    def stats(self, downloaded=0, linked=0):
+        # `linked`: referenced files the downloader took from the object store
+        return {"extracted": self.files, "downloaded": downloaded, "deduplicated": self.deduplicated + linked,
+                "deduplicated_bytes": self.deduplicated_bytes}
+
+    def extract(self, info, rel):
+        dest = _target(self.game_dir, rel)
+        os.makedirs(os.path.dirname(dest), exist_ok=True)
+        part = dest + ".part"
+        hasher = hashlib.sha1()
+        with self.archive.open(info) as src, open(part, "wb") as out:
+            for chunk in iter(lambda: src.read(CHUNK_SIZE), b""):
+                hasher.update(chunk)
+                out.write(chunk)
+        sha1 = hasher.hexdigest()
+        shared = shared_file(rel)
+        if os.path.lexists(dest):
+            os.remove(dest)
+        if self.store is not None and self.store.has(sha1):
+            # Same bytes as an object we already have: share it (configs
+            # get a reflink or a copy of their own, never a hardlink)
+            os.remove(part)
+            self.store.link(sha1, dest, cow=not shared)
+            self.deduplicated += 1
+            self.deduplicated_bytes += info.file_size
+        else:
+            os.replace(part, dest)
+            if self.store is not None and shared:
+                self.store.adopt(dest, sha1)
+        self.files += 1
+        return sha1
+
+
+def _members(archive, prefix=""):
+    """(ZipInfo, path relative to `prefix`) for the file members under `prefix`."""
+    for info in archive.infolist():
+        if not info.is_dir() and info.filename.startswith(prefix) and info.filename != prefix:
+            yield info, info.filename[len(prefix):]
+
+
+def _root_prefix(archive):
+    """'' or the single top-level folder an instance zip was packed with."""
+    names = archive.namelist()
+    if INSTANCE_FILE in names:
+        return ""
+    for name in names:
+        if name.count("/") == 1 and name.endswith("/" + INSTANCE_FILE):
+            return name[:-len(INSTANCE_FILE)]
+    return None
+
+
+def import_pack(path, game_dir, progress=None, store=None, max_workers=8, allowed_hosts=MRPACK_HOSTS):
+    """
+    Unpack an .mrpack or an instance zip made by `export_zip` into the new
+    game dir `game_dir`. Returns (instance manifest without an id, stats);
+    on failure the game dir is removed again.
+    """
+    report = progress or (lambda status, percent: None)
+    if os.path.exists(game_dir) and os.listdir(game_dir):
+        raise PackError(f"{game_dir} is not empty")
+    try:
+        with zipfile.ZipFile(path) as archive:
+            if MRPACK_INDEX in archive.namelist():
+                return _import_mrpack(archive, game_dir, report, store, max_workers, allowed_hosts)
+            prefix = _root_prefix(archive)
+            if prefix is None:
+                raise PackError(f"{os.path.basename(path)} has neither {MRPACK_INDEX} nor {INSTANCE_FILE}")
+            return _import_zip(archive, prefix, game_dir, report, store)
+    except zipfile.BadZipFile as e:
+        shutil.rmtree(game_dir, ignore_errors=True)
+        raise PackError(f"Not a zip archive: {e}")
+    except BaseException:
+        shutil.rmtree(game_dir, ignore_errors=True)
+        raise
+
+
+def _import_mrpack(archive, game_dir, report, store, max_workers, allowed_hosts):
+    with archive.open(MRPACK_INDEX) as f:
+        index = json.load(f)
+    if index.get("game") != "minecraft":
+        raise PackError(f"Unsupported .mrpack game: {index.get('game')}")
+    dependencies = index.get("dependencies", {})
+    if "minecraft" not in dependencies:
+        raise PackError("The .mrpack does not name a Minecraft version")
+    loader_key = next((key for key in LOADERS if key in dependencies), None)
+
+    tasks = []
+    mods = []
+    for file in index.get("files", []):
+        if file.get("env", {}).get("client") == "unsupported":
+            continue
+        urls = file.get("downloads") or []
+        sha1 = file.get("hashes", {}).get("sha1")
+        if not urls or not sha1:
+            raise PackError(f"{file.get('path')} has no download URL or SHA-1")
+        if allowed_hosts is not None and urlparse(urls[0]).hostname not in allowed_hosts:
+            raise PackError(f"{file['path']} would be downloaded from {urlparse(urls[0]).hostname}, which .mrpack files may not use")
+        dest = _target(game_dir, file["path"])
+        tasks.append(DownloadTask(urls[0], dest, sha1, file.get("fileSize")))
+        if file["path"].replace("\\", "/").startswith("mods/"):
+            mods.append(_mod_entry(dest, sha1, urls[0]))
+
+    os.makedirs(game_dir, exist_ok=True)
+    install_index = InstallIndex(game_dir)
+    lock = threading.Lock()
+    counts = {"downloaded": 0, "extracted": 0}
+    overrides = [(info, rel) for prefix in OVERRIDE_DIRS for info, rel in _members(archive, prefix)]
+    total = len(tasks) + len(overrides) or 1
+
+    def tick(kind, amount=1):
+        with lock:
+            counts[kind] += amount
+            done = counts["downloaded"] + counts["extracted"]
+        report(f"Importing ({counts['downloaded']}/{len(tasks)} downloaded, "
+               f"{counts['extracted']}/{len(overrides)} extracted)", int(done * 100 / total))
+
+    # Referenced files download in the background while the overrides are
+    # streamed out of the archive
+    downloaded = {"done": 0}
+
+    def on_file(done, _total):
+        tick("downloaded", done - downloaded["done"])
+        downloaded["done"] = done
+
+    extractor = _Extractor(archive, game_dir, store)
+    with ThreadPoolExecutor(max_workers=1) as background, \
+            Downloader(max_workers=max_workers, callback=on_file, index=install_index, store=store) as downloader:
+        downloads = background.submit(downloader.download_all, tasks)
+        try:
+            for info, rel in overrides:
+                sha1 = extractor.extract(info, rel)
+                if rel.startswith("mods/") and rel.lower().endswith(".jar"):
+                    mods.append(_mod_entry(rel, sha1))
+                tick("extracted")
+        except BaseException:
+            # The import is lost anyway: stop the downloads instead of
+            # waiting for them, and keep this error rather than theirs
+            downloader.cancel()
+            try:
+                downloads.result()
+            except Exception:
+                pass
+            raise
+        downloads.result()
+        fetched, linked = downloader.files_fetched, downloader.files_linked
+    install_index.save()
+
+    # Later copies of a jar (client-overrides) replace earlier entries
+    by_file = {mod["filename"]: mod for mod in mods}
+    report("Import finished", 100)
+    modpack = {
+        "name": index.get("name") or "Imported pack",
+        "version": dependencies["minecraft"],
+        "loader": LOADERS[loader_key] if loader_key else "Vanilla",
+        "loader_version": dependencies.get(loader_key) if loader_key else None,
+        "mods": sorted(by_file.values(), key=lambda m: m["title"].lower()),
+    }
+    return modpack, extractor.stats(downloaded=fetched, linked=linked)
+
+
+def _import_zip(archive, prefix, game_dir, report, store):
+    with archive.open(prefix + INSTANCE_FILE) as f:
+        modpack = json.load(f)
+    modpack.pop("id", None)
+    members = [(info, rel) for info, rel in _members(archive, prefix) if rel != INSTANCE_FILE]
+    os.makedirs(game_dir, exist_ok=True)
+    extractor = _Extractor(archive, game_dir, store)
+    for done, (info, rel) in enumerate(members, 1):
+        extractor.extract(info, rel)
+        report(f"Extracting ({done}/{len(members)})", int(done * 100 / len(members)))
+    report("Import finished", 100)
+    return modpack, extractor.stats()
+
+
+# -------------------------
+# Export
+# -------------------------
+def _walk(game_dir, skip_dirs):
+    """Relative paths of the files to export, sorted so archives are reproducible."""
+    found = []
+    for root, dirs, files in os.walk(game_dir):
+        rel_root = os.path.relpath(root, game_dir).replace(os.sep, "/")
+        rel_root = "" if rel_root == "." else rel_root + "/"
+        if not rel_root:
+            dirs[:] = [d for d in dirs if d not in skip_dirs]
+        for name in files:
+            rel = rel_root + name
+            if rel in SKIP_FILES or rel in (INDEX_FILE, INSTANCE_FILE) or name.endswith((".part", ".tmp")):
+                continue
+            found.append(rel)
+    return sorted(found)
+
+
+def _write_archive(dest, first, files, game_dir, prefix, report):
+    """Write `first` ({arcname: bytes}) then every file of `files` to `dest` in one pass."""
+    part = dest + ".part"
+    try:
+        with zipfile.ZipFile(part, "w", zipfile.ZIP_DEFLATED, compresslevel=6) as archive:
+            for name, data in first.items():
+                archive.writestr(name, data)
+            for done, rel in enumerate(files, 1):
+                compress = zipfile.ZIP_STORED if rel.lower().endswith(STORED_SUFFIXES) else zipfile.ZIP_DEFLATED
+                archive.write(os.path.join(game_dir, rel), prefix + rel, compress_type=compress)
+                report(f"Exporting ({done}/{len(files)})", int(done * 100 / len(files)))
+        os.replace(part, dest)
+    except BaseException:
+        if os.path.exists(part):
+            os.remove(part)
+        raise
+    report("Export finished", 100)
+
+
+def _hashes(path):
+    sha1 = hashlib.sha1()
+    sha512 = hashlib.sha512()
+    size = 0
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(CHUNK_SIZE), b""):
+            sha1.update(chunk)
+            sha512.update(chunk)
+            size += len(chunk)
+    return sha1.hexdigest(), sha512.hexdigest(), size
+
+
+def export_mrpack(modpack, game_dir, dest, include_saves=False, progress=None, max_workers=8):
+    """
+    Write `modpack` as a Modrinth .mrpack. Mods installed from Modrinth are
+    listed by URL and hash, everything else goes into overrides/.
+    """
+    report = progress or (lambda status, percent: None)
+    skip_dirs = REINSTALLED_DIRS + (() if include_saves else ("saves",))
+    files = _walk(game_dir, skip_dirs)
+
+    linked = {}
+    for mod in modpack.get("mods", []):
+        rel = f"mods/{mod['filename']}"
+        if mod.get("version_id") and not mod["project_id"].startswith("sha1:") and rel in files:
+            linked[rel] = mod
+    report("Hashing mods...", 0)
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        hashes = dict(zip(linked, pool.map(lambda rel: _hashes(os.path.join(game_dir, rel)), linked)))
+
+    index_files = []
+    for rel, mod in list(linked.items()):
+        sha1, sha512, size = hashes[rel]
+        if mod.get("sha1") and mod["sha1"] != sha1:
+            # Changed since it was downloaded: ship the local copy instead
+            del linked[rel]
+            continue
+        index_files.append({
+            "path": rel,
+            "hashes": {"sha1": sha1, "sha512": sha512},
+            "env": {"client": "required", "server": "required"},
+            "downloads": [MODRINTH_CDN.format(project_id=mod["project_id"], version_id=mod["version_id"],
+                                              filename=quote(mod["filename"]))],
+            "fileSize": size,
+        })
+
+    dependencies = {"minecraft": modpack["version"]}
+    loader_key = next((key for key, name in LOADERS.items() if name == modpack.get("loader")), None)
+    if loader_key and modpack.get("loader_version"):
+        dependencies[loader_key] = modpack["loader_version"]
+    index = {
+        "formatVersion": 1,
+        "game": "minecraft",
+        "versionId": modpack.get("pack_version", "1.0.0"),
+        "name": modpack["name"],
+        "files": index_files,
+        "dependencies": dependencies,
+    }
+    overrides = [rel for rel in files if rel not in linked]
+    _write_archive(dest, {MRPACK_INDEX: json.dumps(index, indent=2)}, overrides, game_dir, "overrides/", report)
+
+
+def export_zip(modpack, game_dir, dest, include_saves=False, progress=None):
+    """Write the instance, mods and configs included, as a self-contained zip."""
+    report = progress or (lambda status, percent: None)
+    skip_dirs = REINSTALLED_DIRS + (() if include_saves else ("saves",))
+    manifest = {key: value for key, value in modpack.items() if key != "id"}
+    _write_archive(dest, {INSTANCE_FILE: json.dumps(manifest, indent=4)}, _walk(game_dir, skip_dirs), game_dir, "",
+                   report)
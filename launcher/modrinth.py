@@ -0,0 +1,180 @@
+import hashlib
+import json
+import os
+import threading
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+
+# Overridable so the launcher can be pointed at a local fake server
+API_URL = os.environ.get("MOLTEN_MODRINTH_URL", "https://api.modrinth.com/v2")
+USER_AGENT = "MoltenLauncher (github.com/akramelmhamdi-star/Molten-Launcher)"
+
+
+class RequestCancelled(Exception):
+    pass
+
+
+class CancelToken:
+    """Cancels a request from another thread, closing its connection if it is in flight."""
+
+    def __init__(self):
+        self.cancelled = False
+        self._response = None
+        self._lock = threading.Lock()
+
+    def cancel(self):
+        with self._lock:
+            self.cancelled = True
+            response = self._response
+        if response is not None:
+            response.close()
+
+    def attach(self, response):
+        with self._lock:
+            self._response = response
+            cancelled = self.cancelled
+        if cancelled:
+            response.close()
+            raise RequestCancelled()
+
+    def check(self):
+        if self.cancelled:
+            raise RequestCancelled()
+
+
+class ResponseCache:
+    """JSON response cache on disk, one file per URL, with ETag and fetch time."""
+
+    def __init__(self, cache_dir):
+        self.cache_dir = cache_dir
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def _path(self, key):
+        return os.path.join(self.cache_dir, hashlib.sha1(key.encode()).hexdigest() + ".json")
+
+    def get(self, key):
+        try:
+            with open(self._path(key), "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def put(self, key, entry):
+        path = self._path(key)
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(entry, f)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            print(f"Error writing Modrinth cache: {e}")
+
+
+class ModrinthClient:
+    """
+    Thread-safe Modrinth API client.
+
+    One pooled session is reused for every request. GET responses are cached
+    on disk: entries younger than `ttl` seconds are served without touching
+    the network, older ones are revalidated with If-None-Match, and a stale
+    entry is still returned if the network is down.
+    """
+
+    def __init__(self, base_url=API_URL, cache_dir=None, ttl=600, timeout=10, pool_size=8):
+        self.base_url = base_url.rstrip("/")
+        self.ttl = ttl
+        self.timeout = timeout
+        self.cache = ResponseCache(cache_dir) if cache_dir else None
+        self.session = requests.Session()
+        self.session.headers["User-Agent"] = USER_AGENT
+        adapter = HTTPAdapter(pool_connections=2, pool_maxsize=pool_size)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+    # -------------------------
+    # Transport
+    # -------------------------
+    def get(self, path, params=None, ttl=None, cancel=None, cache=True):
+        url = self.base_url + path
+        key = url + "?" + json.dumps(params or {}, sort_keys=True)
+        ttl = self.ttl if ttl is None else ttl
+        entry = self.cache.get(key) if self.cache and cache else None
+        if entry and time.time() - entry["fetched"] < ttl:
+            return entry["body"]
+
+        headers = {}
+        if entry and entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+
+        try:
+            if cancel:
+                cancel.check()
+            resp = self.session.get(url, params=params, headers=headers, timeout=self.timeout, stream=True)
+            with resp:
+                if cancel:
+                    cancel.attach(resp)
+                if resp.status_code == 304 and entry:
+                    entry["fetched"] = time.time()
+                    self.cache.put(key, entry)
+                    return entry["body"]
+                resp.raise_for_status()
+                body = resp.json()
+        except RequestCancelled:
+            raise
+        except requests.RequestException:
+            if cancel and cancel.cancelled:
+                raise RequestCancelled()
+            if entry:
+                # Offline or API trouble: a stale answer beats none
+                return entry["body"]
+            raise
+
+        if self.cache and cache:
+            self.cache.put(key, {"etag": resp.headers.get("ETag"), "fetched": time.time(), "body": body})
+        return body
+
+    def post(self, path, payload, cancel=None):
+        if cancel:
+            cancel.check()
+        resp = self.session.post(self.base_url + path, json=payload, timeout=self.timeout)
+        resp.raise_for_status()
+        return resp.json()
+
+    # -------------------------
+    # API
+    # -------------------------
+    def search(self, query, offset=0, limit=20, facets=None, index=None, cancel=None, cache=True):
+        params = {"query": query, "offset": offset, "limit": limit}
+        if facets:
+            params["facets"] = json.dumps(facets)
+        if index:
+            params["index"] = index
+        return self.get("/search", params, cancel=cancel, cache=cache)
+
+    def project(self, project_id, cancel=None):
+        return self.get(f"/project/{project_id}", cancel=cancel)
+
+    def projects(self, project_ids, cancel=None):
+        return self.get("/projects", {"ids": json.dumps(sorted(project_ids))}, cancel=cancel)
+
+    def project_versions(self, project_id, loaders=None, game_versions=None, cancel=None):
+        params = {}
+        if loaders:
+            params["loaders"] = json.dumps(loaders)
+        if game_versions:
+            params["game_versions"] = json.dumps(game_versions)
+        return self.get(f"/project/{project_id}/version", params, cancel=cancel)
+
+    def versions(self, version_ids, cancel=None):
+        return self.get("/versions", {"ids": json.dumps(sorted(version_ids))}, cancel=cancel)
+
+    def latest_versions(self, hashes, loaders=None, game_versions=None, algorithm="sha1", cancel=None):
+        """{hash: newest compatible version} for installed files, one POST for all of `hashes`."""
+        payload = {"hashes": sorted(hashes), "algorithm": algorithm}
+        if loaders:
+            payload["loaders"] = loaders
+        if game_versions:
+            payload["game_versions"] = game_versions
+        return self.post("/version_files/update", payload, cancel=cancel)
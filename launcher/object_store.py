@@ -0,0 +1,176 @@
+import os
+import shutil
+import sys
+import threading
+import time
+
+from .downloader import sha1_file
+from .install_index import InstallIndex
+
+# Linux FICLONE ioctl: share extents on btrfs/xfs/bcachefs (copy-on-write)
+FICLONE = 0x40049409
+# Objects younger than this are never collected: an install still running
+# (here or in another launcher process) has not saved its index yet
+GC_GRACE_SECONDS = 3600
+
+
+class ObjectStore:
+    """
+    Content-addressed file store shared by every game dir.
+
+    Objects live at `<root>/objects/<sha1[:2]>/<sha1>`, the same layout the
+    asset index uses. Game dirs never own a private copy: immutable files
+    (assets, libraries, jars) are hardlinked or symlinked, files that may be
+    edited in place are reflinked, and only when none of that is possible
+    is a plain copy made. A new instance costs directory entries, not bytes.
+    """
+
+    def __init__(self, root):
+        self.root = root
+        self.objects_dir = os.path.join(root, "objects")
+        os.makedirs(self.objects_dir, exist_ok=True)
+
+    def path_for(self, sha1):
+        return os.path.join(self.objects_dir, sha1[:2], sha1)
+
+    def has(self, sha1):
+        return os.path.isfile(self.path_for(sha1))
+
+    # -------------------------
+    # Adding and linking
+    # -------------------------
+    def adopt(self, path, sha1=None):
+        """Put an already verified file into the store without copying it if possible."""
+        if sha1 is None:
+            sha1 = sha1_file(path)
+        target = self.path_for(sha1)
+        if not os.path.exists(target):
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            # Unique per thread: concurrent installs may adopt the same object
+            tmp = f"{target}.{os.getpid()}.{threading.get_ident()}.tmp"
+            try:
+                _place(path, tmp, allow_symlink=False)
+                os.replace(tmp, target)
+            except OSError:
+                if os.path.exists(tmp):
+                    os.remove(tmp)
+                raise
+        return sha1
+
+    def link(self, sha1, dest, cow=False, allow_symlink=True):
+        """
+        Materialize object `sha1` at `dest` and return the method used.
+        With `cow=True` the result must be safe to modify in place, so only
+        a reflink or a copy is used. With `allow_symlink=False` a failed
+        hardlink (store on another drive) falls back to a copy.
+        """
+        os.makedirs(os.path.dirname(dest), exist_ok=True)
+        if os.path.lexists(dest):
+            os.remove(dest)
+        return _place(self.path_for(sha1), dest, cow=cow, allow_symlink=allow_symlink)
+
+    def link_dir(self, src, dest):
+        """Point `dest` at a shared directory (e.g. Java runtimes) with a symlink."""
+        if os.path.lexists(dest):
+            return os.path.realpath(dest) == os.path.realpath(src)
+        os.makedirs(os.path.dirname(dest), exist_ok=True)
+        try:
+            os.symlink(os.path.abspath(src), dest, target_is_directory=True)
+            return True
+        except OSError:
+            return False
+
+    # -------------------------
+    # Garbage collection
+    # -------------------------
+    def gc(self, game_dirs, dry_run=False):
+        """
+        Delete objects that no game dir references. References come from the
+        SHA-1s recorded in each game dir's InstallIndex. Objects added or
+        linked within GC_GRACE_SECONDS are kept, since the index of an
+        install in progress is only saved when it finishes.
+        Returns (removed_count, freed_bytes).
+        """
+        cutoff = time.time() - GC_GRACE_SECONDS
+        referenced = set()
+        for directory in game_dirs:
+            if os.path.isdir(directory):
+                referenced.update(entry["sha1"] for entry in InstallIndex(directory).files.values())
+
+        removed = 0
+        freed = 0
+        for sub in os.listdir(self.objects_dir):
+            sub_dir = os.path.join(self.objects_dir, sub)
+            if not os.path.isdir(sub_dir):
+                continue
+            for name in os.listdir(sub_dir):
+                if name in referenced:
+                    continue
+                path = os.path.join(sub_dir, name)
+                st = os.stat(path)
+                # A hardlink count above 1 means some dir still uses the
+                # object even though it is missing from every index
+                if st.st_nlink > 1:
+                    continue
+                # ctime changes when the object is created, renamed into
+                # place or linked; copies keep the source's mtime
+                if max(st.st_mtime, st.st_ctime) > cutoff:
+                    continue
+                if not dry_run:
+                    os.remove(path)
+                removed += 1
+                freed += st.st_size
+            if not dry_run and not os.listdir(sub_dir):
+                os.rmdir(sub_dir)
+        return removed, freed
+
+
+def clone_file(src, dest, shared=False):
+    """
+    Copy `src` to `dest` without duplicating bytes where possible and return
+    the method used. `shared=True` is for files that are only ever replaced,
+    never edited in place, and may be hardlinked; anything else is reflinked
+    so the first write copies, or copied outright. Times are kept either way
+    so install index fingerprints stay valid.
+    """
+    method = _place(src, dest, cow=not shared, allow_symlink=False)
+    if method == "reflink":
+        shutil.copystat(src, dest)
+    return method
+
+
+def _reflink(src, dest):
+    if not sys.platform.startswith("linux"):
+        return False
+    import fcntl
+    with open(src, "rb") as s, open(dest, "wb") as d:
+        try:
+            fcntl.ioctl(d.fileno(), FICLONE, s.fileno())
+            return True
+        except OSError:
+            pass
+    os.remove(dest)
+    return False
+
+
+def _place(src, dest, cow=False, allow_symlink=True):
+    if cow:
+        try:
+            if _reflink(src, dest):
+                return "reflink"
+        except OSError:
+            pass
+    else:
+        try:
+            os.link(src, dest)
+            return "hardlink"
+        except OSError:
+            pass
+        if allow_symlink:
+            try:
+                os.symlink(os.path.abspath(src), dest)
+                return "symlink"
+            except OSError:
+                pass
+    shutil.copy2(src, dest)
+    return "copy"
@@ -0,0 +1,167 @@
+import os
+import threading
+import time
+
+from . import heavy_import_lock
+from .downloader import DownloadError
+from .install_index import InstallIndex
+
+# Background installs share this budget, leaving headroom on slow links
+PREFETCH_BYTES_PER_SEC = 2 * 1024 * 1024
+PREFETCH_WORKERS = 6
+
+
+class RateLimiter:
+    """Token bucket shared by every thread that calls `consume`."""
+
+    def __init__(self, rate, burst=None):
+        self.rate = rate
+        self.burst = burst or rate
+        self._tokens = self.burst
+        self._last = time.monotonic()
+        self._lock = threading.Lock()
+
+    def consume(self, amount):
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._last) * self.rate)
+            self._last = now
+            self._tokens -= amount
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0
+        if wait:
+            time.sleep(wait)
+
+
+def _set_priority(nice):
+    # Per thread on Linux; elsewhere this is a best-effort no-op. Going
+    # back to 0 usually needs privileges (RLIMIT_NICE)
+    try:
+        os.setpriority(os.PRIO_PROCESS, threading.get_native_id(), nice)
+    except (AttributeError, OSError):
+        pass
+
+
+class InstallJob:
+    """
+    Installs one version into one game dir on a background thread.
+
+    Until `boost` is called, downloads go through `limiter` and the
+    download threads run at low CPU priority. Each one lowers its own
+    priority, and only while the job is not boosted; the install thread
+    keeps normal priority, so threads it starts later do not inherit a low
+    one. A launch that needs the same install attaches with `add_listener`
+    + `boost` + `wait` instead of starting over. `cancel` stops a job that
+    is no longer wanted.
+    """
+
+    def __init__(self, version, directory, limiter=None, max_workers=PREFETCH_WORKERS, **install_args):
+        self.version = version
+        self.directory = directory
+        self.limiter = limiter
+        self.max_workers = max_workers
+        self.install_args = install_args
+        self.boosted = False
+        self._cancelled = threading.Event()
+        # Native ids of the download threads running at low priority
+        self._lowered = set()
+        self.error = None
+        self.status = ("Queued", 0)
+        self._listeners = []
+        self._lock = threading.Lock()
+        self._thread = threading.Thread(target=self._run, daemon=True, name=f"prefetch-{version}")
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    @property
+    def running(self):
+        return self._thread.is_alive()
+
+    @property
+    def succeeded(self):
+        return not self._thread.is_alive() and self._thread.ident is not None and self.error is None
+
+    @property
+    def cancelled(self):
+        return self._cancelled.is_set()
+
+    def boost(self):
+        """Lift the rate limit and the low priority, e.g. because the user is now waiting for this install."""
+        self.boosted = True
+
+    def cancel(self):
+        """Stop the install soon, unless a launch has boosted it and is waiting for it."""
+        if not self.boosted:
+            self._cancelled.set()
+
+    def _adjust_priority(self):
+        tid = threading.get_native_id()
+        if not self.boosted:
+            if tid not in self._lowered:
+                self._lowered.add(tid)
+                _set_priority(10)
+        elif tid in self._lowered:
+            # Best effort: without privileges the thread stays low until
+            # its pool finishes, but no thread is lowered after the boost
+            self._lowered.discard(tid)
+            _set_priority(0)
+
+    def add_listener(self, listener):
+        """Call `listener(status, percent)` on progress, starting with the latest status."""
+        with self._lock:
+            self._listeners.append(listener)
+            status = self.status
+        listener(*status)
+
+    def remove_listener(self, listener):
+        with self._lock:
+            if listener in self._listeners:
+                self._listeners.remove(listener)
+
+    def wait(self, timeout=None):
+        self._thread.join(timeout)
+        if self.error is not None:
+            raise self.error
+
+    def _report(self, status, percent):
+        with self._lock:
+            self.status = (status, percent)
+            listeners = list(self._listeners)
+        for listener in listeners:
+            listener(status, percent)
+
+    def _throttle(self, amount):
+        # Called on the download threads for every chunk
+        self._adjust_priority()
+        if self.limiter is not None and not self.boosted:
+            self.limiter.consume(amount)
+
+    def _run(self):
+        try:
+            # Imported on this thread: the install code pulls in
+            # minecraft_launcher_lib, which the GUI does not need at startup
+            with heavy_import_lock:
+                from .install import install_lock, install_version
+
+            # Held from the index check on, so the index is not stale when
+            # another install of this game dir finishes first
+            with install_lock(self.directory):
+                if self._cancelled.is_set():
+                    raise DownloadError("Cancelled")
+                index = InstallIndex(self.directory)
+                if index.is_version_ready(self.version):
+                    self._report("Ready to play", 100)
+                    return
+                self._report(f"Preparing {self.version}...", 0)
+                install_version(
+                    self.version, self.directory, progress=self._report, max_workers=self.max_workers,
+                    index=index, throttle=self._throttle, cancelled=self._cancelled, **self.install_args
+                )
+            self._report("Ready to play", 100)
+        except Exception as e:
+            self.error = e
+            if self._cancelled.is_set():
+                self._report("Background install cancelled", 0)
+            else:
+                self._report(f"Background install failed: {e}", 0)
@@ -0,0 +1,255 @@
+import gzip
+import json
+import os
+import re
+import shutil
+import threading
+import time
+
+from .supervisor import sample_process
+
+INDEX_EVERY = 256
+MAX_PART_BYTES = 8 * 1024 * 1024
+# Unwritten lines are flushed at least this often, so a launcher crash
+# loses little of the log
+FLUSH_SECONDS = 1.0
+
+
+class SessionLog:
+    """
+    Streams one game session to `<logs_dir>/session-<id>.<part>.log`.
+
+    A part is rotated once it reaches `max_bytes`. Every INDEX_EVERY lines a
+    checkpoint (line number, byte offset, wall clock time) is recorded so
+    searches and time-range reads can skip straight to the right part and
+    offset. The index, `session-<id>.json`, is written when the session
+    opens and rewritten at every rotation and checkpoint, so a session
+    survives a launcher crash; `recover_sessions` finishes such sessions.
+    On close every part is gzip-compressed.
+    """
+
+    def __init__(self, logs_dir, meta=None, max_bytes=MAX_PART_BYTES):
+        os.makedirs(logs_dir, exist_ok=True)
+        self.logs_dir = logs_dir
+        self.max_bytes = max_bytes
+        # Several sessions may start within the same second. Creating the
+        # index exclusively reserves the id, whether the other session is
+        # still open or already closed (and gzipped)
+        stamp = time.strftime("%Y%m%d-%H%M%S")
+        suffix = 1
+        while True:
+            self.session_id = stamp if suffix == 1 else f"{stamp}-{suffix}"
+            self.index_path = os.path.join(logs_dir, f"session-{self.session_id}.json")
+            try:
+                os.close(os.open(self.index_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY))
+                break
+            except FileExistsError:
+                suffix += 1
+        self.meta = dict(meta or {})
+        self.meta["started"] = time.time()
+        self.meta["launcher_pid"] = os.getpid()
+        self.parts = []
+        self.lines = 0
+        self._lock = threading.Lock()
+        self._file = None
+        self._offset = 0
+        self._flushed = time.monotonic()
+        self._open_part()
+        self._write_index()
+
+    def _open_part(self):
+        name = f"session-{self.session_id}.{len(self.parts)}.log"
+        self._file = open(os.path.join(self.logs_dir, name), "wb")
+        self._offset = 0
+        now = time.time()
+        self.parts.append({
+            "file": name, "first_line": self.lines, "lines": 0,
+            "start": now, "end": now, "checkpoints": [[self.lines, 0, now]],
+        })
+
+    def write(self, stream, line):
+        data = (f"[STDERR] {line}\n" if stream == "stderr" else f"{line}\n").encode("utf-8", "replace")
+        with self._lock:
+            if self._file is None:
+                return
+            if self._offset and self._offset + len(data) > self.max_bytes:
+                self._file.close()
+                self.parts[-1]["end"] = time.time()
+                self._open_part()
+                self._write_index()
+            part = self.parts[-1]
+            if self.lines and self.lines % INDEX_EVERY == 0:
+                now = time.time()
+                part["checkpoints"].append([self.lines, self._offset, now])
+                part["end"] = now
+                # The index must never point past what is on disk
+                self._file.flush()
+                self._write_index()
+            self._file.write(data)
+            if time.monotonic() - self._flushed >= FLUSH_SECONDS:
+                self._file.flush()
+                self._flushed = time.monotonic()
+            self._offset += len(data)
+            self.lines += 1
+            part["lines"] += 1
+
+    def _index(self):
+        return {"id": self.session_id, "meta": self.meta, "lines": self.lines, "parts": self.parts}
+
+    def _write_index(self):
+        try:
+            _write_index(self.index_path, self._index())
+        except OSError as e:
+            print(f"Error writing session index {self.index_path}: {e}")
+
+    def close(self, compress=True):
+        with self._lock:
+            if self._file is None:
+                return
+            self._file.close()
+            self._file = None
+            now = time.time()
+            self.parts[-1]["end"] = now
+            for part, following in zip(self.parts, self.parts[1:]):
+                part["end"] = following["start"]
+            self.meta["ended"] = now
+        _finish(self.logs_dir, self.index_path, self._index(), compress)
+        # Sessions of a launcher that crashed are finished by the next one
+        recover_sessions(self.logs_dir)
+
+
+def _write_index(path, index):
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(index, f)
+    os.replace(tmp_path, path)
+
+
+def _finish(logs_dir, index_path, index, compress=True):
+    if compress:
+        for part in index["parts"]:
+            if part["file"].endswith(".gz"):
+                continue
+            path = os.path.join(logs_dir, part["file"])
+            with open(path, "rb") as src, gzip.open(path + ".gz", "wb") as dst:
+                shutil.copyfileobj(src, dst)
+            os.remove(path)
+            part["file"] += ".gz"
+    _write_index(index_path, index)
+
+
+def recover_sessions(logs_dir):
+    """
+    Finish sessions left open by a launcher that is no longer running:
+    count the lines written after the last checkpoint, mark the session
+    as ended where its log stops and compress it. Returns their ids.
+    """
+    recovered = []
+    for session in list_sessions(logs_dir):
+        meta = session["meta"]
+        pid = meta.get("launcher_pid")
+        if "ended" in meta or pid is None or pid == os.getpid() or sample_process(pid) is not None:
+            continue
+        part = session["parts"][-1]
+        path = os.path.join(logs_dir, part["file"])
+        try:
+            cp_line, cp_offset, _ = part["checkpoints"][-1]
+            with open(path, "rb") as f:
+                f.seek(cp_offset)
+                tail = sum(1 for _ in f)
+            part["lines"] = cp_line - part["first_line"] + tail
+            session["lines"] = cp_line + tail
+            part["end"] = max(part["end"], os.path.getmtime(path))
+            meta["ended"] = part["end"]
+            meta["unclean"] = True
+            _finish(logs_dir, os.path.join(logs_dir, f"session-{session['id']}.json"), session)
+            recovered.append(session["id"])
+        except (OSError, IndexError, ValueError) as e:
+            print(f"Error recovering session {session['id']}: {e}")
+    return recovered
+
+
+# -------------------------
+# Reading past sessions
+# -------------------------
+def list_sessions(logs_dir):
+    """Return session indexes, newest first."""
+    sessions = []
+    if not os.path.isdir(logs_dir):
+        return sessions
+    for name in os.listdir(logs_dir):
+        if name.startswith("session-") and name.endswith(".json"):
+            try:
+                with open(os.path.join(logs_dir, name), "r") as f:
+                    text = f.read()
+                if text:  # Empty: a session reserving its id right now
+                    sessions.append(json.loads(text))
+            except Exception as e:
+                print(f"Error reading session index {name}: {e}")
+    sessions.sort(key=lambda s: s["meta"].get("started", 0), reverse=True)
+    return sessions
+
+
+def _open_part(logs_dir, part):
+    path = os.path.join(logs_dir, part["file"])
+    if path.endswith(".gz"):
+        return gzip.open(path, "rb")
+    return open(path, "rb")
+
+
+def _overlaps(item_start, item_end, start, end):
+    return (start is None or item_end >= start) and (end is None or item_start <= end)
+
+
+def iter_lines(logs_dir, session, start=None, end=None):
+    """
+    Yield (line_number, text) for a session, limited to lines written
+    between `start` and `end` (epoch seconds). Lines carry no timestamps,
+    so the range is applied at checkpoint granularity: up to INDEX_EVERY
+    lines before `start` and after `end` are included. Parts outside the
+    range are never opened and the checkpoints are used to seek inside a
+    part.
+    """
+    parts = session["parts"]
+    for i, part in enumerate(parts):
+        # An open session's last part is still being written
+        part_end = time.time() if "ended" not in session["meta"] and i == len(parts) - 1 else part["end"]
+        if not _overlaps(part["start"], part_end, start, end):
+            continue
+        line_no, offset = part["first_line"], 0
+        if start is not None:
+            for cp_line, cp_offset, cp_time in part["checkpoints"]:
+                if cp_time > start:
+                    break
+                line_no, offset = cp_line, cp_offset
+        stop_at = None
+        if end is not None:
+            stop_at = next((cp[0] for cp in part["checkpoints"] if cp[2] > end), None)
+        with _open_part(logs_dir, part) as f:
+            f.seek(offset)
+            for raw in f:
+                if line_no == stop_at:
+                    return
+                yield line_no, raw.decode("utf-8", "replace").rstrip("\n")
+                line_no += 1
+
+
+def search_sessions(logs_dir, pattern, start=None, end=None, limit=1000, session_ids=None):
+    """
+    Case-insensitive search across past sessions, newest first.
+    Returns a list of (session_id, line_number, text).
+    """
+    regex = re.compile(re.escape(pattern), re.IGNORECASE) if pattern else None
+    results = []
+    for session in list_sessions(logs_dir):
+        if session_ids is not None and session["id"] not in session_ids:
+            continue
+        meta = session["meta"]
+        if not _overlaps(meta.get("started", 0), meta.get("ended", time.time()), start, end):
+            continue
+        for line_no, text in iter_lines(logs_dir, session, start, end):
+            if regex is None or regex.search(text):
+                results.append((session["id"], line_no, text))
+                if len(results) >= limit:
+                    return results
+    return results
@@ -0,0 +1,155 @@
+import json
+import os
+import shutil
+import time
+import uuid
+
+from .command_cache import CACHE_FILE
+from .object_store import clone_file
+
+SNAPSHOT_FILE = "snapshot.json"
+# Replaced as a whole by the launcher (downloads, mod updates), never
+# edited in place, so clones may share the inode
+SHARED_SUFFIXES = (".jar", ".zip", ".litemod", ".dll", ".so", ".dylib", ".jnilib")
+# Resolved commands hold absolute paths into the source dir
+SKIP_FILES = {CACHE_FILE}
+
+
+def shared_file(rel):
+    return rel.lower().endswith(SHARED_SUFFIXES) or rel.startswith("assets/objects/")
+
+
+def clone_tree(src, dest, skip_dirs=()):
+    """
+    Recreate game dir `src` at `dest` with copy-on-write semantics.
+
+    Jars, archives, natives and asset objects are hardlinked: the launcher
+    only ever replaces them, which leaves the other tree's copy alone. Other
+    files (configs, worlds, manifests) are reflinked where the filesystem
+    supports it and copied otherwise. Symlinks, such as shared Java
+    runtimes, are recreated as symlinks. `skip_dirs` are top-level dirs to
+    leave out. Returns counts per method and the bytes actually copied.
+    """
+    stats = {"hardlink": 0, "reflink": 0, "copy": 0, "symlink": 0, "copied_bytes": 0}
+    os.makedirs(dest)
+    pending = [""]
+    while pending:
+        rel_dir = pending.pop()
+        with os.scandir(os.path.join(src, rel_dir)) as entries:
+            for entry in entries:
+                rel = f"{rel_dir}/{entry.name}" if rel_dir else entry.name
+                target = os.path.join(dest, rel)
+                if not rel_dir and (entry.name in SKIP_FILES or entry.name in skip_dirs):
+                    continue
+                if entry.is_symlink():
+                    try:
+                        os.symlink(os.readlink(entry.path), target, target_is_directory=entry.is_dir())
+                        stats["symlink"] += 1
+                        continue
+                    except OSError:
+                        # No symlink rights (Windows without developer mode):
+                        # fall through and clone what it points at
+                        pass
+                if entry.is_dir():
+                    os.makedirs(target, exist_ok=True)
+                    pending.append(rel)
+                    continue
+                method = clone_file(entry.path, target, shared=shared_file(rel))
+                stats[method] += 1
+                if method == "copy":
+                    stats["copied_bytes"] += entry.stat().st_size
+    return stats
+
+
+def describe(stats):
+    """One line summary of `clone_tree` stats."""
+    shared = stats["hardlink"] + stats["reflink"] + stats["symlink"]
+    return f"{shared} files shared, {stats['copy']} copied ({stats['copied_bytes'] / 1024 / 1024:.1f} MB)"
+
+
+def replace_tree(src, dest):
+    """Clone `src` over game dir `dest`, swapping the result in with renames."""
+    incoming = f"{dest}.restoring"
+    outgoing = f"{dest}.replaced"
+    for leftover in (incoming, outgoing):
+        if os.path.lexists(leftover):
+            shutil.rmtree(leftover)
+    stats = clone_tree(src, incoming)
+    os.replace(dest, outgoing)
+    try:
+        os.replace(incoming, dest)
+    except OSError:
+        os.replace(outgoing, dest)
+        raise
+    shutil.rmtree(outgoing, ignore_errors=True)
+    return stats
+
+
+class SnapshotStore:
+    """
+    Point-in-time copies of instance game dirs, made with `clone_tree`.
+
+    Snapshots live at `<root>/<instance id>/<snapshot id>/` with a
+    snapshot.json next to the cloned `files/` dir. Jars and assets are
+    hardlinks, so a snapshot costs little more than the instance's configs
+    and worlds, and the object store's garbage collection leaves the
+    objects it shares alone (their link count stays above 1).
+    """
+
+    def __init__(self, root):
+        self.root = root
+
+    def _dir(self, instance_id, snapshot_id=""):
+        return os.path.join(self.root, instance_id, snapshot_id)
+
+    def list(self, instance_id):
+        """Snapshot metadata for an instance, newest first."""
+        found = []
+        base = self._dir(instance_id)
+        if not os.path.isdir(base):
+            return found
+        for name in os.listdir(base):
+            try:
+                with open(os.path.join(base, name, SNAPSHOT_FILE), "r") as f:
+                    found.append(json.load(f))
+            except (OSError, ValueError):
+                continue
+        return sorted(found, key=lambda meta: meta["created"], reverse=True)
+
+    def game_dirs(self):
+        """The cloned game dirs of every snapshot, e.g. as object store GC roots."""
+        found = []
+        if not os.path.isdir(self.root):
+            return found
+        for instance_id in os.listdir(self.root):
+            base = self._dir(instance_id)
+            if not os.path.isdir(base):
+                continue
+            for snapshot_id in os.listdir(base):
+                files = os.path.join(base, snapshot_id, "files")
+                if os.path.isdir(files):
+                    found.append(files)
+        return found
+
+    def create(self, instance_id, game_dir, label=""):
+        created = time.time()
+        snapshot_id = f"{time.strftime('%Y%m%d-%H%M%S', time.localtime(created))}-{uuid.uuid4().hex[:6]}"
+        target = self._dir(instance_id, snapshot_id)
+        try:
+            stats = clone_tree(game_dir, os.path.join(target, "files"))
+        except BaseException:
+            shutil.rmtree(target, ignore_errors=True)
+            raise
+        meta = {"id": snapshot_id, "label": label, "created": created, "stats": stats}
+        with open(os.path.join(target, SNAPSHOT_FILE), "w") as f:
+            json.dump(meta, f, indent=4)
+        return meta
+
+    def restore(self, instance_id, snapshot_id, game_dir):
+        files = os.path.join(self._dir(instance_id, snapshot_id), "files")
+        if not os.path.isdir(files):
+            raise FileNotFoundError(f"No snapshot {snapshot_id} for this instance")
+        return replace_tree(files, game_dir)
+
+    def delete(self, instance_id, snapshot_id):
+        shutil.rmtree(self._dir(instance_id, snapshot_id))
@@ -0,0 +1,76 @@
+import builtins
+import contextlib
+import sys
+import time
+
+# Top-level packages whose first import (of them or a submodule) is timed in trace mode
+TRACED_PACKAGES = {"ui", "launcher", "app_state", "PySide6", "requests", "minecraft_launcher_lib", "sqlite3"}
+
+
+class StartupTrace:
+    """
+    Startup timing, enabled with --startup-trace or MOLTEN_STARTUP_TRACE=1.
+
+    `phase` times a named block (imports, window construction, a page built
+    on first use). While enabled, the first import of the modules in
+    TRACED_PACKAGES is timed as well, including everything it imports in
+    turn. `report` prints both to stderr. Disabled, every call is a no-op.
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self.start = time.perf_counter()
+        self.phases = []
+        self.imports = {}
+        self.reported = False
+        self._import = None
+
+    def enable(self):
+        if self.enabled:
+            return
+        self.enabled = True
+        self._import = builtins.__import__
+
+        def timed_import(name, globals=None, locals=None, fromlist=(), level=0):
+            if level or name in sys.modules or name.partition(".")[0] not in TRACED_PACKAGES:
+                return self._import(name, globals, locals, fromlist, level)
+            started = time.perf_counter()
+            try:
+                return self._import(name, globals, locals, fromlist, level)
+            finally:
+                self.imports.setdefault(name, time.perf_counter() - started)
+
+        builtins.__import__ = timed_import
+
+    @contextlib.contextmanager
+    def phase(self, name):
+        if not self.enabled:
+            yield
+            return
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - started
+            self.phases.append((name, started - self.start, elapsed))
+            if self.reported:
+                # Pages built after startup are reported as they happen
+                print(f"[startup] {name}: {elapsed * 1000:.1f} ms", file=sys.stderr)
+
+    def report(self, label="window shown"):
+        if not self.enabled or self.reported:
+            return
+        self.reported = True
+        total = time.perf_counter() - self.start
+        out = [f"[startup] {label} after {total * 1000:.1f} ms"]
+        for name, at, elapsed in self.phases:
+            out.append(f"[startup]   {name:<32} {elapsed * 1000:8.1f} ms  (at {at * 1000:.1f} ms)")
+        slowest = sorted(self.imports.items(), key=lambda item: item[1], reverse=True)[:10]
+        if slowest:
+            out.append("[startup] slowest first imports (including their own imports):")
+            for name, elapsed in slowest:
+                out.append(f"[startup]   {name:<32} {elapsed * 1000:8.1f} ms")
+        print("\n".join(out), file=sys.stderr, flush=True)
+
+
+trace = StartupTrace()
@@ -0,0 +1,238 @@
+import os
+import subprocess
+import threading
+import time
+
+SAMPLE_INTERVAL = 2.0
+KILL_TIMEOUT = 10
+
+
+class SupervisorError(Exception):
+    pass
+
+
+# -------------------------
+# Process sampling
+# -------------------------
+def _sample_proc(pid):
+    with open(f"/proc/{pid}/stat", "r") as f:
+        # The command name may contain spaces and parentheses
+        fields = f.read().rsplit(")", 1)[1].split()
+    ticks = os.sysconf("SC_CLK_TCK")
+    cpu = (int(fields[11]) + int(fields[12])) / ticks
+    return cpu, int(fields[21]) * os.sysconf("SC_PAGE_SIZE")
+
+
+def _sample_windows(pid):
+    import ctypes
+    from ctypes import wintypes
+
+    class MemoryCounters(ctypes.Structure):
+        _fields_ = [
+            ("cb", wintypes.DWORD), ("PageFaultCount", wintypes.DWORD),
+            ("PeakWorkingSetSize", ctypes.c_size_t), ("WorkingSetSize", ctypes.c_size_t),
+            ("QuotaPeakPagedPoolUsage", ctypes.c_size_t), ("QuotaPagedPoolUsage", ctypes.c_size_t),
+            ("QuotaPeakNonPagedPoolUsage", ctypes.c_size_t), ("QuotaNonPagedPoolUsage", ctypes.c_size_t),
+            ("PagefileUsage", ctypes.c_size_t), ("PeakPagefileUsage", ctypes.c_size_t),
+        ]
+
+    kernel32 = ctypes.windll.kernel32
+    handle = kernel32.OpenProcess(0x1000, False, pid)  # PROCESS_QUERY_LIMITED_INFORMATION
+    if not handle:
+        raise OSError(f"Cannot open process {pid}")
+    try:
+        times = [wintypes.FILETIME() for _ in range(4)]
+        if not kernel32.GetProcessTimes(handle, *[ctypes.byref(t) for t in times]):
+            raise OSError(f"Cannot read process times of {pid}")
+        kernel, user = [(t.dwHighDateTime << 32 | t.dwLowDateTime) / 1e7 for t in times[2:]]
+        counters = MemoryCounters()
+        counters.cb = ctypes.sizeof(MemoryCounters)
+        if not kernel32.K32GetProcessMemoryInfo(handle, ctypes.byref(counters), counters.cb):
+            raise OSError(f"Cannot read memory info of {pid}")
+        return kernel + user, counters.WorkingSetSize
+    finally:
+        kernel32.CloseHandle(handle)
+
+
+def _sample_ps(pid):
+    out = subprocess.run(
+        ["ps", "-o", "rss=,time=", "-p", str(pid)], capture_output=True, text=True, timeout=5
+    ).stdout.split()
+    if len(out) < 2:
+        raise OSError(f"No such process: {pid}")
+    # [[dd-]hh:]mm:ss[.ss]
+    days, _, clock = out[1].rpartition("-")
+    seconds = 0.0
+    for part in clock.split(":"):
+        seconds = seconds * 60 + float(part)
+    return seconds + int(days or 0) * 86400, int(out[0]) * 1024
+
+
+def sample_process(pid):
+    """(CPU seconds used so far, resident memory in bytes) of a process, or None."""
+    try:
+        if os.path.exists("/proc/self/stat"):
+            return _sample_proc(pid)
+        if os.name == "nt":
+            return _sample_windows(pid)
+        return _sample_ps(pid)
+    except (OSError, ValueError, IndexError, subprocess.SubprocessError):
+        return None
+
+
+# -------------------------
+# Supervisor
+# -------------------------
+class GameInstance:
+    """One supervised game process, keyed by its game dir."""
+
+    def __init__(self, key, name, heap_mb):
+        self.key = key
+        self.name = name
+        self.heap_mb = heap_mb
+        self.process = None
+        self.status = "starting"
+        self.started = time.time()
+        self.cpu_percent = 0.0
+        self.rss = 0
+        self.returncode = None
+        self.killed = False
+        self._cpu = None
+
+    @property
+    def pid(self):
+        return self.process.pid if self.process else None
+
+    def snapshot(self):
+        return {
+            "key": self.key, "name": self.name, "pid": self.pid, "status": self.status,
+            "heap_mb": self.heap_mb, "cpu_percent": self.cpu_percent, "rss": self.rss,
+            "started": self.started, "returncode": self.returncode,
+        }
+
+
+class Supervisor:
+    """
+    Keeps track of every running game process.
+
+    A launch first `reserve`s a slot for its game dir, which fails if that
+    dir is already in use or if the heaps of all running instances plus the
+    new one would exceed `max_total_ram_mb`. It then `attach`es the process
+    and `release`s the slot once the game has exited. While anything is
+    running, a sampler thread measures each process' CPU usage and resident
+    memory every `interval` seconds and hands snapshots to the listeners.
+    """
+
+    def __init__(self, max_total_ram_mb=None, interval=SAMPLE_INTERVAL):
+        self.max_total_ram_mb = max_total_ram_mb
+        self.interval = interval
+        self.instances = {}
+        self._listeners = []
+        self._lock = threading.Lock()
+        self._sampler = None
+
+    def add_listener(self, listener):
+        """Call `listener(snapshots)` from the sampler thread after every change."""
+        self._listeners.append(listener)
+
+    def _notify(self):
+        snapshots = self.snapshots()
+        for listener in list(self._listeners):
+            listener(snapshots)
+
+    def snapshots(self):
+        with self._lock:
+            return [instance.snapshot() for instance in self.instances.values()]
+
+    def committed_mb(self):
+        with self._lock:
+            return sum(i.heap_mb for i in self.instances.values())
+
+    def is_running(self, key):
+        with self._lock:
+            return key in self.instances
+
+    # -------------------------
+    # Lifecycle
+    # -------------------------
+    def reserve(self, key, name, heap_mb):
+        with self._lock:
+            if key in self.instances:
+                raise SupervisorError(f"{name} is already running")
+            committed = sum(i.heap_mb for i in self.instances.values())
+            if self.max_total_ram_mb and committed + heap_mb > self.max_total_ram_mb:
+                raise SupervisorError(
+                    f"Starting {name} would commit {committed + heap_mb} MB, "
+                    f"over the {self.max_total_ram_mb} MB limit for all instances"
+                )
+            instance = GameInstance(key, name, heap_mb)
+            self.instances[key] = instance
+        self._notify()
+        return instance
+
+    def attach(self, key, process):
+        with self._lock:
+            instance = self.instances[key]
+            instance.process = process
+            instance.status = "running"
+            if self._sampler is None or not self._sampler.is_alive():
+                self._sampler = threading.Thread(target=self._sample_loop, daemon=True, name="supervisor")
+                self._sampler.start()
+        self._notify()
+
+    def release(self, key):
+        with self._lock:
+            instance = self.instances.pop(key, None)
+            if instance is not None and instance.process is not None:
+                instance.returncode = instance.process.poll()
+        self._notify()
+        return instance
+
+    def kill(self, key, timeout=KILL_TIMEOUT):
+        """Ask a game to exit, force-killing it if it is still alive after `timeout` seconds."""
+        with self._lock:
+            instance = self.instances.get(key)
+            if instance is None or instance.process is None:
+                return False
+            instance.killed = True
+            instance.status = "stopping"
+            process = instance.process
+
+        def stop():
+            process.terminate()
+            try:
+                process.wait(timeout)
+            except subprocess.TimeoutExpired:
+                process.kill()
+
+        threading.Thread(target=stop, daemon=True).start()
+        self._notify()
+        return True
+
+    def kill_all(self):
+        for snapshot in self.snapshots():
+            self.kill(snapshot["key"])
+
+    # -------------------------
+    # Sampling
+    # -------------------------
+    def _sample_loop(self):
+        while True:
+            with self._lock:
+                running = [i for i in self.instances.values() if i.process is not None]
+                if not running:
+                    self._sampler = None
+                    return
+            now = time.monotonic()
+            for instance in running:
+                sample = sample_process(instance.pid)
+                if sample is None:
+                    continue
+                cpu, rss = sample
+                if instance._cpu is not None:
+                    last_cpu, last_time = instance._cpu
+                    instance.cpu_percent = max(0.0, (cpu - last_cpu) / max(now - last_time, 1e-6) * 100)
+                instance._cpu = (cpu, now)
+                instance.rss = rss
+            self._notify()
+            time.sleep(self.interval)
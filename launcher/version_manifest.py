@@ -0,0 +1,184 @@
+import bisect
+import json
+import os
+import threading
+import time
+
+VERSION_MANIFEST_URL = "https://launchermeta.mojang.com/mc/game/version_manifest_v2.json"
+LATEST_ALIASES = {"latest-release": "release", "latest-snapshot": "snapshot"}
+
+
+class VersionManifest:
+    """
+    Mojang's version manifest, cached on disk.
+
+    Lookups never touch the network: they answer from the copy on disk,
+    which is read on first use. `refresh` revalidates that copy with a
+    conditional request (If-None-Match / If-Modified-Since) once it is older
+    than `max_age`, and `refresh_async` does the same on a background
+    thread. Versions are indexed by id, by type (newest first) and by
+    release time.
+    """
+
+    def __init__(self, path, url=VERSION_MANIFEST_URL, max_age=3600, timeout=10):
+        self.path = path
+        self.url = url
+        self.max_age = max_age
+        self.timeout = timeout
+        self.latest = {}
+        self.by_id = {}
+        self.by_type = {}
+        self._entry = None
+        self._by_time = []
+        self._times = []
+        self._loaded = False
+        self._lock = threading.Lock()
+        self._refreshing = None
+
+    def _load(self):
+        with self._lock:
+            if self._loaded:
+                return
+            self._loaded = True
+            try:
+                with open(self.path, "r", encoding="utf-8") as f:
+                    self._index(json.load(f))
+            except FileNotFoundError:
+                pass
+            except (OSError, ValueError, KeyError) as e:
+                print(f"Error loading version manifest cache: {e}")
+
+    def _index(self, entry):
+        manifest = entry["manifest"]
+        by_time = sorted(manifest["versions"], key=lambda v: v["releaseTime"])
+        by_type = {}
+        for version in reversed(by_time):
+            by_type.setdefault(version["type"], []).append(version)
+        self.latest = manifest.get("latest", {})
+        self.by_id = {v["id"]: v for v in by_time}
+        self.by_type = by_type
+        self._by_time = by_time
+        self._times = [v["releaseTime"] for v in by_time]
+        self._entry = entry
+
+    def _save(self, entry):
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        tmp_path = f"{self.path}.{threading.get_ident()}.tmp"
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(entry, f)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            print(f"Error saving version manifest cache: {e}")
+
+    # -------------------------
+    # Refreshing
+    # -------------------------
+    def is_stale(self):
+        self._load()
+        return self._entry is None or time.time() - self._entry.get("fetched", 0) > self.max_age
+
+    def refresh(self, force=False):
+        """Revalidate the cached manifest, returning True if it changed."""
+        if not force and not self.is_stale():
+            return False
+        self._load()
+        entry = self._entry
+        headers = {}
+        if entry and entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry and entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+
+        import requests  # only needed once the cache is stale, off the GUI thread
+
+        resp = requests.get(self.url, headers=headers, timeout=self.timeout)
+        if resp.status_code == 304 and entry:
+            entry = dict(entry, fetched=time.time())
+            with self._lock:
+                self._entry = entry
+            self._save(entry)
+            return False
+        resp.raise_for_status()
+        entry = {
+            "etag": resp.headers.get("ETag"),
+            "last_modified": resp.headers.get("Last-Modified"),
+            "fetched": time.time(),
+            "manifest": resp.json(),
+        }
+        with self._lock:
+            self._index(entry)
+        self._save(entry)
+        return True
+
+    def refresh_async(self, callback=None):
+        """
+        Refresh on a daemon thread unless a refresh is already running.
+        `callback(changed)` is called from that thread.
+        """
+        with self._lock:
+            if self._refreshing is not None and self._refreshing.is_alive():
+                return
+
+            def run():
+                try:
+                    changed = self.refresh()
+                except Exception as e:
+                    print(f"Error refreshing version manifest: {e}")
+                    changed = False
+                if callback:
+                    callback(changed)
+
+            self._refreshing = threading.Thread(target=run, daemon=True)
+            self._refreshing.start()
+
+    # -------------------------
+    # Lookups
+    # -------------------------
+    def get(self, version_id):
+        self._load()
+        return self.by_id.get(version_id)
+
+    def ids(self, version_type=None):
+        """Version ids, newest first, optionally only one type ("release", "snapshot", ...)."""
+        self._load()
+        if version_type is None:
+            return [v["id"] for v in reversed(self._by_time)]
+        return [v["id"] for v in self.by_type.get(version_type, [])]
+
+    def latest_release(self):
+        self._load()
+        return self.latest.get("release")
+
+    def latest_snapshot(self):
+        self._load()
+        return self.latest.get("snapshot")
+
+    def released_between(self, start=None, end=None, version_type=None):
+        """
+        Versions released in [start, end], newest first. Bounds are ISO 8601
+        strings in the manifest's format, e.g. "2023-06-12T00:00:00+00:00".
+        """
+        self._load()
+        lo = bisect.bisect_left(self._times, start) if start else 0
+        hi = bisect.bisect_right(self._times, end) if end else len(self._times)
+        versions = self._by_time[lo:hi]
+        if version_type:
+            versions = [v for v in versions if v["type"] == version_type]
+        return versions[::-1]
+
+    def resolve(self, version):
+        """
+        Map "latest-release"/"latest-snapshot" to a concrete id and check that
+        the version exists, refreshing once if the cache does not know it.
+        Blocks on the network in that case, so call it from a worker.
+        """
+        self._load()
+        kind = LATEST_ALIASES.get(version)
+        known = self.latest.get(kind) if kind else self.by_id.get(version)
+        if known is None:
+            self.refresh(force=True)
+            known = self.latest.get(kind) if kind else self.by_id.get(version)
+        if known is None:
+            raise ValueError(f"Unknown Minecraft version: {version}")
+        return known if kind else version
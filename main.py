@@ -1,10 +1,23 @@
 import sys
 import os
-from PySide6.QtWidgets import QApplication
-from ui.main_window import MainWindow
+import time
+from launcher.startup_trace import trace
+
+# Per-phase startup timings on stderr
+if "--startup-trace" in sys.argv or os.environ.get("MOLTEN_STARTUP_TRACE"):
+    sys.argv = [arg for arg in sys.argv if arg != "--startup-trace"]
+    trace.enable()
+
+with trace.phase("import PySide6"):
+    from PySide6.QtWidgets import QApplication
+    from PySide6.QtCore import QTimer
+with trace.phase("import ui"):
+    from ui.main_window import MainWindow
+from app_state import state
 
 if __name__ == "__main__":
-    app = QApplication(sys.argv)
+    with trace.phase("QApplication"):
+        app = QApplication(sys.argv)
     
     # Global Dark Theme Stylesheet
     app.setStyleSheet("""
@@ -73,7 +86,23 @@ if __name__ == "__main__":
     }
     """)
     
-    window = MainWindow()
-    window.show()
-    
+    # State writes are debounced, make sure the last change hits the disk
+    app.aboutToQuit.connect(lambda: state.flush())
+
+    with trace.phase("MainWindow"):
+        window = MainWindow()
+    with trace.phase("show"):
+        window.show()
+    # Runs once the event loop has painted the window
+    QTimer.singleShot(0, trace.report)
+
+    # bench/startup_bench.py: mark the window as shown, then quit
+    ready_file = os.environ.get("MOLTEN_STARTUP_READY")
+    if ready_file:
+        def startup_ready():
+            with open(ready_file, "w") as f:
+                f.write(f"{time.time()}\n")
+            app.quit()
+        QTimer.singleShot(0, startup_ready)
+
     sys.exit(app.exec())
@@ -0,0 +1,166 @@
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+from requests.adapters import HTTPAdapter
+from PySide6.QtCore import QCoreApplication, QObject, Qt, Signal
+from PySide6.QtGui import QImage, QPixmap
+
+from launcher.modrinth import USER_AGENT
+
+ICON_SIZE = 64
+MEMORY_ITEMS = 300
+DISK_BYTES = 64 * 1024 * 1024
+
+
+class IconLoader(QObject):
+    """
+    Loads remote icons into small pixmaps without blocking the GUI thread.
+
+    Downloading, decoding and downscaling happen on a thread pool (QImage is
+    safe to use off the GUI thread, QPixmap is not). Thumbnails are kept in a
+    memory LRU and as PNGs on disk; the disk cache is trimmed oldest-first
+    once it grows past `max_bytes`. Finished icons are announced through
+    `icon_ready(url, pixmap)`.
+    """
+
+    icon_ready = Signal(str, QPixmap)
+    _decoded = Signal(str, QImage)
+
+    def __init__(self, cache_dir, size=ICON_SIZE, max_items=MEMORY_ITEMS, max_bytes=DISK_BYTES, max_workers=6):
+        super().__init__()
+        self.cache_dir = cache_dir
+        self.size = size
+        self.max_items = max_items
+        self.max_bytes = max_bytes
+        os.makedirs(cache_dir, exist_ok=True)
+
+        self._memory = OrderedDict()
+        self._pending = {}
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="icons")
+        self._session = requests.Session()
+        self._session.headers["User-Agent"] = USER_AGENT
+        adapter = HTTPAdapter(pool_maxsize=max_workers)
+        self._session.mount("https://", adapter)
+        self._session.mount("http://", adapter)
+
+        self._disk_lock = threading.Lock()
+        self._disk_bytes = None
+        self._decoded.connect(self._store)
+        app = QCoreApplication.instance()
+        if app is not None:
+            app.aboutToQuit.connect(self.shutdown)
+
+    def _path(self, url):
+        return os.path.join(self.cache_dir, hashlib.sha1(url.encode()).hexdigest() + ".png")
+
+    # -------------------------
+    # GUI thread
+    # -------------------------
+    def get(self, url):
+        """Return the cached pixmap for `url`, or None and start loading it."""
+        if not url:
+            return None
+        pixmap = self._memory.get(url)
+        if pixmap is not None:
+            self._memory.move_to_end(url)
+            return pixmap
+        if url not in self._pending:
+            self._pending[url] = self._executor.submit(self._load, url)
+        return None
+
+    def cancel_pending(self):
+        """Drop queued loads that have not started, e.g. when the results change."""
+        for url, future in list(self._pending.items()):
+            if future.cancel():
+                del self._pending[url]
+
+    def _store(self, url, image):
+        self._pending.pop(url, None)
+        if image.isNull():
+            return
+        pixmap = QPixmap.fromImage(image)
+        self._memory[url] = pixmap
+        while len(self._memory) > self.max_items:
+            self._memory.popitem(last=False)
+        self.icon_ready.emit(url, pixmap)
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    # -------------------------
+    # Worker threads
+    # -------------------------
+    def _load(self, url):
+        image = QImage()
+        try:
+            path = self._path(url)
+            image = QImage(path) if os.path.exists(path) else QImage()
+            if not image.isNull():
+                # Bump the mtime so eviction removes the least recently used first
+                try:
+                    os.utime(path)
+                except OSError:
+                    pass
+            else:
+                image = self._fetch(url, path)
+        except Exception as e:
+            print(f"Error loading icon {url}: {e}")
+        finally:
+            # Always answer, even with a null image, so the url leaves
+            # _pending and a later get() tries again
+            self._decoded.emit(url, image)
+
+    def _fetch(self, url, path):
+        try:
+            resp = self._session.get(url, timeout=15)
+            resp.raise_for_status()
+        except requests.RequestException as e:
+            print(f"Error downloading icon {url}: {e}")
+            return QImage()
+        image = QImage.fromData(resp.content)
+        if image.isNull():
+            return image
+        if image.width() > self.size or image.height() > self.size:
+            image = image.scaled(self.size, self.size, Qt.KeepAspectRatio, Qt.SmoothTransformation)
+
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        try:
+            if image.save(tmp_path, "PNG"):
+                os.replace(tmp_path, path)
+                self._account(os.path.getsize(path))
+        except OSError as e:
+            # Not cached on disk, but the icon itself is fine
+            print(f"Error caching icon {url}: {e}")
+        return image
+
+    def _account(self, added):
+        with self._disk_lock:
+            if self._disk_bytes is None:
+                self._disk_bytes = sum(e.stat().st_size for e in os.scandir(self.cache_dir) if e.is_file())
+            else:
+                self._disk_bytes += added
+            if self._disk_bytes > self.max_bytes:
+                self._evict()
+
+    def _evict(self):
+        entries = sorted(
+            (e for e in os.scandir(self.cache_dir) if e.is_file()),
+            key=lambda e: e.stat().st_mtime,
+        )
+        total = sum(e.stat().st_size for e in entries)
+        # Trim to 90% so a full cache is not rescanned on every new icon
+        target = self.max_bytes * 0.9
+        for entry in entries:
+            if total <= target:
+                break
+            try:
+                size = entry.stat().st_size
+                os.remove(entry.path)
+                total -= size
+            except OSError:
+                pass
+        self._disk_bytes = total
@@ -0,0 +1,72 @@
+from PySide6.QtWidgets import (QGroupBox, QVBoxLayout, QHBoxLayout, QTableWidget, QTableWidgetItem,
+                               QPushButton, QHeaderView, QAbstractItemView, QLabel)
+from PySide6.QtCore import Signal
+
+COLUMNS = ["Instance", "Status", "CPU", "Memory", "Heap"]
+
+
+class InstancesPanel(QGroupBox):
+    """Table of running game instances with kill/restart controls."""
+
+    kill_requested = Signal(str)
+    restart_requested = Signal(str)
+
+    def __init__(self):
+        super().__init__("Running Instances")
+        layout = QVBoxLayout(self)
+
+        self.table = QTableWidget(0, len(COLUMNS))
+        self.table.setHorizontalHeaderLabels(COLUMNS)
+        self.table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
+        self.table.verticalHeader().setVisible(False)
+        self.table.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.table.setSelectionMode(QAbstractItemView.SingleSelection)
+        self.table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.table.setMaximumHeight(140)
+        layout.addWidget(self.table)
+
+        buttons = QHBoxLayout()
+        self.total_label = QLabel("")
+        self.total_label.setStyleSheet("color: #95a5a6; font-size: 12px;")
+        buttons.addWidget(self.total_label)
+        buttons.addStretch()
+        kill_btn = QPushButton("Kill")
+        kill_btn.clicked.connect(lambda: self.request(self.kill_requested))
+        buttons.addWidget(kill_btn)
+        restart_btn = QPushButton("Restart")
+        restart_btn.clicked.connect(lambda: self.request(self.restart_requested))
+        buttons.addWidget(restart_btn)
+        layout.addLayout(buttons)
+
+        self.keys = []
+        self.setVisible(False)
+
+    def request(self, signal):
+        row = self.table.currentRow()
+        if 0 <= row < len(self.keys):
+            signal.emit(self.keys[row])
+
+    def update_instances(self, snapshots, cap_mb=None):
+        selected = self.table.currentRow()
+        selected_key = self.keys[selected] if 0 <= selected < len(self.keys) else None
+        self.keys = [s["key"] for s in snapshots]
+        self.table.setRowCount(len(snapshots))
+        for row, s in enumerate(snapshots):
+            values = [
+                s["name"], s["status"], f"{s['cpu_percent']:.0f}%",
+                f"{s['rss'] / 1024 / 1024:.0f} MB" if s["rss"] else "-", f"{s['heap_mb']} MB",
+            ]
+            for column, value in enumerate(values):
+                item = self.table.item(row, column)
+                if item is None:
+                    self.table.setItem(row, column, QTableWidgetItem(value))
+                elif item.text() != value:
+                    item.setText(value)
+        if selected_key in self.keys:
+            self.table.selectRow(self.keys.index(selected_key))
+
+        committed = sum(s["heap_mb"] for s in snapshots)
+        rss = sum(s["rss"] for s in snapshots) / 1024 / 1024
+        limit = f" of {cap_mb} MB" if cap_mb else ""
+        self.total_label.setText(f"Heap committed: {committed} MB{limit} - resident: {rss:.0f} MB")
+        self.setVisible(bool(snapshots))
@@ -0,0 +1,232 @@
+import re
+
+from PySide6.QtCore import Qt
+from PySide6.QtGui import QColor, QFont, QFontMetrics, QGuiApplication, QKeySequence, QPainter
+from PySide6.QtWidgets import QAbstractScrollArea
+
+# [18:35:07] [Render thread/INFO]: ...
+LEVEL_RE = re.compile(r"^\[[^\]]*\] \[[^\]]*/([A-Z]+)\]")
+
+LEVEL_COLORS = {
+    "FATAL": QColor("#ff5555"),
+    "ERROR": QColor("#e74c3c"),
+    "WARN": QColor("#f1c40f"),
+    "INFO": QColor("#00ff00"),
+    "DEBUG": QColor("#95a5a6"),
+    "TRACE": QColor("#7f8c8d"),
+    "STDERR": QColor("#e67e22"),
+    "LAUNCHER": QColor("#3498db"),
+}
+DEFAULT_COLOR = QColor("#00ff00")
+SELECTION_COLOR = QColor("#34495e")
+
+
+class RingBuffer:
+    """Fixed-capacity buffer with O(1) append and O(1) random access."""
+
+    def __init__(self, capacity):
+        self.capacity = capacity
+        self._items = [None] * capacity
+        self._start = 0
+        self._count = 0
+
+    def __len__(self):
+        return self._count
+
+    def __getitem__(self, i):
+        return self._items[(self._start + i) % self.capacity]
+
+    def append(self, item):
+        """Append an item, returning True if the oldest one was overwritten."""
+        end = (self._start + self._count) % self.capacity
+        self._items[end] = item
+        if self._count < self.capacity:
+            self._count += 1
+            return False
+        self._start = (self._start + 1) % self.capacity
+        return True
+
+    def clear(self):
+        self._items = [None] * self.capacity
+        self._start = 0
+        self._count = 0
+
+
+class LogModel:
+    """Log lines with their parsed level, bounded by a ring buffer."""
+
+    def __init__(self, capacity=100000):
+        self.lines = RingBuffer(capacity)
+        self.max_length = 0
+        self._last_level = "INFO"
+
+    def __len__(self):
+        return len(self.lines)
+
+    def classify(self, stream, text):
+        match = LEVEL_RE.match(text)
+        if match:
+            self._last_level = match.group(1)
+        elif text.startswith("[Launcher]"):
+            return "LAUNCHER"
+        elif stream == "stderr":
+            return "STDERR"
+        # Stack trace and other continuation lines keep the level of the
+        # line that started them
+        return self._last_level
+
+    def append_lines(self, batch):
+        """Append (stream, text) tuples, returning how many old lines fell off."""
+        dropped = 0
+        for stream, text in batch:
+            text = text.expandtabs(4)
+            if len(text) > self.max_length:
+                self.max_length = len(text)
+            if self.lines.append((text, self.classify(stream, text))):
+                dropped += 1
+        return dropped
+
+    def clear(self):
+        self.lines.clear()
+        self.max_length = 0
+        self._last_level = "INFO"
+
+
+class LogView(QAbstractScrollArea):
+    """
+    Virtualized log viewer. Only the rows inside the viewport are painted,
+    so appending is O(batch) and painting is O(visible rows) no matter how
+    long the session runs; memory is bounded by the ring buffer capacity.
+    """
+
+    def __init__(self, capacity=100000):
+        super().__init__()
+        self.log_model = LogModel(capacity)
+        self._anchor = None
+        self._cursor = None
+
+        font = QFont("Consolas")
+        font.setStyleHint(QFont.Monospace)
+        self.setFont(font)
+        self.setFocusPolicy(Qt.StrongFocus)
+        self._update_metrics()
+
+    def _update_metrics(self):
+        metrics = QFontMetrics(self.font())
+        self._line_height = metrics.lineSpacing()
+        self._ascent = metrics.ascent()
+        self._char_width = max(1, metrics.horizontalAdvance("M"))
+
+    def changeEvent(self, event):
+        super().changeEvent(event)
+        if event.type() == event.Type.FontChange:
+            self._update_metrics()
+            self._update_scrollbars()
+
+    # -------------------------
+    # Data
+    # -------------------------
+    def append_lines(self, batch):
+        sb = self.verticalScrollBar()
+        # Only follow the tail if the user has not scrolled up
+        follow = sb.value() >= sb.maximum()
+        dropped = self.log_model.append_lines(batch)
+        if dropped:
+            if self._anchor is not None:
+                self._anchor = max(0, self._anchor - dropped)
+                self._cursor = max(0, self._cursor - dropped)
+            if not follow:
+                sb.setValue(max(0, sb.value() - dropped))
+        self._update_scrollbars()
+        if follow:
+            sb.setValue(sb.maximum())
+        self.viewport().update()
+
+    def clear(self):
+        self.log_model.clear()
+        self._anchor = self._cursor = None
+        self._update_scrollbars()
+        self.viewport().update()
+
+    def _visible_rows(self):
+        return max(1, self.viewport().height() // self._line_height)
+
+    def _update_scrollbars(self):
+        visible = self._visible_rows()
+        vsb = self.verticalScrollBar()
+        vsb.setRange(0, max(0, len(self.log_model) - visible))
+        vsb.setPageStep(visible)
+        hsb = self.horizontalScrollBar()
+        hsb.setRange(0, max(0, self.log_model.max_length * self._char_width - self.viewport().width()))
+        hsb.setPageStep(self.viewport().width())
+        hsb.setSingleStep(self._char_width * 4)
+
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        self._update_scrollbars()
+
+    # -------------------------
+    # Painting
+    # -------------------------
+    def paintEvent(self, event):
+        painter = QPainter(self.viewport())
+        painter.setFont(self.font())
+        first = self.verticalScrollBar().value()
+        last = min(len(self.log_model), first + self._visible_rows() + 1)
+        x = 4 - self.horizontalScrollBar().value()
+        width = self.viewport().width()
+        selection = self._selection()
+        lines = self.log_model.lines
+
+        for row in range(first, last):
+            y = (row - first) * self._line_height
+            text, level = lines[row]
+            if selection and selection[0] <= row <= selection[1]:
+                painter.fillRect(0, y, width, self._line_height, SELECTION_COLOR)
+            painter.setPen(LEVEL_COLORS.get(level, DEFAULT_COLOR))
+            painter.drawText(x, y + self._ascent, text)
+        painter.end()
+
+    # -------------------------
+    # Selection & copy
+    # -------------------------
+    def _selection(self):
+        if self._anchor is None:
+            return None
+        return min(self._anchor, self._cursor), max(self._anchor, self._cursor)
+
+    def _row_at(self, y):
+        row = self.verticalScrollBar().value() + int(y) // self._line_height
+        return max(0, min(row, len(self.log_model) - 1))
+
+    def mousePressEvent(self, event):
+        if event.button() == Qt.LeftButton and len(self.log_model):
+            row = self._row_at(event.position().y())
+            if not (event.modifiers() & Qt.ShiftModifier) or self._anchor is None:
+                self._anchor = row
+            self._cursor = row
+            self.viewport().update()
+        super().mousePressEvent(event)
+
+    def mouseMoveEvent(self, event):
+        if event.buttons() & Qt.LeftButton and self._anchor is not None:
+            self._cursor = self._row_at(event.position().y())
+            self.viewport().update()
+        super().mouseMoveEvent(event)
+
+    def selected_text(self):
+        selection = self._selection()
+        if selection is None:
+            return ""
+        lines = self.log_model.lines
+        return "\n".join(lines[row][0] for row in range(selection[0], selection[1] + 1))
+
+    def keyPressEvent(self, event):
+        if event.matches(QKeySequence.Copy):
+            QGuiApplication.clipboard().setText(self.selected_text())
+            return
+        if event.matches(QKeySequence.SelectAll) and len(self.log_model):
+            self._anchor, self._cursor = 0, len(self.log_model) - 1
+            self.viewport().update()
+            return
+        super().keyPressEvent(event)
@@ -1,22 +1,177 @@
-from PySide6.QtWidgets import QWidget, QVBoxLayout, QTextEdit
+from PySide6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QComboBox,
+                               QLineEdit, QPushButton, QStackedWidget, QLabel)
+from PySide6.QtCore import QThread, Signal
+import time
+from app_state import state
+from launcher.session_log import INDEX_EVERY, list_sessions, search_sessions
+from .log_view import LogView
+
+TIME_RANGES = [
+    ("Any time", None),
+    ("Last hour", 3600),
+    ("Last 24 hours", 86400),
+    ("Last 7 days", 7 * 86400),
+]
+
+
+class LogSearchWorker(QThread):
+    results = Signal(list)
+
+    def __init__(self, logs_dir, pattern, start, session_ids):
+        super().__init__()
+        self.logs_dir = logs_dir
+        self.pattern = pattern
+        self.start_time = start
+        self.session_ids = session_ids
+
+    def run(self):
+        try:
+            self.results.emit(search_sessions(
+                self.logs_dir, self.pattern, start=self.start_time, limit=50000, session_ids=self.session_ids
+            ))
+        except Exception as e:
+            self.results.emit([("", 0, f"[Launcher] Search failed: {e}")])
+
 
 class LogsPage(QWidget):
     def __init__(self):
         super().__init__()
         layout = QVBoxLayout(self)
-        
-        self.log_view = QTextEdit()
-        self.log_view.setReadOnly(True)
-        self.log_view.setStyleSheet("""
+
+        # -------------------------
+        # Session & search controls
+        # -------------------------
+        controls = QHBoxLayout()
+        self.session_selector = QComboBox()
+        self.session_selector.currentIndexChanged.connect(self.session_changed)
+        controls.addWidget(self.session_selector)
+
+        self.range_selector = QComboBox()
+        for label, _ in TIME_RANGES:
+            self.range_selector.addItem(label)
+        self.range_selector.setToolTip(
+            f"Approximate: lines are matched to the time range in blocks of {INDEX_EVERY}"
+        )
+        controls.addWidget(self.range_selector)
+
+        self.search_input = QLineEdit()
+        self.search_input.setPlaceholderText("Search past sessions...")
+        self.search_input.returnPressed.connect(self.search)
+        controls.addWidget(self.search_input)
+
+        search_btn = QPushButton("Search")
+        search_btn.clicked.connect(self.search)
+        controls.addWidget(search_btn)
+        layout.addLayout(controls)
+
+        self.status_label = QLabel("")
+        self.status_label.setStyleSheet("color: #95a5a6; font-size: 12px;")
+        layout.addWidget(self.status_label)
+
+        # Live output and archived/search results are kept in separate
+        # views so browsing history never interrupts the running session
+        self.views = QStackedWidget()
+        self.log_view = self.create_view()
+        self.history_view = self.create_view()
+        # One live view per game instance, keyed by game dir
+        self.live_views = {}
+        layout.addWidget(self.views)
+
+        self.search_worker = None
+        # Superseded searches keep running until done; keep them alive and
+        # drop their results
+        self._workers = set()
+        self.search_seq = 0
+        self.refresh_sessions()
+
+    def create_view(self):
+        view = LogView()
+        view.setStyleSheet("""
             font-family: Consolas, monospace;
             background-color: #000;
             color: #0f0;
             border: 1px solid #333;
         """)
-        layout.addWidget(self.log_view)
+        self.views.addWidget(view)
+        return view
+
+    def live_view(self, key, name):
+        """The live view of one instance, created (or cleared for a new run) and selected."""
+        view, _ = self.live_views.get(key, (None, None))
+        if view is None:
+            view = self.create_view()
+        else:
+            view.clear()
+        self.live_views[key] = (view, name)
+        self.refresh_sessions()
+        self.session_selector.setCurrentIndex(self.session_selector.findData(f"live:{key}"))
+        self.views.setCurrentWidget(view)
+        return view
+
+    def append_log(self, text, key=None):
+        self.append_log_batch([("stdout", text)], key)
+
+    def append_log_batch(self, batch, key=None):
+        # One model update per batch instead of one per line
+        view = self.live_views[key][0] if key in self.live_views else self.log_view
+        view.append_lines(batch)
+
+    # -------------------------
+    # Past sessions
+    # -------------------------
+    def refresh_sessions(self):
+        current = self.session_selector.currentData()
+        self.session_selector.blockSignals(True)
+        self.session_selector.clear()
+        self.session_selector.addItem("Live session", None)
+        for key, (_, name) in self.live_views.items():
+            self.session_selector.addItem(f"Live: {name}", f"live:{key}")
+        for session in list_sessions(state.logs_dir):
+            started = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(session["meta"]["started"]))
+            version = session["meta"].get("version", "?")
+            profile = session["meta"].get("jvm", {}).get("profile")
+            label = f"{started} - {version}" + (f" [{profile}]" if profile else "")
+            self.session_selector.addItem(f"{label} ({session['lines']} lines)", session["id"])
+        index = self.session_selector.findData(current)
+        self.session_selector.setCurrentIndex(max(index, 0))
+        self.session_selector.blockSignals(False)
+
+    def session_changed(self):
+        session_id = self.session_selector.currentData()
+        if session_id is None or session_id.startswith("live:"):
+            key = session_id[len("live:"):] if session_id else None
+            self.views.setCurrentWidget(self.live_views[key][0] if key in self.live_views else self.log_view)
+            self.status_label.setText("")
+            return
+        self.run_search("", [session_id])
+
+    def search(self):
+        session_id = self.session_selector.currentData()
+        archived = session_id and not session_id.startswith("live:")
+        self.run_search(self.search_input.text(), [session_id] if archived else None)
+
+    def run_search(self, pattern, session_ids):
+        seconds = TIME_RANGES[self.range_selector.currentIndex()][1]
+        start = time.time() - seconds if seconds else None
+        self.status_label.setText("Searching...")
+        self.search_seq += 1
+        seq = self.search_seq
+        worker = LogSearchWorker(state.logs_dir, pattern, start, session_ids)
+        worker.results.connect(lambda results: self.show_results(seq, results, bool(pattern), start is not None))
+        worker.finished.connect(lambda: self._workers.discard(worker))
+        self._workers.add(worker)
+        self.search_worker = worker
+        worker.start()
 
-    def append_log(self, text):
-        self.log_view.append(text)
-        # Scroll to bottom
-        sb = self.log_view.verticalScrollBar()
-        sb.setValue(sb.maximum())
+    def show_results(self, seq, results, is_search, ranged=False):
+        if seq != self.search_seq:
+            return
+        self.history_view.clear()
+        if is_search:
+            batch = [("stdout", f"[{session_id} #{line_no + 1}] {text}") for session_id, line_no, text in results]
+        else:
+            batch = [("stdout", text) for _, _, text in results]
+        self.history_view.append_lines(batch)
+        self.views.setCurrentWidget(self.history_view)
+        approximate = f", time range approximate to {INDEX_EVERY} lines" if ranged else ""
+        self.status_label.setText(f"{len(results)} line(s){approximate}")
@@ -1,11 +1,12 @@
 from PySide6.QtWidgets import (QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, 
                                QStackedWidget, QPushButton, QLabel, QFrame)
 from PySide6.QtCore import Qt, Signal
-from .play_page import PlayPage
-from .modpacks_page import ModpacksPage
-from .mods_page import ModsPage
-from .logs_page import LogsPage
-from .skins_page import SkinsPage
+import os
+from app_state import state
+from launcher.startup_trace import trace
+from launcher.version_manifest import VersionManifest
+
+PAGES = ["Play", "Modpacks", "Mods", "Skins", "Logs"]
 
 class MainWindow(QMainWindow):
     modpack_updated = Signal()
@@ -33,11 +34,8 @@ class MainWindow(QMainWindow):
         sidebar_layout.addWidget(logo_label)
 
         self.nav_buttons = []
-        self.add_nav_button("Play", 0, sidebar_layout)
-        self.add_nav_button("Modpacks", 1, sidebar_layout)
-        self.add_nav_button("Mods", 2, sidebar_layout)
-        self.add_nav_button("Skins", 3, sidebar_layout)
-        self.add_nav_button("Logs", 4, sidebar_layout)
+        for index, name in enumerate(PAGES):
+            self.add_nav_button(name, index, sidebar_layout)
 
         sidebar_layout.addStretch()
         
@@ -47,29 +45,83 @@ class MainWindow(QMainWindow):
 
         main_layout.addWidget(self.sidebar)
 
+        # Pages are built the first time they are shown; until then each
+        # slot holds an empty placeholder
         self.pages = QStackedWidget()
+        self._built = {}
+        for _ in PAGES:
+            self.pages.addWidget(QWidget())
         main_layout.addWidget(self.pages)
 
-        self.logs_page = LogsPage()
-        self.play_page = PlayPage(self.logs_page)
-        self.modpacks_page = ModpacksPage(self)
-        self.mods_page = ModsPage()
-        self.skins_page = SkinsPage()
-
-        self.pages.addWidget(self.play_page)
-        self.pages.addWidget(self.modpacks_page)
-        self.pages.addWidget(self.mods_page)
-        self.pages.addWidget(self.skins_page)
-        self.pages.addWidget(self.logs_page)
+        # Shared by the Play and Modpacks pages, revalidated in the background
+        self.versions = VersionManifest(os.path.join(state.cache_dir, "version_manifest_v2.json"))
+        self.versions.refresh_async()
 
+        self.show_page(0)
         self.nav_buttons[0].setChecked(True)
-        
-        self.modpack_updated.connect(self.play_page.refresh_modpacks)
 
     def add_nav_button(self, text, index, layout):
         btn = QPushButton(text)
         btn.setCheckable(True)
         btn.setAutoExclusive(True)
-        btn.clicked.connect(lambda: self.pages.setCurrentIndex(index))
+        btn.clicked.connect(lambda: self.show_page(index))
         layout.addWidget(btn)
         self.nav_buttons.append(btn)
+
+    # -------------------------
+    # Lazy pages
+    # -------------------------
+    def _build_page(self, index):
+        # Page modules are imported here too, so e.g. the Mods page's
+        # HTTP client and SQLite index cost nothing until it is opened
+        if index == 0:
+            from .play_page import PlayPage
+            page = PlayPage(lambda: self.logs_page, self.versions)
+            self.modpack_updated.connect(page.refresh_modpacks)
+            return page
+        if index == 1:
+            from .modpacks_page import ModpacksPage
+            return ModpacksPage(self)
+        if index == 2:
+            from .mods_page import ModsPage
+            return ModsPage()
+        if index == 3:
+            from .skins_page import SkinsPage
+            return SkinsPage()
+        from .logs_page import LogsPage
+        return LogsPage()
+
+    def page(self, index):
+        page = self._built.get(index)
+        if page is None:
+            with trace.phase(f"build {PAGES[index]} page"):
+                page = self._build_page(index)
+            placeholder = self.pages.widget(index)
+            self.pages.removeWidget(placeholder)
+            placeholder.deleteLater()
+            self.pages.insertWidget(index, page)
+            self._built[index] = page
+        return page
+
+    def show_page(self, index):
+        self.pages.setCurrentWidget(self.page(index))
+
+    @property
+    def play_page(self):
+        return self.page(0)
+
+    @property
+    def modpacks_page(self):
+        return self.page(1)
+
+    @property
+    def mods_page(self):
+        return self.page(2)
+
+    @property
+    def skins_page(self):
+        return self.page(3)
+
+    @property
+    def logs_page(self):
+        return self.page(4)
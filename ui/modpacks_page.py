@@ -1,8 +1,61 @@
-from PySide6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QListWidget, 
+import os
+import time
+import uuid
+
+from PySide6.QtCore import Qt, QThread, Signal
+from PySide6.QtWidgets import (QApplication, QWidget, QVBoxLayout, QHBoxLayout, QListWidget, 
                                QListWidgetItem, QPushButton, QLineEdit, QComboBox, 
-                               QLabel, QInputDialog, QMessageBox)
-import requests
+                               QLabel, QInputDialog, QMessageBox, QFileDialog)
 from app_state import state
+from launcher.jvm_profiles import PROFILES
+from launcher.object_store import ObjectStore
+
+
+class PackImportWorker(QThread):
+    progress = Signal(str, int)
+    imported = Signal(dict, dict)
+    error = Signal(str)
+
+    def __init__(self, path, game_dir, store_dir):
+        super().__init__()
+        self.path = path
+        self.game_dir = game_dir
+        self.store_dir = store_dir
+
+    def run(self):
+        from launcher.modpack_archive import import_pack
+
+        try:
+            modpack, stats = import_pack(
+                self.path, self.game_dir, progress=self.progress.emit, store=ObjectStore(self.store_dir)
+            )
+            self.imported.emit(modpack, stats)
+        except Exception as e:
+            self.error.emit(str(e))
+
+
+class PackExportWorker(QThread):
+    progress = Signal(str, int)
+    exported = Signal(str)
+    error = Signal(str)
+
+    def __init__(self, modpack, game_dir, dest, include_saves):
+        super().__init__()
+        self.modpack = modpack
+        self.game_dir = game_dir
+        self.dest = dest
+        self.include_saves = include_saves
+
+    def run(self):
+        from launcher.modpack_archive import export_mrpack, export_zip
+
+        try:
+            export = export_mrpack if self.dest.lower().endswith(".mrpack") else export_zip
+            export(self.modpack, self.game_dir, self.dest, include_saves=self.include_saves, progress=self.progress.emit)
+            self.exported.emit(self.dest)
+        except Exception as e:
+            self.error.emit(str(e))
+
 
 class ModpacksPage(QWidget):
     def __init__(self, main_window):
@@ -17,6 +70,30 @@ class ModpacksPage(QWidget):
         create_btn.clicked.connect(self.create_modpack)
         create_btn.setStyleSheet("background-color: #27ae60;")
         header.addWidget(create_btn)
+
+        import_btn = QPushButton("Import")
+        import_btn.clicked.connect(self.import_pack)
+        header.addWidget(import_btn)
+
+        export_btn = QPushButton("Export")
+        export_btn.clicked.connect(self.export_pack)
+        header.addWidget(export_btn)
+
+        clone_btn = QPushButton("Clone")
+        clone_btn.clicked.connect(self.clone_modpack)
+        header.addWidget(clone_btn)
+
+        snapshots_btn = QPushButton("Snapshots")
+        snapshots_btn.clicked.connect(self.manage_snapshots)
+        header.addWidget(snapshots_btn)
+
+        profile_btn = QPushButton("JVM Profile")
+        profile_btn.clicked.connect(self.set_jvm_profile)
+        header.addWidget(profile_btn)
+
+        cleanup_btn = QPushButton("Clean Up Storage")
+        cleanup_btn.clicked.connect(self.cleanup_storage)
+        header.addWidget(cleanup_btn)
         
         layout.addLayout(header)
 
@@ -33,21 +110,30 @@ class ModpacksPage(QWidget):
             }
         """)
         layout.addWidget(self.list_widget)
+
+        self.status_label = QLabel("")
+        layout.addWidget(self.status_label)
+        self.pack_worker = None
         
         self.refresh_list()
 
     def refresh_list(self):
         self.list_widget.clear()
         for mp in state.modpacks:
-            item = QListWidgetItem(f"{mp['name']} - {mp['version']} ({mp['loader']})")
+            item = QListWidgetItem(f"{mp['name']} - {mp['version']} ({mp['loader']}) - {mp.get('mod_count', 0)} mods")
             self.list_widget.addItem(item)
 
     def create_modpack(self):
-        try:
-            versions_manifest = requests.get("https://launchermeta.mojang.com/mc/game/version_manifest.json").json()
-            releases = [v['id'] for v in versions_manifest['versions'] if v['type'] == 'release']
-        except:
-            releases = ["1.20.4", "1.20.1", "1.19.4"]
+        versions = self.main_window.versions
+        releases = versions.ids("release")
+        # Answer from the cache now, pick up new releases for next time
+        versions.refresh_async()
+        if not releases:
+            QMessageBox.warning(
+                self, "Create Modpack",
+                "The Minecraft version list has not been downloaded yet. Check your connection and try again."
+            )
+            return
 
         name, ok = QInputDialog.getText(self, "Create Modpack", "Modpack Name:")
         if not ok or not name: return
@@ -58,10 +144,214 @@ class ModpacksPage(QWidget):
         loader, ok = QInputDialog.getItem(self, "Select Loader", "Mod Loader:", ["Vanilla", "Fabric", "Forge"], 0, False)
         if not ok: return
 
-        state.add_modpack(name, version, loader)
+        modpack = state.add_modpack(name, version, loader)
         self.refresh_list()
+
+        # Start downloading the new instance while the user sets it up
+        self.main_window.play_page.prefetch(modpack)
         
         # Trigger refresh on play page
         self.main_window.modpack_updated.emit()
         
         QMessageBox.information(self, "Success", "Modpack created!")
+
+    def pack_busy(self):
+        if self.pack_worker is not None and self.pack_worker.isRunning():
+            QMessageBox.information(self, "Modpacks", "Another import or export is still running.")
+            return True
+        return False
+
+    def import_pack(self):
+        if self.pack_busy():
+            return
+        path, _ = QFileDialog.getOpenFileName(
+            self, "Import Modpack", "", "Modpacks (*.mrpack *.zip);;All files (*)"
+        )
+        if not path:
+            return
+        modpack_id = str(uuid.uuid4())
+        self.status_label.setText(f"Importing {os.path.basename(path)}...")
+        self.pack_worker = PackImportWorker(path, state.get_game_dir({"id": modpack_id}), state.store_dir)
+        self.pack_worker.progress.connect(lambda status, percent: self.status_label.setText(f"{status} {percent}%"))
+        self.pack_worker.imported.connect(lambda modpack, stats: self.import_finished(modpack_id, modpack, stats))
+        self.pack_worker.error.connect(lambda message: self.status_label.setText(f"Import failed: {message}"))
+        self.pack_worker.start()
+
+    def import_finished(self, modpack_id, modpack, stats):
+        modpack["id"] = modpack_id
+        state.save_modpack(modpack)
+        state.active_modpack = state.modpacks[-1]
+        state.save()
+        self.refresh_list()
+        self.list_widget.setCurrentRow(self.list_widget.count() - 1)
+        self.main_window.play_page.prefetch(modpack)
+        self.main_window.modpack_updated.emit()
+        self.status_label.setText(
+            f"Imported {modpack['name']}: {stats['extracted']} files extracted, {stats['downloaded']} downloaded, "
+            f"{stats['deduplicated']} already in the object store"
+        )
+
+    def export_pack(self):
+        if self.pack_busy():
+            return
+        modpack = self.selected_modpack("Export Modpack")
+        if not modpack:
+            return
+        dest, chosen = QFileDialog.getSaveFileName(
+            self, "Export Modpack", f"{modpack['name']}.mrpack",
+            "Modrinth modpack (*.mrpack);;Instance archive (*.zip)"
+        )
+        if not dest:
+            return
+        if not dest.lower().endswith((".mrpack", ".zip")):
+            dest += ".zip" if "zip" in chosen else ".mrpack"
+        include_saves = QMessageBox.question(
+            self, "Export Modpack", "Include the worlds?"
+        ) == QMessageBox.StandardButton.Yes
+
+        state.flush()
+        self.status_label.setText(f"Exporting {modpack['name']}...")
+        self.pack_worker = PackExportWorker(modpack, state.get_game_dir(modpack), dest, include_saves)
+        self.pack_worker.progress.connect(lambda status, percent: self.status_label.setText(f"{status} {percent}%"))
+        self.pack_worker.exported.connect(lambda path: self.status_label.setText(f"Exported to {path}"))
+        self.pack_worker.error.connect(lambda message: self.status_label.setText(f"Export failed: {message}"))
+        self.pack_worker.start()
+
+    def selected_modpack(self, title):
+        row = self.list_widget.currentRow()
+        if row < 0:
+            QMessageBox.information(self, title, "Select an instance first.")
+            return None
+        return state.get_modpack(state.modpacks[row]["id"])
+
+    def is_busy(self, modpack):
+        """True while the instance is running or being installed."""
+        play_page = self.main_window.play_page
+        game_dir = state.get_game_dir(modpack)
+        installing = any(job.running for (_, directory), job in play_page.install_jobs.items() if directory == game_dir)
+        # A launch still installing or preparing has no game process yet
+        worker = play_page.workers.get(game_dir)
+        launching = worker is not None and worker.isRunning()
+        return installing or launching or play_page.supervisor.is_running(game_dir)
+
+    def clone_modpack(self):
+        from launcher.snapshots import describe
+
+        modpack = self.selected_modpack("Clone Instance")
+        if not modpack:
+            return
+        if self.is_busy(modpack):
+            # Worlds and configs are being written; the copy would be torn
+            QMessageBox.warning(self, "Clone Instance", "Stop the instance before cloning it.")
+            return
+        name, ok = QInputDialog.getText(self, "Clone Instance", "Name of the copy:", text=f"{modpack['name']} (copy)")
+        if not ok or not name:
+            return
+        include_saves = QMessageBox.question(
+            self, "Clone Instance", "Copy the worlds too?"
+        ) == QMessageBox.StandardButton.Yes
+
+        QApplication.setOverrideCursor(Qt.CursorShape.WaitCursor)
+        try:
+            started = time.perf_counter()
+            clone, stats = state.clone_modpack(modpack["id"], name, include_saves)
+            elapsed = time.perf_counter() - started
+        except Exception as e:
+            QMessageBox.warning(self, "Clone Instance", f"Cloning failed: {e}")
+            return
+        finally:
+            QApplication.restoreOverrideCursor()
+
+        self.refresh_list()
+        self.list_widget.setCurrentRow(self.list_widget.count() - 1)
+        self.main_window.modpack_updated.emit()
+        QMessageBox.information(
+            self, "Clone Instance",
+            f"Created {clone['name']} in {elapsed:.2f} s: {describe(stats)}."
+        )
+
+    def manage_snapshots(self):
+        from launcher.snapshots import describe
+
+        modpack = self.selected_modpack("Snapshots")
+        if not modpack:
+            return
+        snapshots = state.snapshots().list(modpack["id"])
+        labels = ["Take a new snapshot"] + [
+            f"{time.strftime('%Y-%m-%d %H:%M', time.localtime(s['created']))}  {s['label']}".rstrip()
+            for s in snapshots
+        ]
+        choice, ok = QInputDialog.getItem(self, "Snapshots", f"Snapshots of {modpack['name']}:", labels, 0, False)
+        if not ok:
+            return
+
+        if labels.index(choice) == 0:
+            label, ok = QInputDialog.getText(self, "Snapshots", "Label (optional):")
+            if not ok:
+                return
+            if self.is_busy(modpack):
+                QMessageBox.warning(self, "Snapshots", "Stop the instance before taking a snapshot.")
+                return
+            try:
+                meta = state.snapshot_modpack(modpack["id"], label)
+            except Exception as e:
+                QMessageBox.warning(self, "Snapshots", f"Snapshot failed: {e}")
+                return
+            QMessageBox.information(self, "Snapshots", f"Snapshot taken: {describe(meta['stats'])}.")
+            return
+
+        snapshot = snapshots[labels.index(choice) - 1]
+        box = QMessageBox(self)
+        box.setWindowTitle("Snapshots")
+        box.setText(f"Restore {modpack['name']} to {choice.strip()}? Changes since then are lost.")
+        restore_btn = box.addButton("Restore", QMessageBox.ButtonRole.AcceptRole)
+        delete_btn = box.addButton("Delete Snapshot", QMessageBox.ButtonRole.DestructiveRole)
+        box.addButton(QMessageBox.StandardButton.Cancel)
+        box.exec()
+
+        try:
+            if box.clickedButton() is restore_btn:
+                if self.is_busy(modpack):
+                    QMessageBox.warning(self, "Snapshots", "Stop the instance before restoring it.")
+                    return
+                state.restore_snapshot(modpack["id"], snapshot["id"])
+                self.refresh_list()
+                self.main_window.modpack_updated.emit()
+                QMessageBox.information(self, "Snapshots", f"{modpack['name']} restored.")
+            elif box.clickedButton() is delete_btn:
+                state.snapshots().delete(modpack["id"], snapshot["id"])
+        except Exception as e:
+            QMessageBox.warning(self, "Snapshots", f"Failed: {e}")
+
+    def set_jvm_profile(self):
+        modpack = self.selected_modpack("JVM Profile")
+        if not modpack:
+            return
+
+        names = [None] + list(PROFILES)
+        labels = ["Launcher default"] + [label for label, _ in PROFILES.values()]
+        current = names.index(modpack.get("jvm_profile")) if modpack.get("jvm_profile") in names else 0
+        label, ok = QInputDialog.getItem(
+            self, "JVM Profile", f"Profile for {modpack['name']}:", labels, current, False
+        )
+        if not ok:
+            return
+        modpack["jvm_profile"] = names[labels.index(label)]
+        state.save_modpack(modpack)
+
+    def cleanup_storage(self):
+        play_page = self.main_window.play_page
+        if any(job.running for job in play_page.install_jobs.values()) or \
+                any(worker.isRunning() for worker in play_page.workers.values()):
+            # Their indexes are only saved once they finish
+            QMessageBox.warning(self, "Storage", "Wait for running installs and launches to finish first.")
+            return
+        try:
+            # Snapshots reference objects too, through symlinks where
+            # hardlinking was not possible
+            game_dirs = state.get_all_game_dirs() + state.snapshots().game_dirs()
+            removed, freed = ObjectStore(state.store_dir).gc(game_dirs)
+            QMessageBox.information(self, "Storage", f"Removed {removed} unused objects ({freed / 1024 / 1024:.1f} MB freed).")
+        except Exception as e:
+            QMessageBox.warning(self, "Storage", f"Cleanup failed: {e}")
+
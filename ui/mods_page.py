@@ -1,9 +1,188 @@
 from PySide6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLineEdit, 
-                               QScrollArea, QFrame, QLabel, QPushButton, QGridLayout)
-from PySide6.QtCore import Qt, QTimer
+                               QScrollArea, QFrame, QLabel, QPushButton, QGridLayout, QMessageBox)
+from PySide6.QtCore import Qt, QTimer, QThread, Signal
 from PySide6.QtGui import QPixmap
-import requests
+import copy
+import os
 from app_state import state
+from launcher.modrinth import ModrinthClient, CancelToken, RequestCancelled
+from launcher.mod_install import install_mods
+from launcher.mod_update import apply_updates, check_updates
+from launcher.mod_index import ModIndex
+from launcher.object_store import ObjectStore
+from .icon_loader import IconLoader, ICON_SIZE
+
+
+PAGE_SIZE = 20
+COLUMNS = 2
+# Cards filled per event-loop tick while rendering a page
+CARDS_PER_TICK = 4
+SEARCH_DELAY_MS = 300
+# Give startup a head start before refreshing the local index
+INDEX_SYNC_DELAY_MS = 5000
+
+
+class ModSearchWorker(QThread):
+    results = Signal(dict)
+    error = Signal(str)
+
+    def __init__(self, client, index, query, offset=0, limit=20):
+        super().__init__()
+        self.client = client
+        self.index = index
+        self.query = query
+        self.offset = offset
+        self.limit = limit
+        self.token = CancelToken()
+
+    def cancel(self):
+        self.token.cancel()
+
+    def run(self):
+        try:
+            data = self.client.search(
+                self.query, offset=self.offset, limit=self.limit,
+                facets=[["project_type:mod"]], cancel=self.token
+            )
+            # Everything seen online is remembered for offline searches
+            self.index.add_hits(data.get("hits", []))
+            self.results.emit(data)
+        except RequestCancelled:
+            pass
+        except Exception as e:
+            if not self.token.cancelled:
+                self.error.emit(str(e))
+
+
+class ModIndexSyncWorker(QThread):
+    synced = Signal(int)
+
+    def __init__(self, client, index):
+        super().__init__()
+        self.client = client
+        self.index = index
+
+    def run(self):
+        try:
+            self.synced.emit(self.index.sync(self.client))
+        except Exception as e:
+            print(f"Mod index sync failed: {e}")
+
+
+class ModInstallWorker(QThread):
+    progress = Signal(str, int)
+    installed = Signal(list)
+    error = Signal(str)
+
+    def __init__(self, client, modpack, game_dir, project_ids, store_dir):
+        super().__init__()
+        self.client = client
+        # install_mods edits the modpack; work on a copy so the live one
+        # only changes on the GUI thread, in the installed slot
+        self.modpack = copy.deepcopy(modpack)
+        self.game_dir = game_dir
+        self.project_ids = project_ids
+        self.store_dir = store_dir
+
+    def run(self):
+        try:
+            entries = install_mods(
+                self.client, self.modpack, self.game_dir, self.project_ids,
+                progress=self.progress.emit, store=ObjectStore(self.store_dir)
+            )
+            self.installed.emit(entries)
+        except Exception as e:
+            self.error.emit(str(e))
+
+
+class ModUpdateWorker(QThread):
+    """Checks an instance for mod updates, or applies the ones given."""
+
+    progress = Signal(str, int)
+    checked = Signal(list)
+    updated = Signal(list)
+    error = Signal(str)
+
+    def __init__(self, client, modpack, game_dir, store_dir, updates=None):
+        super().__init__()
+        self.client = client
+        # apply_updates edits the modpack; the updated slot copies the result back
+        self.modpack = copy.deepcopy(modpack)
+        self.game_dir = game_dir
+        self.store_dir = store_dir
+        self.updates = updates
+
+    def run(self):
+        try:
+            if self.updates is None:
+                self.progress.emit("Checking for updates...", 0)
+                self.checked.emit(check_updates(self.client, self.modpack, self.game_dir))
+            else:
+                self.updated.emit(apply_updates(
+                    self.updates, self.modpack, self.game_dir,
+                    progress=self.progress.emit, store=ObjectStore(self.store_dir)
+                ))
+        except Exception as e:
+            self.error.emit(str(e))
+
+
+class ModCard(QFrame):
+    """A mod result card. Cards are reused across searches and pages, only their contents change."""
+
+    install_clicked = Signal(dict)
+
+    def __init__(self, icons):
+        super().__init__()
+        self.data = None
+        self.icons = icons
+        self.setStyleSheet("""
+            QFrame {
+                background-color: #2c3e50;
+                border-radius: 8px;
+                padding: 10px;
+            }
+        """)
+        layout = QVBoxLayout(self)
+
+        header = QHBoxLayout()
+        self.icon = QLabel()
+        self.icon.setFixedSize(ICON_SIZE, ICON_SIZE)
+        self.icon.setAlignment(Qt.AlignCenter)
+        self.icon.setStyleSheet("background-color: #34495e; border-radius: 6px; padding: 0px;")
+        header.addWidget(self.icon)
+
+        titles = QVBoxLayout()
+        self.name = QLabel()
+        self.name.setStyleSheet("font-weight: bold; font-size: 14px;")
+        titles.addWidget(self.name)
+
+        self.author = QLabel()
+        self.author.setStyleSheet("color: #95a5a6; font-size: 12px;")
+        titles.addWidget(self.author)
+        header.addLayout(titles, 1)
+        layout.addLayout(header)
+
+        self.desc = QLabel()
+        self.desc.setWordWrap(True)
+        layout.addWidget(self.desc)
+
+        btn = QPushButton("Install")
+        btn.setStyleSheet("background-color: #2980b9; border: none; padding: 5px;")
+        btn.clicked.connect(lambda: self.install_clicked.emit(self.data))
+        layout.addWidget(btn)
+
+    def set_data(self, data):
+        self.data = data
+        self.name.setText(data['title'])
+        self.author.setText(f"by {data['author']}")
+        self.desc.setText(data['description'])
+        # Cached icons show immediately, the rest arrive via set_icon
+        self.icon.setPixmap(self.icons.get(data.get('icon_url')) or QPixmap())
+
+    def set_icon(self, url, pixmap):
+        if self.data and self.data.get('icon_url') == url:
+            self.icon.setPixmap(pixmap)
+
 
 class ModsPage(QWidget):
     def __init__(self):
@@ -14,85 +193,274 @@ class ModsPage(QWidget):
         search_layout = QHBoxLayout()
         self.search_input = QLineEdit()
         self.search_input.setPlaceholderText("Search Modrinth mods...")
+        self.search_input.textChanged.connect(self.query_changed)
+        self.search_input.returnPressed.connect(self.search_mods)
         search_btn = QPushButton("Search")
         search_btn.clicked.connect(self.search_mods)
+        update_btn = QPushButton("Check for Updates")
+        update_btn.clicked.connect(self.check_updates)
         search_layout.addWidget(self.search_input)
         search_layout.addWidget(search_btn)
+        search_layout.addWidget(update_btn)
         layout.addLayout(search_layout)
 
+        self.status_label = QLabel("")
+        self.status_label.setStyleSheet("color: #95a5a6; font-size: 12px;")
+        layout.addWidget(self.status_label)
+
         # Results Area
-        scroll = QScrollArea()
-        scroll.setWidgetResizable(True)
+        self.scroll = QScrollArea()
+        self.scroll.setWidgetResizable(True)
         self.results_container = QWidget()
         self.results_layout = QGridLayout(self.results_container)
         self.results_layout.setAlignment(Qt.AlignTop)
-        scroll.setWidget(self.results_container)
-        layout.addWidget(scroll)
+        self.scroll.setWidget(self.results_container)
+        self.scroll.verticalScrollBar().valueChanged.connect(self.maybe_load_more)
+        layout.addWidget(self.scroll)
+
+        self.client = ModrinthClient(cache_dir=os.path.join(state.cache_dir, "modrinth"))
+        self.icons = IconLoader(os.path.join(state.cache_dir, "icons"))
+        self.icons.icon_ready.connect(self.icon_ready)
+        self.index = ModIndex(os.path.join(state.cache_dir, "mod_index.db"))
+        self.search_worker = None
+        self.sync_worker = None
+        self.install_worker = None
+        # Cancelled workers may still be unwinding; keep them alive until they finish
+        self._workers = set()
+
+        self.query = ""
+        # "index" while paging through local results, "online" otherwise
+        self.source = "online"
+        self.hits = []
+        self.total_hits = 0
+        self.cards = []
+        self.rendered = 0
+
+        # Typing restarts the timer, so only a pause in typing searches
+        self.search_timer = QTimer(self)
+        self.search_timer.setSingleShot(True)
+        self.search_timer.setInterval(SEARCH_DELAY_MS)
+        self.search_timer.timeout.connect(self.search_mods)
+
+        self.render_timer = QTimer(self)
+        self.render_timer.setInterval(0)
+        self.render_timer.timeout.connect(self.render_step)
+
+        if self.index.needs_sync():
+            QTimer.singleShot(INDEX_SYNC_DELAY_MS, self.sync_index)
+
+    # -------------------------
+    # Searching & paging
+    # -------------------------
+    def query_changed(self):
+        self.search_timer.start()
 
     def search_mods(self):
-        query = self.search_input.text()
-        if not query: return
-        
-        # Clear previous
-        for i in reversed(range(self.results_layout.count())): 
-            self.results_layout.itemAt(i).widget().setParent(None)
+        self.search_timer.stop()
+        query = self.search_input.text().strip()
+        if query == self.query and self.hits:
+            return
+        self.query = query
+        self.hits = []
+        self.total_hits = 0
+        self.reset_cards()
+        if not query:
+            self.cancel_search()
+            self.status_label.setText("")
+            return
+        self.status_label.setText("Searching...")
 
-        # Fetch (Mocking for stability/speed if API fails, but trying real first)
-        try:
-            # Modrinth API search
-            url = f"https://api.modrinth.com/v2/search?query={query}&limit=10"
-            resp = requests.get(url, timeout=5)
-            hits = resp.json().get('hits', [])
-            
-            row = 0
-            col = 0
-            for hit in hits:
-                card = self.create_mod_card(hit)
-                self.results_layout.addWidget(card, row, col)
-                col += 1
-                if col > 1: # 2 columns
-                    col = 0
-                    row += 1
+        # The local index answers in milliseconds and works offline. The
+        # network is always asked too (cheap with the ETag cache), so new
+        # mods show up and the index learns from every search
+        local = self.index.search(query, 0, PAGE_SIZE)
+        self.source = "index"
+        if local['hits']:
+            self.add_results(local)
+        self.source = "online"
+        self.fetch_page(0)
 
-        except Exception as e:
-            err_label = QLabel(f"Error fetching mods: {e}")
-            self.results_layout.addWidget(err_label)
+    def cancel_search(self):
+        if self.search_worker is not None:
+            self.search_worker.cancel()
+            self.search_worker = None
 
-    def create_mod_card(self, data):
-        frame = QFrame()
-        frame.setStyleSheet("""
-            QFrame {
-                background-color: #2c3e50;
-                border-radius: 8px;
-                padding: 10px;
-            }
-        """)
-        layout = QVBoxLayout(frame)
-        
-        # Icon (skipped for now to avoid async image complexity in one file, just name)
-        name = QLabel(data['title'])
-        name.setStyleSheet("font-weight: bold; font-size: 14px;")
-        layout.addWidget(name)
-        
-        author = QLabel(f"by {data['author']}")
-        author.setStyleSheet("color: #95a5a6; font-size: 12px;")
-        layout.addWidget(author)
-        
-        desc = QLabel(data['description'])
-        desc.setWordWrap(True)
-        layout.addWidget(desc)
-        
-        btn = QPushButton("Install")
-        btn.setStyleSheet("background-color: #2980b9; border: none; padding: 5px;")
-        btn.clicked.connect(lambda: self.install_mod(data))
-        layout.addWidget(btn)
-        
-        return frame
+    def fetch_page(self, offset):
+        if self.source == "index":
+            self.add_results(self.index.search(self.query, offset, PAGE_SIZE))
+            return
+
+        # Only the newest query matters: drop whatever is still in flight
+        self.cancel_search()
+
+        worker = ModSearchWorker(self.client, self.index, self.query, offset=offset, limit=PAGE_SIZE)
+        worker.results.connect(lambda data: self.show_results(worker, data))
+        worker.error.connect(lambda message: self.show_error(worker, message))
+        worker.finished.connect(lambda: self._workers.discard(worker))
+        self._workers.add(worker)
+        self.search_worker = worker
+        worker.start()
+
+    def maybe_load_more(self):
+        if self.search_worker is not None or len(self.hits) >= self.total_hits:
+            return
+        # Wait until the current page is on screen before asking for the next
+        if self.rendered < len(self.hits):
+            return
+        sb = self.scroll.verticalScrollBar()
+        if sb.maximum() - sb.value() <= self.scroll.viewport().height():
+            self.fetch_page(len(self.hits))
+
+    def show_results(self, worker, data):
+        if worker is not self.search_worker:
+            return
+        self.search_worker = None
+        if worker.offset == 0 and self.hits:
+            # Online results supersede the answer from the index. Paging
+            # waits for this response, so only the first page is shown
+            online = data.get('hits', [])
+            if [h["project_id"] for h in online] == [h["project_id"] for h in self.hits]:
+                # Same mods: refresh the cards in place instead of rebuilding
+                self.hits = []
+                self.rendered = 0
+            else:
+                self.hits = []
+                self.reset_cards()
+        self.add_results(data)
+
+    def add_results(self, data):
+        self.hits.extend(data.get('hits', []))
+        self.total_hits = data.get('total_hits', len(self.hits))
+        if not self.hits:
+            self.status_label.setText("No mods found")
+        else:
+            suffix = " (offline index)" if self.source == "index" else ""
+            self.status_label.setText(f"Showing {len(self.hits)} of {self.total_hits} mods{suffix}")
+        self.render_timer.start()
+
+    def show_error(self, worker, message):
+        if worker is not self.search_worker:
+            return
+        self.search_worker = None
+        if self.hits:
+            # Keep paging through what the index has
+            self.source = "index"
+            self.status_label.setText(f"Offline, showing {len(self.hits)} indexed mods")
+        else:
+            self.status_label.setText(f"Error fetching mods: {message}")
+
+    def sync_index(self):
+        self.sync_worker = ModIndexSyncWorker(self.client, self.index)
+        self.sync_worker.start()
+
+    # -------------------------
+    # Cards
+    # -------------------------
+    def reset_cards(self):
+        self.render_timer.stop()
+        self.icons.cancel_pending()
+        self.rendered = 0
+        for card in self.cards:
+            card.hide()
+        self.scroll.verticalScrollBar().setValue(0)
+
+    def render_step(self):
+        # A handful of cards per tick keeps input and scrolling responsive
+        # while a page fills in
+        end = min(len(self.hits), self.rendered + CARDS_PER_TICK)
+        for i in range(self.rendered, end):
+            if i == len(self.cards):
+                self.cards.append(self.create_mod_card())
+                self.results_layout.addWidget(self.cards[i], i // COLUMNS, i % COLUMNS)
+            self.cards[i].set_data(self.hits[i])
+            self.cards[i].show()
+        self.rendered = end
+        if self.rendered >= len(self.hits):
+            self.render_timer.stop()
+            # The page may not fill the viewport yet
+            QTimer.singleShot(0, self.maybe_load_more)
+
+    def icon_ready(self, url, pixmap):
+        for card in self.cards[:self.rendered]:
+            card.set_icon(url, pixmap)
+
+    def create_mod_card(self):
+        card = ModCard(self.icons)
+        card.install_clicked.connect(self.install_mod)
+        return card
 
     def install_mod(self, data):
         if not state.active_modpack:
-             print("No active modpack selected!")
+             self.status_label.setText("No active modpack selected!")
              return
-             
-        # Real install logic would go here (fetch versions -> match mc version -> download jar)
-        print(f"Installing {data['title']} to {state.active_modpack['name']}")
+        if self.install_worker is not None and self.install_worker.isRunning():
+            self.status_label.setText("Another install is still running")
+            return
+
+        modpack = state.get_modpack(state.active_modpack["id"])
+        self.status_label.setText(f"Installing {data['title']} to {modpack['name']}...")
+        self.install_worker = ModInstallWorker(
+            self.client, modpack, state.get_game_dir(modpack), [data['project_id']], state.store_dir
+        )
+        self.install_worker.progress.connect(lambda status, percent: self.status_label.setText(f"{status} {percent}%"))
+        worker = self.install_worker
+        self.install_worker.installed.connect(lambda entries: self.install_finished(modpack, worker.modpack, entries))
+        self.install_worker.error.connect(lambda message: self.status_label.setText(f"Install failed: {message}"))
+        self.install_worker.start()
+
+    def install_finished(self, modpack, result, entries):
+        modpack["mods"] = result["mods"]
+        state.save_modpack(modpack)
+        names = ", ".join(e["title"] for e in entries)
+        self.status_label.setText(f"Installed {names} to {modpack['name']}")
+
+    # -------------------------
+    # Updates
+    # -------------------------
+    def check_updates(self):
+        if not state.active_modpack:
+            self.status_label.setText("No active modpack selected!")
+            return
+        if self.install_worker is not None and self.install_worker.isRunning():
+            self.status_label.setText("Another install is still running")
+            return
+
+        modpack = state.get_modpack(state.active_modpack["id"])
+        worker = ModUpdateWorker(self.client, modpack, state.get_game_dir(modpack), state.store_dir)
+        worker.progress.connect(lambda status, percent: self.status_label.setText(f"{status} {percent}%"))
+        worker.checked.connect(lambda updates: self.confirm_updates(modpack, updates))
+        worker.error.connect(lambda message: self.status_label.setText(f"Update check failed: {message}"))
+        self.start_update_worker(worker)
+
+    def start_update_worker(self, worker):
+        # The check worker may still be returning from run() when its
+        # checked slot starts the next one; keep it alive until it finishes
+        worker.finished.connect(lambda: self._workers.discard(worker))
+        self._workers.add(worker)
+        self.install_worker = worker
+        worker.start()
+
+    def confirm_updates(self, modpack, updates):
+        if not updates:
+            self.status_label.setText(f"All mods in {modpack['name']} are up to date")
+            return
+        lines = [f"{u.filename} \u2192 {u.new_filename}" for u in updates[:15]]
+        if len(updates) > 15:
+            lines.append(f"... and {len(updates) - 15} more")
+        answer = QMessageBox.question(
+            self, "Mod Updates", f"Update {len(updates)} mod(s) in {modpack['name']}?\n\n" + "\n".join(lines)
+        )
+        if answer != QMessageBox.StandardButton.Yes:
+            self.status_label.setText(f"{len(updates)} update(s) available")
+            return
+
+        worker = ModUpdateWorker(self.client, modpack, state.get_game_dir(modpack), state.store_dir, updates)
+        worker.progress.connect(lambda status, percent: self.status_label.setText(f"{status} {percent}%"))
+        worker.updated.connect(lambda done: self.updates_finished(modpack, worker.modpack, done))
+        worker.error.connect(lambda message: self.status_label.setText(f"Update failed: {message}"))
+        self.start_update_worker(worker)
+
+    def updates_finished(self, modpack, result, updates):
+        modpack["mods"] = result["mods"]
+        state.save_modpack(modpack)
+        self.status_label.setText(f"Updated {len(updates)} mod(s) in {modpack['name']}")
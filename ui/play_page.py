@@ -1,18 +1,46 @@
 from PySide6.QtWidgets import (
     QWidget, QVBoxLayout, QLabel, QLineEdit, QSpinBox, QPushButton, 
     QComboBox, QFileDialog, QProgressBar, QGroupBox, QFormLayout, 
-    QHBoxLayout, QMessageBox, QInputDialog
+    QHBoxLayout, QMessageBox, QInputDialog, QCheckBox
 )
-from PySide6.QtCore import Qt
+from PySide6.QtCore import Qt, Signal
 from PySide6.QtGui import QGuiApplication
 from app_state import state
 from launcher.game import LaunchWorker, MSLoginWorker, MSLoginFinisher
+from launcher.java_runtime import JavaRegistry
+from launcher.jvm_profiles import PROFILES
+from launcher.object_store import ObjectStore
+from launcher.prefetch import InstallJob, RateLimiter, PREFETCH_BYTES_PER_SEC
+from launcher.supervisor import Supervisor
+from .instances_panel import InstancesPanel
+import os
+import threading
 import webbrowser
 
 class PlayPage(QWidget):
-    def __init__(self, logs_page):
+    # Emitted from background install threads, delivered on the GUI thread
+    prefetch_progress = Signal(object, str, int)
+    # Emitted from the supervisor's sampler thread
+    instances_sampled = Signal(list)
+
+    def __init__(self, logs_page, versions):
         super().__init__()
-        self.logs_page = logs_page
+        # Called on first use: the Logs page is only built when needed
+        self._logs_page = logs_page
+        self.versions = versions
+        # Launch workers and the modpack they launched, keyed by game dir
+        self.workers = {}
+        self.launched = {}
+        self.restart_pending = set()
+        self.current_launch = None
+        self.supervisor = Supervisor(state.max_total_ram or None)
+        self.supervisor.add_listener(self.instances_sampled.emit)
+        self.install_jobs = {}
+        self.prefetch_limiter = RateLimiter(PREFETCH_BYTES_PER_SEC)
+        self.javas = JavaRegistry(os.path.join(state.cache_dir, "java_probes.json"))
+        # Warm the probe cache so the first launch does not wait on `java -version`
+        threading.Thread(target=self.javas.discover, args=([state.minecraft_dir],), daemon=True).start()
+        self.prefetch_progress.connect(self.show_prefetch_progress)
         layout = QVBoxLayout(self)
         layout.setContentsMargins(40, 40, 40, 40)
         layout.setSpacing(20)
@@ -68,6 +96,16 @@ class PlayPage(QWidget):
         self.ram_input.valueChanged.connect(self.update_state)
         settings_layout.addRow("RAM:", self.ram_input)
 
+        self.ram_cap_input = QSpinBox()
+        self.ram_cap_input.setRange(0, 262144)
+        self.ram_cap_input.setSingleStep(1024)
+        self.ram_cap_input.setSuffix(" MB")
+        self.ram_cap_input.setSpecialValueText("No limit")
+        self.ram_cap_input.setToolTip("Refuse to start an instance if the heaps of all running instances would exceed this")
+        self.ram_cap_input.setValue(state.max_total_ram)
+        self.ram_cap_input.valueChanged.connect(self.update_state)
+        settings_layout.addRow("Total RAM cap:", self.ram_cap_input)
+
         dir_layout = QHBoxLayout()
         self.dir_input = QLineEdit(state.minecraft_dir)
         self.dir_input.setReadOnly(True)
@@ -82,6 +120,14 @@ class PlayPage(QWidget):
         self.java_input.textChanged.connect(self.update_state)
         settings_layout.addRow("Java Path:", self.java_input)
 
+        self.profile_input = QComboBox()
+        for name, (label, _) in PROFILES.items():
+            self.profile_input.addItem(label, name)
+        self.profile_input.setCurrentIndex(max(self.profile_input.findData(state.jvm_profile), 0))
+        self.profile_input.setToolTip("Garbage collector and heap tuning; instances can override it")
+        self.profile_input.currentIndexChanged.connect(self.update_state)
+        settings_layout.addRow("JVM Profile:", self.profile_input)
+
         settings_group.setLayout(settings_layout)
         container_layout.addWidget(settings_group)
 
@@ -102,6 +148,9 @@ class PlayPage(QWidget):
         self.launch_btn.clicked.connect(self.launch_game)
         controls_vbox.addWidget(self.launch_btn)
 
+        self.verify_check = QCheckBox("Deep verify game files before launch")
+        controls_vbox.addWidget(self.verify_check)
+
         controls_group.setLayout(controls_vbox)
         container_layout.addWidget(controls_group)
 
@@ -117,16 +166,31 @@ class PlayPage(QWidget):
         self.progress_bar.setVisible(False)
         container_layout.addWidget(self.progress_bar)
 
+        self.instances_panel = InstancesPanel()
+        self.instances_panel.kill_requested.connect(self.kill_instance)
+        self.instances_panel.restart_requested.connect(self.restart_instance)
+        self.instances_sampled.connect(
+            lambda snapshots: self.instances_panel.update_instances(snapshots, self.supervisor.max_total_ram_mb)
+        )
+        container_layout.addWidget(self.instances_panel)
+
         layout.addStretch()
         self.refresh_modpacks()
 
+    @property
+    def logs_page(self):
+        return self._logs_page()
+
     # -------------------------
     # Helper Functions
     # -------------------------
     def update_state(self):
         state.username = self.username_input.text()
         state.ram = self.ram_input.value()
+        state.max_total_ram = self.ram_cap_input.value()
+        self.supervisor.max_total_ram_mb = state.max_total_ram or None
         state.java_path = self.java_input.text()
+        state.jvm_profile = self.profile_input.currentData()
         state.save()
 
     def browse_dir(self):
@@ -138,6 +202,9 @@ class PlayPage(QWidget):
 
     def refresh_modpacks(self):
         current_data = self.modpack_selector.currentData()
+        # Rebuilding the list would otherwise select (and prefetch) every
+        # intermediate item
+        self.modpack_selector.blockSignals(True)
         self.modpack_selector.clear()
         self.modpack_selector.addItem("Vanilla (Latest)", "latest-release")
         for mp in state.modpacks:
@@ -151,6 +218,8 @@ class PlayPage(QWidget):
             index = self.modpack_selector.findData(state.active_modpack)
             if index >= 0:
                 self.modpack_selector.setCurrentIndex(index)
+        self.modpack_selector.blockSignals(False)
+        self.modpack_changed()
 
     def modpack_changed(self):
         data = self.modpack_selector.currentData()
@@ -161,44 +230,141 @@ class PlayPage(QWidget):
             self.banner.setText(f"{data['name']}\nLoader: {data['loader']}")
             state.active_modpack = data
         state.save()
+        self.prefetch(None if data == "latest-release" else data)
+
+    # -------------------------
+    # Background install
+    # -------------------------
+    def prefetch(self, modpack):
+        """Start installing the selected instance in the background, at low priority and rate."""
+        version = modpack['version'] if modpack else self.versions.latest_release()
+        if not version:
+            return None
+        key = (version, state.get_game_dir(modpack))
+        # Only the selected instance is prefetched; jobs for the others
+        # would hold its game dir or the shared runtime
+        for other_key, other in self.install_jobs.items():
+            if other_key != key:
+                other.cancel()
+        job = self.install_jobs.get(key)
+        if job is not None and ((job.running and not job.cancelled) or job.succeeded):
+            return job
+        job = InstallJob(
+            version, key[1], limiter=self.prefetch_limiter, store=ObjectStore(state.store_dir),
+            shared_dir=state.minecraft_dir, manifest=self.versions
+        )
+        job.add_listener(lambda status, percent: self.prefetch_progress.emit(job, status, percent))
+        self.install_jobs[key] = job
+        return job.start()
+
+    def show_prefetch_progress(self, job, status, percent):
+        worker = self.workers.get(job.directory)
+        launching = worker is not None and worker.isRunning()
+        selected = self.install_jobs.get((job.version, job.directory)) is job
+        if not launching and selected and job.directory == state.get_game_dir(state.active_modpack):
+            self.status_label.setText(f"{status} ({percent}%)" if percent < 100 else status)
 
     # -------------------------
     # Launch Game
     # -------------------------
     def launch_game(self):
-        version = "latest-release"
         data = self.modpack_selector.currentData()
-        if data != "latest-release":
-            version = data['version']
+        self.launch(None if data == "latest-release" else data)
+
+    def launch(self, modpack):
+        key = state.get_game_dir(modpack)
+        name = modpack['name'] if modpack else "Vanilla"
+        old = self.workers.get(key)
+        if old is not None and old.isRunning():
+            QMessageBox.information(self, "Play", f"{name} is already running.")
+            return
+        if old is not None:
+            old.wait()
+
+        if modpack:
+            version = modpack['version']
         else:
-            import minecraft_launcher_lib
-            version = minecraft_launcher_lib.utils.get_latest_version(state.minecraft_dir)["release"]
+            # Answered from the cached manifest; with no cache yet the
+            # worker resolves it off the GUI thread
+            version = self.versions.latest_release() or "latest-release"
+            self.versions.refresh_async()
 
-        self.launch_btn.setEnabled(False)
         self.progress_bar.setVisible(True)
         self.progress_bar.setValue(0)
 
-        self.worker = LaunchWorker(
-            state.username, version, state.minecraft_dir, state.ram, state.java_path, state.ms_auth_data
+        job = self.install_jobs.get((version, key))
+        jvm_profile = state.jvm_profile
+        if modpack:
+            jvm_profile = state.get_modpack(modpack['id']).get("jvm_profile") or jvm_profile
+
+        worker = LaunchWorker(
+            state.username, version, key, state.ram, state.java_path, state.ms_auth_data,
+            deep_verify=self.verify_check.isChecked(), store_dir=state.store_dir, shared_dir=state.minecraft_dir,
+            logs_dir=state.logs_dir, manifest=self.versions, install_job=job, java_registry=self.javas,
+            jvm_profile=jvm_profile, mod_count=modpack.get('mod_count', 0) if modpack else 0,
+            supervisor=self.supervisor, name=name
         )
-        self.worker.progress_update.connect(self.update_progress)
-        self.worker.log_output.connect(self.logs_page.append_log)
-        self.worker.finished.connect(self.launch_finished)
-        self.worker.error.connect(self.launch_error)
-        self.worker.start()
-
-    def update_progress(self, status, percent):
+        self.logs_page.live_view(key, name)
+        worker.progress_update.connect(lambda status, percent: self.update_progress(key, status, percent))
+        worker.log_output.connect(lambda text: self.logs_page.append_log(text, key))
+        worker.log_batch.connect(lambda batch, w=worker: self.show_log_batch(key, batch, w))
+        worker.exited.connect(lambda: self.launch_finished(key))
+        worker.error.connect(lambda err: self.launch_error(key, err))
+        self.workers[key] = worker
+        self.launched[key] = modpack
+        self.current_launch = key
+        self.logs_page.append_log(f"[Launcher] Starting {name}")
+        worker.start()
+
+    def show_log_batch(self, key, batch, worker):
+        self.logs_page.append_log_batch(batch, key)
+        # Ack the worker that sent it: batches of a previous run of this
+        # instance may still be queued after a restart
+        worker.ack_log_batch()
+
+    def update_progress(self, key, status, percent):
+        # Several instances may be starting; the bar follows the latest one
+        if key != self.current_launch:
+            return
         self.status_label.setText(status)
         self.progress_bar.setValue(percent)
-
-    def launch_finished(self):
-        self.status_label.setText("Game Session Ended")
-        self.launch_btn.setEnabled(True)
-        self.progress_bar.setVisible(False)
-
-    def launch_error(self, err):
+        if status == "Launching...":
+            self.progress_bar.setVisible(False)
+
+    def launch_finished(self, key):
+        name = self.workers[key].name
+        self.logs_page.append_log(f"[Launcher] {name} exited")
+        self.status_label.setText(f"{name}: Game Session Ended")
+        self.logs_page.refresh_sessions()
+        if key == self.current_launch:
+            self.progress_bar.setVisible(False)
+        if key in self.restart_pending:
+            self.restart_pending.discard(key)
+            self.workers[key].wait()
+            self.launch(self.launched[key])
+
+    def launch_error(self, key, err):
+        self.restart_pending.discard(key)
         self.status_label.setText(f"Error: {err}")
-        self.launch_btn.setEnabled(True)
+        self.logs_page.append_log(f"[Launcher] {self.workers[key].name} failed: {err}")
+        if key == self.current_launch:
+            self.progress_bar.setVisible(False)
+
+    def kill_instance(self, key):
+        worker = self.workers.get(key)
+        if worker is not None:
+            worker.kill()
+
+    def restart_instance(self, key):
+        worker = self.workers.get(key)
+        if worker is None:
+            return
+        if worker.isRunning():
+            # Relaunched from launch_finished once the old process is gone
+            if worker.kill():
+                self.restart_pending.add(key)
+        else:
+            self.launch(self.launched[key])
 
     # -------------------------
     # Microsoft Device Code Login
@@ -69,8 +69,15 @@ class SkinsPage(QWidget):
         
         layout.addLayout(controls_layout)
         layout.addStretch()
-        
-        self.refresh_preview()
+
+        # Decoding the skin waits until the page is first shown
+        self.preview_loaded = False
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        if not self.preview_loaded:
+            self.preview_loaded = True
+            self.refresh_preview()
 
     def upload_skin(self):
         file_path, _ = QFileDialog.getOpenFileName(self, "Select Skin", "", "Image Files (*.png)")